@@ -1,7 +1,8 @@
 -- ========================================
--- BabyCry Oracle XE 통합 스키마 v2.1 (개선판)
+-- BabyCry Oracle XE 통합 스키마 v2.2 (개선판)
 -- 개선 사항: 불리언 타입 통일(NUMBER 1), Soft Delete(deleted_at), 
 --         감사 컬럼(updated_at), 인덱스 최적화, 테이블/컬럼 주석 추가
+-- v2.2: 조치 통계용 cry_event 커버링 인덱스 (기존 DB는 migration_v2.2_action_stats.sql)
 -- babycry 유저로 접속한 상태에서 실행
 -- ========================================
 
@@ -415,7 +416,8 @@ PROMPT ✅ 테이블 생성 완료 (20개)
 CREATE INDEX idx_infant_guardian ON infant(guardian_id);
 CREATE INDEX idx_audio_infant_time ON audio_file(infant_id, upload_time);
 CREATE INDEX idx_infer_audio ON model_inference(audio_id);
-CREATE INDEX idx_event_infant_time ON cry_event(infant_id, event_time);
+-- (infant_id, event_time) 범위 조회 + cry_type / event_id는 인덱스에서 바로 읽음 (조치 통계 GROUP BY, v2.2)
+CREATE INDEX idx_event_infant_time ON cry_event(infant_id, event_time, cry_type, event_id);
 CREATE INDEX idx_event_type_time ON cry_event(cry_type, event_time);
 CREATE INDEX idx_growth_infant ON infant_growth(infant_id);
 CREATE INDEX idx_vaccine_infant ON vaccination_record(infant_id);
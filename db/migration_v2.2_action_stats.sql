@@ -0,0 +1,33 @@
+-- ========================================
+-- BabyCry 스키마 v2.1 → v2.2 마이그레이션
+-- 조치 통계(get_action_stats) 서버 집계용 인덱스
+-- babycry 유저로 접속한 상태에서 실행 (v2.1 스키마가 이미 있는 DB)
+-- ========================================
+--
+-- get_action_stats 실행 계획:
+--   cry_event   : infant_id = :infant_id AND event_time >= SYSDATE - :days  (범위 스캔)
+--   action_log  : event_id = e.event_id                                     (조인)
+--   GROUP BY    : NVL(cry_type, 'unknown'), action_detail
+--
+-- 1) cry_event(infant_id, event_time)
+--    v2.1의 idx_event_infant_time으로 범위 스캔은 되지만 cry_type / event_id를 읽으려고
+--    이벤트마다 테이블 블록을 방문함 → 두 컬럼을 뒤에 붙여 인덱스만으로 처리
+--    (앞부분 컬럼이 같으므로 기존 인덱스를 쓰던 다른 쿼리도 새 인덱스 사용)
+--
+-- 2) action_log(event_id)
+--    v2.1의 idx_action_event_time(event_id, executed_at)이 event_id로 시작하므로 조인에 그대로 사용
+--    (action_detail은 VARCHAR2(4000)이라 인덱스에 포함하지 않음 - 키 길이 한도)
+
+DROP INDEX idx_event_infant_time;
+CREATE INDEX idx_event_infant_time ON cry_event(infant_id, event_time, cry_type, event_id);
+
+-- action_log(event_id) 인덱스가 없는 DB(v2.1 이전)에서만 실행
+-- CREATE INDEX idx_action_event_time ON action_log(event_id, executed_at);
+
+BEGIN
+  DBMS_STATS.GATHER_TABLE_STATS(USER, 'CRY_EVENT', cascade => TRUE);
+  DBMS_STATS.GATHER_TABLE_STATS(USER, 'ACTION_LOG', cascade => TRUE);
+END;
+/
+
+PROMPT ✅ v2.2 마이그레이션 완료 (idx_event_infant_time 재생성)
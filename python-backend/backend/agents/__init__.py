@@ -2,18 +2,28 @@
 """
 LangGraph Agents Package
 아기 울음 분석을 위한 멀티 에이전트 시스템
+
+✅ 하위 모듈(langgraph / openai / 분류기)은 이름을 처음 참조할 때 import
+   (backend.agents.xxx_agent 하나만 import해도 패키지 전체가 로드되지 않도록)
 """
 
-from .workflow import run_cry_analysis
-from .cry_classification_agent import CryClassificationAgent
-from .parenting_advice_agent import ParentingAdviceAgent
-from .music_recommendation_agent import MusicRecommendationAgent
-from .notification_agent import NotificationAgent
+import importlib
+
+_EXPORTS = {
+    'run_cry_analysis': '.workflow',
+    'CryClassificationAgent': '.cry_classification_agent',
+    'ParentingAdviceAgent': '.parenting_advice_agent',
+    'MusicRecommendationAgent': '.music_recommendation_agent',
+    'NotificationAgent': '.notification_agent',
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = [
-    'run_cry_analysis',
-    'CryClassificationAgent',
-    'ParentingAdviceAgent',
-    'MusicRecommendationAgent',
-    'NotificationAgent'
-]
\ No newline at end of file
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -5,9 +5,10 @@ CryClassifier 모델을 활용한 6가지 울음 유형 분류
 """
 
 import os
-from pathlib import Path
 from typing import Dict, Optional
-from backend.models.classifier import CryClassifier
+from backend.models.registry import get_model_catalog
+from backend.models.thresholds import SENSITIVITY_MODES
+from backend.services.inference_service import get_inference_service
 
 
 class CryClassificationAgent:
@@ -28,14 +29,14 @@ class CryClassificationAgent:
         Parameters:
         -----------
         model_path : str, optional
-            모델 파일 경로 (기본값: 프로젝트 루트의 models/baby_cry_v15_1_detector.pkl)
+            모델 파일 경로 (기본값: 모델 카탈로그의 활성 버전, 처음에는 models/baby_cry_v15_1)
         sensitivity : str
             민감도 모드 ('high', 'balanced', 'precise')
         """
         if model_path is None:
-            # 프로젝트 루트에서 모델 찾기
-            project_root = Path(__file__).parents[2]
-            model_path = project_root / 'models' / 'baby_cry_v15_1_detector.pkl'
+            # 현재 활성 모델 버전 (models/model_versions.json, 없으면 baby_cry_v15_1)
+            catalog = get_model_catalog()
+            model_path = catalog.resolve(catalog.active)
         
         self.model_path = str(model_path)
         self.sensitivity = sensitivity
@@ -44,10 +45,6 @@ class CryClassificationAgent:
         print(f"   Model: {self.model_path}")
         print(f"   Sensitivity: {sensitivity}")
         
-        # 분류기 로드
-        self.classifier = CryClassifier('', sensitivity=sensitivity)
-        self.classifier.load_model(self.model_path)
-        
         print(f"✅ [CryClassificationAgent] Ready")
         
         # 한글 카테고리 매핑
@@ -84,8 +81,9 @@ class CryClassificationAgent:
         try:
             print(f"\n🔍 [Classification] Analyzing: {audio_path}")
             
-            # 모델 예측
-            result = self.classifier.predict_with_confidence(audio_path)
+            # ✅ 모델 예측: 추론 프로세스 풀에서 1회 디코딩 → 분류 + 길이 계산 (이벤트 루프 블로킹 없음)
+            analysis = await get_inference_service().classify_file(audio_path, sensitivity=self.sensitivity)
+            result = analysis['result']
             
             cry_type = result['prediction']
             confidence = result['confidence']
@@ -95,13 +93,8 @@ class CryClassificationAgent:
             print(f"   심각도: {severity}")
             print(f"   결정 단계: {result.get('stage', 'unknown')}")
             
-            # 오디오 길이 계산
-            import librosa
-            try:
-                y, sr = librosa.load(audio_path, sr=None)
-                audio_duration = len(y) / sr
-            except Exception:
-                audio_duration = 3.0
+            # 오디오 길이
+            audio_duration = analysis['audio_duration']
             
             return {
                 'cry_type': cry_type,
@@ -127,7 +120,9 @@ class CryClassificationAgent:
             }
     
     def set_sensitivity(self, sensitivity: str):
-        """민감도 변경"""
-        self.classifier.set_sensitivity(sensitivity)
+        """민감도 변경 (분류는 추론 풀에서 수행하므로 요청마다 넘길 민감도만 교체)"""
+        if sensitivity not in SENSITIVITY_MODES:
+            print(f"⚠️  Invalid sensitivity '{sensitivity}', using '{self.sensitivity}'")
+            return
         self.sensitivity = sensitivity
         print(f"✅ [CryClassificationAgent] Sensitivity changed to: {sensitivity}")
\ No newline at end of file
@@ -6,7 +6,6 @@ StateGraph, 노드, 엣지를 사용한 체계적인 파이프라인
 """
 
 from typing import TypedDict, Literal, Optional, List, Dict, Any
-from langgraph.graph import StateGraph, END
 from datetime import datetime
 import time
 import traceback
@@ -343,44 +342,57 @@ def should_send_notification(state: CryAnalysisState) -> Literal["notification",
 # 그래프 구성
 # ========================================
 
-workflow = StateGraph(CryAnalysisState)
+_workflow_app = None
 
-# 노드 추가
-workflow.add_node("classify", classify_cry_node)
-workflow.add_node("advice", generate_advice_node)
-workflow.add_node("music", recommend_music_node)
-workflow.add_node("notification", send_notification_node)
 
-# 시작점
-workflow.set_entry_point("classify")
+def get_workflow_app():
+    """컴파일된 워크플로우 (첫 실행 시 구성 - import만으로 langgraph 로드 / 컴파일하지 않음)"""
+    global _workflow_app
 
-# 엣지 연결
-workflow.add_conditional_edges(
-    "classify",
-    should_continue_after_classify,
-    {
-        "advice": "advice",
-        "end": END
-    }
-)
+    if _workflow_app is not None:
+        return _workflow_app
 
-workflow.add_edge("advice", "music")
+    from langgraph.graph import StateGraph, END
 
-workflow.add_conditional_edges(
-    "music",
-    should_send_notification,
-    {
-        "notification": "notification",
-        "end": END
-    }
-)
+    workflow = StateGraph(CryAnalysisState)
+
+    # 노드 추가
+    workflow.add_node("classify", classify_cry_node)
+    workflow.add_node("advice", generate_advice_node)
+    workflow.add_node("music", recommend_music_node)
+    workflow.add_node("notification", send_notification_node)
+
+    # 시작점
+    workflow.set_entry_point("classify")
+
+    # 엣지 연결
+    workflow.add_conditional_edges(
+        "classify",
+        should_continue_after_classify,
+        {
+            "advice": "advice",
+            "end": END
+        }
+    )
+
+    workflow.add_edge("advice", "music")
+
+    workflow.add_conditional_edges(
+        "music",
+        should_send_notification,
+        {
+            "notification": "notification",
+            "end": END
+        }
+    )
 
-workflow.add_edge("notification", END)
+    workflow.add_edge("notification", END)
 
-# 그래프 컴파일
-app = workflow.compile()
+    # 그래프 컴파일
+    _workflow_app = workflow.compile()
 
-print("✅ LangGraph workflow compiled successfully")
+    print("✅ LangGraph workflow compiled successfully")
+    return _workflow_app
 
 
 # ========================================
@@ -485,7 +497,7 @@ async def run_langgraph_workflow(
     
     try:
         # 그래프 실행
-        final_state = await app.ainvoke(initial_state)
+        final_state = await get_workflow_app().ainvoke(initial_state)
         
         total_time = time.time() - workflow_start
         
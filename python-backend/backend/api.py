@@ -8,12 +8,13 @@ from pathlib import Path
 import os
 from datetime import datetime
 import json
-import librosa
 import numpy as np
 import time
 import traceback
-import requests
-from requests.exceptions import ReadTimeout
+import asyncio
+import importlib.util
+import sys
+import httpx
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -30,8 +31,14 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 os.makedirs("logs", exist_ok=True)
 
-from backend.models.classifier import CryClassifier
-from backend.services.chatbot_service import ChatbotService
+# ✅ 시작 시간: scipy / sklearn(분류기·스트리밍·게이트), openai(챗봇), oracledb(저장소)는
+#    처음 쓰는 곳에서 import (lifespan 예열 또는 첫 요청)
+from backend.models.thresholds import SENSITIVITY_MODES
+from backend.models.feature_cache import get_feature_cache_stats
+from backend.models.registry import get_model_catalog, get_model_registry, get_model_memory_report, version_label
+from backend.services.inference_service import get_inference_service, get_inference_stats, InferenceBusyError, ModelDeployError
+from backend.services.node_client import get_node_client, get_lookup_cache_stats
+from backend.utils.audio import pcm16_to_float32
 
 # ✅ LangGraph Router Import
 try:
@@ -43,14 +50,6 @@ except ImportError as e:
     langgraph_router = None
     logger.warning(f"⚠️ LangGraph 라우터를 찾을 수 없습니다: {e}")
 
-# ✅ 모든 백엔드 통신 URL 통합 관리
-NODE_BACKEND_BASE = os.getenv("NODE_BACKEND_URL", "http://localhost:4000")
-
-NOTIFICATION_URL = f"{NODE_BACKEND_BASE}/api/analysis/result"
-EVENT_SAVE_URL = f"{NODE_BACKEND_BASE}/api/events/create"
-FEEDBACK_STATS_URL = f"{NODE_BACKEND_BASE}/api/analysis/feedback/stats"
-VITALS_URL = f"{NODE_BACKEND_BASE}/api/health/vitals"
-
 try:
     from backend.services.music_service import get_music_service
     MUSIC_SERVICE_AVAILABLE = True
@@ -59,14 +58,22 @@ except ImportError:
     logger.warning("⚠️ LocalMusicService not available. Music playback will be skipped.")
 
 try:
-    from backend.utils.storage_manager import get_storage_manager
-    STORAGE_MANAGER_AVAILABLE = True
+    from backend.services.iot_service import IoTService
+    IOT_SERVICE_AVAILABLE = True
 except ImportError:
-    STORAGE_MANAGER_AVAILABLE = False
+    IOT_SERVICE_AVAILABLE = False
+    logger.warning("⚠️ IoTService not available. Smart home automation will be skipped.")
+
+# 전역 IoTService 인스턴스
+iot_service = IoTService() if IOT_SERVICE_AVAILABLE else None
+
+# StorageManager는 oracledb 설치 여부만 확인하고 대시보드 첫 요청에서 import
+STORAGE_MANAGER_AVAILABLE = importlib.util.find_spec("oracledb") is not None
+if not STORAGE_MANAGER_AVAILABLE:
     logger.warning("⚠️ StorageManager not available in Blueprint. Falling back to JSON history.")
 
 
-def save_event_to_db(event_data):
+async def save_event_to_db(event_data):
     """Node 백엔드로 이벤트 데이터를 전송하여 Oracle DB에 저장"""
     try:
         payload = {
@@ -80,24 +87,12 @@ def save_event_to_db(event_data):
             "needs_consultation": event_data.get("needs_consultation", False)
         }
 
-        logger.info(f"💾 이벤트 저장 요청: {EVENT_SAVE_URL}")
-        
-        response = requests.post(
-            EVENT_SAVE_URL,
-            json=payload,
-            timeout=(3, 10),
-        )
-        
-        if response.status_code == 200:
-            result = response.json()
-            event_id = result.get("event_id")
+        event_id = await get_node_client().save_event(payload)
+        if event_id:
             logger.info(f"✅ 이벤트 저장 완료: event_id={event_id}")
-            return event_id
-        else:
-            logger.error(f"❌ 이벤트 저장 실패: {response.status_code}, 응답: {response.text}")
-            return None
+        return event_id
 
-    except ReadTimeout:
+    except httpx.TimeoutException:
         logger.warning("⚠️ 이벤트 저장 타임아웃")
         return None
     except Exception as e:
@@ -110,8 +105,8 @@ def trigger_local_alarm(severity, message):
     logger.error(f"🚨 [OFFLINE FAIL-SAFE] LOCAL ALARM: {severity} - {message}")
 
 
-def notify_node_backend(event_id, event_data):
-    """Node 알림 서버로 분석 결과 전달"""
+async def notify_node_backend(event_id, event_data):
+    """Node 알림 서버로 분석 결과 전달 (업로드 응답과 무관하므로 fire-and-forget으로 호출)"""
     try:
         if not event_id:
             logger.warning("⚠️ event_id 없음, Node 알림 생략")
@@ -125,19 +120,11 @@ def notify_node_backend(event_id, event_data):
             "severity": event_data.get("severity", "Unknown"),
         }
 
-        logger.info(f"📨 Node 알림 서버 호출: {NOTIFICATION_URL}")
-        
-        response = requests.post(
-            NOTIFICATION_URL,
-            json=payload,
-            timeout=(3, 10),
-        )
-        response.raise_for_status()
-        logger.info(f"✅ Node 응답 코드: {response.status_code}")
+        await get_node_client().notify(payload)
 
-    except ReadTimeout:
+    except httpx.TimeoutException:
         logger.warning("⚠️ Node 알림 서버 응답 타임아웃")
-    except requests.exceptions.ConnectionError as e:
+    except httpx.ConnectError as e:
         logger.error(f"❌ [Network Error] Node 서버 연결 불가: {e}")
         if event_data.get("isCrying"):
             trigger_local_alarm(event_data.get("severity", "Medium"), "Network down.")
@@ -154,34 +141,78 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 UPLOADS_PATH = PROJECT_ROOT / 'uploads'
 os.makedirs(UPLOADS_PATH, exist_ok=True)
 
+# WebSocket 스트리밍 입력 포맷 (16bit mono raw PCM)
+STREAM_SAMPLE_RATE = int(os.getenv("STREAM_SAMPLE_RATE", "22050"))
+STREAM_WINDOW_SECONDS = float(os.getenv("STREAM_WINDOW_SECONDS", "3.0"))
+STREAM_HOP_SECONDS = float(os.getenv("STREAM_HOP_SECONDS", "0.5"))
+STREAM_ANALYSIS_MODE = os.getenv("STREAM_ANALYSIS_MODE", "incremental")
+STREAM_GATE_ENABLED = os.getenv("STREAM_GATE_ENABLED", "1") == "1"
+
 # FastAPI APIRouter 정의
 router = APIRouter(prefix="/api", tags=["api"])
 
 # 전역 classifier 인스턴스 (싱글톤)
 _classifier_instance = None
 
-chatbot = ChatbotService()
+_chatbot_instance = None
 
 # --- Helper Functions ---
 
+async def _timed(timings, stage, awaitable):
+    """awaitable을 실행하고 소요 시간(ms)을 timings[stage]에 기록"""
+    started = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        timings[stage] = round((time.perf_counter() - started) * 1000, 1)
+
+
 def get_classifier():
-    """Classifier 싱글톤 - 한 번만 로드"""
+    """Classifier 싱글톤 - 한 번만 로드 (활성 모델 버전, 배포 시 deploy_model_version이 교체)"""
     global _classifier_instance
     
     if _classifier_instance is None:
-        model_path = PROJECT_ROOT / 'models' / 'baby_cry_v15_1_detector.pkl'
+        catalog = get_model_catalog()
+        model_version = catalog.active
+        model_path = catalog.resolve(model_version)
         sensitivity = os.getenv('CRY_SENSITIVITY', 'balanced')
+        feature_profile = os.getenv('CRY_FEATURE_PROFILE', 'exact')
         
-        logger.info(f"🔧 [Blueprint] Initializing V15.1 Classifier... Sensitivity: {sensitivity}")
+        logger.info(f"🔧 [Blueprint] Initializing {model_version} Classifier... Sensitivity: {sensitivity}, Features: {feature_profile}")
         
-        _classifier_instance = CryClassifier(
-            str(PROJECT_ROOT / 'Dataset'),
-            sensitivity=sensitivity
+        # ✅ 프로세스 공용 레지스트리 - 에이전트 / 스레드 워커와 같은 가중치 공유
+        _classifier_instance = get_model_registry().acquire(
+            model_path,
+            sensitivity=sensitivity,
+            feature_profile=feature_profile,
+            model_version=model_version
         )
-        _classifier_instance.load_model(str(model_path))
     
     return _classifier_instance
 
+
+def get_chatbot():
+    """ChatbotService 싱글톤 - 첫 /chatbot 요청에서 생성 (OpenAI 클라이언트 import 지연)"""
+    global _chatbot_instance
+
+    if _chatbot_instance is None:
+        from backend.services.chatbot_service import ChatbotService
+        _chatbot_instance = ChatbotService()
+
+    return _chatbot_instance
+
+
+def get_cry_gate_stats():
+    """게이트 통계 (게이트 모듈이 아직 로드되지 않았으면 None - 헬스 체크가 scipy를 import하지 않도록)"""
+    gate_module = sys.modules.get('backend.models.gate')
+    return gate_module.get_cry_gate_stats() if gate_module is not None else None
+
+
+def get_db_pool_stats():
+    """DB 세션 풀 통계 (StorageManager 모듈이 아직 로드되지 않았으면 None - oracledb import 방지)"""
+    storage_module = sys.modules.get('backend.utils.storage_manager')
+    return storage_module.get_storage_pool_stats() if storage_module is not None else None
+
 def get_recommended_actions(reason, severity):
     """원인에 따른 조치 추천"""
     action_map = {
@@ -245,7 +276,14 @@ async def health():
         "model_loaded": _classifier_instance is not None,
         "langgraph_available": LANGGRAPH_AVAILABLE,
         "music_service_available": MUSIC_SERVICE_AVAILABLE,
-        "storage_manager_available": STORAGE_MANAGER_AVAILABLE
+        "storage_manager_available": STORAGE_MANAGER_AVAILABLE,
+        "inference": get_inference_stats(),
+        "lookup_cache": get_lookup_cache_stats(),
+        "cry_gate": get_cry_gate_stats(),
+        # 이 프로세스의 특징 캐시 (INFERENCE_WORKERS>0이면 워커별 메모리 계층은 각 워커에 있음)
+        "feature_cache": get_feature_cache_stats(),
+        "model_memory": get_model_memory_report(),
+        "db_pool": get_db_pool_stats()
     }
     
     # LangGraph 워크플로우 상태 추가
@@ -260,6 +298,22 @@ async def health():
     
     return health_status
 
+@router.post("/cache/invalidate")
+async def invalidate_lookup_cache(
+    infant_id: int = Query(None, description="Infant ID (생략 시 전체)"),
+    kind: str = Query(None, description="feedback_stats | vitals (생략 시 둘 다)")
+):
+    """
+    피드백 통계 / 바이오 신호 캐시 무효화
+    Node 백엔드가 피드백 저장·바이오 신호 갱신 후 호출
+    """
+    if kind is not None and kind not in ("feedback_stats", "vitals"):
+        raise HTTPException(status_code=400, detail="kind must be feedback_stats or vitals")
+
+    removed = get_node_client().cache.invalidate(infant_id=infant_id, kind=kind)
+    logger.info(f"🧹 Lookup cache invalidated: infant_id={infant_id}, kind={kind}, removed={removed}")
+    return {"success": True, "removed": removed}
+
 # --- 전역 상수 및 초기화 ---
 
 
@@ -274,6 +328,11 @@ async def upload_audio(
     FastAPI 기반 오디오 업로드 및 분석 엔드포인트
     """
     dest = None
+    timings = {}
+    # 동시에 시작한 단계 (실패 / 거절 시 finally에서 정리)
+    stage_tasks = []
+    rejected = False
+    pipeline_started = time.perf_counter()
     try:
         if not audio or not audio.filename:
             raise HTTPException(status_code=400, detail="no_file")
@@ -282,34 +341,69 @@ async def upload_audio(
         if infant_id == 0:
             raise HTTPException(status_code=400, detail="infant_id is required")
 
-        # ✅ 개인화 바이어스 가져오기 (1단계 기술 고도화)
-        bias_stats = None
-        try:
-            stats_url = f"{FEEDBACK_STATS_URL}/{infant_id}"
-            logger.info(f"🧬 [Personalization] Fetching bias stats: {stats_url}")
-            stats_res = requests.get(stats_url, timeout=2)
-            if stats_res.status_code == 200:
-                bias_stats = stats_res.json().get("stats")
-                logger.info(f"   - Bias stats: {bias_stats}")
-        except Exception as e:
-            logger.warning(f"⚠️  Failed to fetch bias stats: {e}")
+        # ✅ 민감도는 이 요청의 예측에만 적용 (공유 분류기 상태를 바꾸지 않음)
+        if sensitivity not in SENSITIVITY_MODES:
+            raise HTTPException(status_code=400, detail=f"sensitivity must be one of {list(SENSITIVITY_MODES)}")
 
-        # 파일 저장
+        # ✅ 추론 대기열이 가득 찼으면 파일 저장 전에 빠르게 거절 (429 + Retry-After)
+        inference = get_inference_service()
+        inference.ensure_capacity()
+
+        audio_bytes = await audio.read()
         timestamp = int(time.time()*1000)
         dest = UPLOADS_PATH / f"{timestamp}_{Path(audio.filename).name}"
-        
-        with dest.open("wb") as f:
-            f.write(await audio.read())
-        
-        # 모델 예측
-        classifier = get_classifier()
-        classifier.set_sensitivity(sensitivity)
 
-        # ✅ 수정: bias_stats 전달
-        result = classifier.predict_with_confidence(str(dest), bias=bias_stats)
-        
-        # ✅ 3.0 고도화: Voice ID 추출
-        voice_profile = classifier.extract_voice_profile(str(dest))
+        # ✅ 서로 독립적인 단계는 동시에 시작
+        #   - 개인화 바이어스(1단계 기술 고도화) + 바이오 신호(4.0 고도화) 조회
+        #   - 파일 저장 (기록 보관용 - 분석은 메모리 내 바이트로 수행)
+        #   - 오디오 디코딩 (프로세스 풀)
+        node_client = get_node_client()
+        lookups_task = asyncio.create_task(_timed(timings, "lookups", asyncio.gather(
+            node_client.get_feedback_stats(infant_id),
+            node_client.get_vitals(infant_id),
+        )))
+        write_task = asyncio.create_task(_timed(timings, "file_write", asyncio.to_thread(dest.write_bytes, audio_bytes)))
+        stage_tasks += [lookups_task, write_task]
+
+        try:
+            decoded = await _timed(timings, "decode", inference.decode_upload(audio_bytes))
+        except InferenceBusyError:
+            raise
+        except Exception as e:
+            # 메모리 내 디코딩이 안 되는 포맷(webm 등)은 저장 파일 기반 분석으로 폴백
+            logger.warning(f"⚠️ 메모리 내 디코딩 실패, 저장 파일로 분석: {e}")
+            decoded = None
+
+        if decoded is not None:
+            # ✅ 3.0 고도화: Voice ID는 분류 결과와 무관하므로 바이어스 조회를 기다리지 않음
+            voice_task = asyncio.create_task(_timed(timings, "voice_profile", inference.voice_profile(decoded['audio'])))
+            stage_tasks.append(voice_task)
+
+            bias_stats, vitals = await lookups_task
+            if bias_stats:
+                logger.info(f"   - Bias stats: {bias_stats}")
+
+            # ✅ 모델 예측: 바이어스가 준비되면 바로 분류 (이벤트 루프 블로킹 없음)
+            result = await _timed(timings, "classify", inference.predict(
+                decoded['audio'],
+                bias=bias_stats,  # ✅ 수정: bias_stats 전달
+                sensitivity=sensitivity,
+            ))
+            voice_profile = await voice_task
+            analysis = decoded
+        else:
+            await write_task
+            bias_stats, vitals = await lookups_task
+            analysis = await _timed(timings, "classify", inference.analyze_upload(
+                audio_bytes,
+                fallback_path=str(dest),
+                bias=bias_stats,
+                sensitivity=sensitivity,
+            ))
+            result = analysis['result']
+            voice_profile = analysis['voice_profile']
+
+        await write_task
         
         now = datetime.now()
 
@@ -319,35 +413,27 @@ async def upload_audio(
         
         # ✅ 4.0 고도화: 바이오 신호(Vital) 교차 검증 (생명 안전)
         vital_warning = None
-        try:
-            vital_url = f"{VITALS_URL}/{infant_id}"
-            logger.info(f"💓 [Bio-Signal] Checking vitals: {vital_url}")
-            # 토큰 인증 없이 호출 가능하게 서버 설정되었거나 내부망 호출이라 가정
-            vital_res = requests.get(vital_url, timeout=2)
-            if vital_res.status_code == 200:
-                vitals = vital_res.json().get("vitals", {})
-                hr = vitals.get("heartRate", 120)
-                temp = vitals.get("temperature", 36.5)
-                
-                logger.info(f"   - Current Vitals: HR={hr}, Temp={temp}°C")
-                
-                # 비정상 수치 검증 (체온 37.5도 이상이거나 심박수 160 초과)
-                if temp >= 37.5 or hr > 160:
-                    logger.warning(f"🚨 [Bio-Signal] ABNORMAL VITALS DETECTED! Upgrading severity to HIGH.")
-                    severity = 'High'
-                    prediction = 'pain' if prediction != 'belly_pain' else prediction # 통증 쪽으로 유도
-                    vital_warning = f"⚠️ [긴급] 체온({temp}°C) 또는 심박수({hr}bpm)가 비정상입니다! 즉시 확인 요망!"
-        except Exception as e:
-            logger.warning(f"⚠️ [Bio-Signal] Failed to fetch vitals: {e}")
+        if vitals is not None:
+            hr = vitals.get("heartRate", 120)
+            temp = vitals.get("temperature", 36.5)
+            
+            logger.info(f"   - Current Vitals: HR={hr}, Temp={temp}°C")
+            
+            # 비정상 수치 검증 (체온 37.5도 이상이거나 심박수 160 초과)
+            if temp >= 37.5 or hr > 160:
+                logger.warning(f"🚨 [Bio-Signal] ABNORMAL VITALS DETECTED! Upgrading severity to HIGH.")
+                severity = 'High'
+                prediction = 'pain' if prediction != 'belly_pain' else prediction # 통증 쪽으로 유도
+                vital_warning = f"⚠️ [긴급] 체온({temp}°C) 또는 심박수({hr}bpm)가 비정상입니다! 즉시 확인 요망!"
         
         logger.info(f"✅ 예측 완료: {prediction} (신뢰도: {confidence:.2f}, 심각도: {severity})")
         
         # 메타정보 추출 (응답용)
-        try:
-            audio_data, sample_rate = librosa.load(str(dest), sr=None)
-            duration_ms = int(len(audio_data) / sample_rate * 1000)
-        except Exception as e:
-            logger.warning(f"⚠️ 오디오 메타정보 추출 실패: {e}")
+        if analysis['duration_ms'] is not None:
+            duration_ms = analysis['duration_ms']
+            sample_rate = analysis['sample_rate']
+        else:
+            logger.warning("⚠️ 오디오 메타정보 추출 실패")
             duration_ms = 3000
             sample_rate = 16000
 
@@ -370,14 +456,16 @@ async def upload_audio(
             "recommended_actions": rec_actions,
             "audio_file": Path(dest).name,
             "storage_uri": str(dest.relative_to(PROJECT_ROOT)),
-            "model_version": "v15.1",
+            "model_version": result.get('model_version', inference.model_version),
+            "sensitivity": result.get('sensitivity', sensitivity),
             "voice_profile": voice_profile  # ✅ Voice ID 추가
         }
 
         # ✅ 1단계: Oracle DB에 이벤트 저장 (event_id 받기)
+        # 프론트엔드가 응답의 event_id로 피드백을 보내므로 저장은 await 유지
         event_id = None
         try:
-            event_id = save_event_to_db(response_data)
+            event_id = await _timed(timings, "event_save", save_event_to_db(response_data))
             if event_id:
                 response_data["event_id"] = event_id
                 logger.info(f"✅ 이벤트 DB 저장 완료: event_id={event_id}")
@@ -397,22 +485,10 @@ async def upload_audio(
         except Exception as e:
             logger.error(f"⚠️ Music playback failed: {e}")
 
-try:
-    from backend.services.iot_service import IoTService
-    IOT_SERVICE_AVAILABLE = True
-except ImportError:
-    IOT_SERVICE_AVAILABLE = False
-    logger.warning("⚠️ IoTService not available. Smart home automation will be skipped.")
-
-# 전역 IoTService 인스턴스
-iot_service = IoTService() if IOT_SERVICE_AVAILABLE else None
-
-# ... (중략)
-
-        # ✅ 2단계: Node 백엔드 알림 (GPT 추천 생성)
+        # ✅ 2단계: Node 백엔드 알림 (GPT 추천 생성) - 응답을 기다리지 않음
         try:
             if event_id:
-                notify_node_backend(event_id, response_data)
+                node_client.fire_and_forget(notify_node_backend(event_id, dict(response_data)))
             else:
                 logger.warning("⚠️ event_id 없어서 알림 생략")
         except Exception as e:
@@ -424,21 +500,36 @@ iot_service = IoTService() if IOT_SERVICE_AVAILABLE else None
                 logger.info(f"🏠 [IoT] Triggering automation for: {prediction}")
                 infant_name = "아기" # 실제 이름을 가져올 수 있다면 더 좋음
                 
+                # IoTService는 동기 requests를 사용하므로 워커 스레드에서 실행
                 if severity == 'High':
-                    iot_result = iot_service.trigger_emergency_mode(infant_name, prediction)
+                    iot_call = asyncio.to_thread(iot_service.trigger_emergency_mode, infant_name, prediction)
                 else:
-                    iot_result = iot_service.handle_cry_event(infant_name, prediction, severity)
+                    iot_call = asyncio.to_thread(iot_service.handle_cry_event, infant_name, prediction, severity)
+                iot_result = await _timed(timings, "iot", iot_call)
                 
                 logger.info(f"✅ [IoT] Result: {iot_result.get('success')}, Actions: {iot_result.get('actions_triggered')}")
                 response_data["iot_actions"] = iot_result.get("actions_triggered", [])
                 response_data["iot_description"] = iot_result.get("description", "")
             except Exception as e:
                 logger.error(f"⚠️ [IoT] Automation failed: {e}")
+
+        # ✅ 단계별 소요 시간 (ms) - 동시 실행 단계는 합이 total보다 클 수 있음
+        timings["total"] = round((time.perf_counter() - pipeline_started) * 1000, 1)
+        response_data["timings"] = timings
+        logger.info(f"⏱️ Upload timings (ms): {timings}")
         
         return JSONResponse(content=response_data)
         
     except HTTPException:
         raise
+    except InferenceBusyError as e:
+        rejected = True
+        logger.warning(f"⏳ 추론 대기열 포화 - 요청 거절 (Retry-After: {e.retry_after}s)")
+        return JSONResponse(
+            status_code=429,
+            content={"success": False, "error": "inference_busy", "retry_after": e.retry_after},
+            headers={"Retry-After": str(e.retry_after)},
+        )
     except Exception as e:
         logger.exception("❌ Upload handler error:")
         return JSONResponse(status_code=503, content={
@@ -447,10 +538,19 @@ iot_service = IoTService() if IOT_SERVICE_AVAILABLE else None
             "trace": traceback.format_exc().splitlines()[-10:]
         })
     finally:
+        # ✅ 예외로 빠져나온 경우 아직 실행 중인 단계 정리 (조회 / Voice ID는 취소, 결과 예외도 회수)
+        #   파일 저장은 스레드에서 이미 쓰는 중일 수 있으므로 취소하지 않고 끝날 때까지 대기
+        for task in stage_tasks:
+            if not task.done() and task is not write_task:
+                task.cancel()
+        if stage_tasks:
+            await asyncio.gather(*stage_tasks, return_exceptions=True)
+        # ✅ 429로 거절한 요청은 재시도 시 다시 업로드되므로 저장한 파일 삭제
+        if rejected and dest is not None and dest.exists():
+            dest.unlink(missing_ok=True)
         # NOTE: 파일 삭제는 정책에 따라 주석 처리
         # if dest and dest.exists():
         #     os.remove(dest)
-        pass
 
 @router.get("/dashboard")
 async def get_dashboard(infant_id: int = Query(..., description="ID of the infant")):
@@ -461,13 +561,19 @@ async def get_dashboard(infant_id: int = Query(..., description="ID of the infan
         if not STORAGE_MANAGER_AVAILABLE:
             raise HTTPException(status_code=503, detail="StorageManager not available for dashboard.")
 
-        storage = get_storage_manager()
-        summary = storage.get_insights_summary(infant_id, days=7)
+        from backend.utils.storage_manager import get_async_storage_manager
+
+        # ✅ DB 스레드 풀에서 두 조회를 동시에 실행 (이벤트 루프 블로킹 없음)
+        storage = get_async_storage_manager()
+        summary, recent_events = await asyncio.gather(
+            storage.get_insights_summary(infant_id, days=7),
+            storage.get_cry_events(infant_id, limit=5),
+        )
 
         data = {
             "success": True,
             "infant_id": infant_id,
-            "recent_events": storage.get_cry_events(infant_id, limit=5),
+            "recent_events": recent_events,
             "summary": summary,
             "next_cry_prediction": None,
             "patterns": None,
@@ -494,7 +600,9 @@ async def chatbot_endpoint(request: Request):
         return {"error": "message is required"}
 
     try:
-        response = chatbot.generate_response(
+        # ChatbotService 첫 생성(OpenAI 클라이언트 import)도 이벤트 루프 밖에서
+        chatbot = await asyncio.to_thread(get_chatbot)
+        response = await chatbot.generate_response_async(
             infant_id=infant_id,
             guardian_id=guardian_id,
             user_message=user_message,
@@ -512,51 +620,79 @@ async def websocket_endpoint(websocket: WebSocket):
     """
     클라이언트로부터 실시간 오디오 청크를 받아 분석하는 WebSocket 엔드포인트
     상용화 수준의 'Always-on' 모니터링을 위한 기반
+
+    - 슬라이딩 윈도우 (기본 3초 윈도우 / 0.5초 hop, 쿼리 ?hop=0.5&mode=incremental|exact)
+    - 예측 상태가 바뀔 때만 결과 전송
     """
     await websocket.accept()
     logger.info("🔌 [WebSocket] Client connected for real-time analysis")
     
     try:
-        audio_buffer = bytearray()
+        mode = websocket.query_params.get("mode", STREAM_ANALYSIS_MODE)
+        hop_seconds = float(websocket.query_params.get("hop", STREAM_HOP_SECONDS))
+        if mode == 'incremental' and STREAM_SAMPLE_RATE != 22050:
+            logger.warning(f"⚠️ [WebSocket] incremental 모드는 22050 Hz 입력만 지원 - exact 모드로 전환")
+            mode = 'exact'
+
+        from backend.models.streaming import StreamingCryAnalyzer
+        from backend.models.gate import get_cry_gate
+
+        # incremental 모드는 프레임 캐시가 연결별 상태이므로 메인 프로세스 분류기를
+        # 추론 서비스의 bounded 스트림 스레드 풀(STREAM_ANALYSIS_WORKERS)에서 사용
+        classifier = await asyncio.to_thread(get_classifier) if mode == 'incremental' else None
+        analyzer = StreamingCryAnalyzer(
+            classifier,
+            sample_rate=STREAM_SAMPLE_RATE,
+            window_seconds=STREAM_WINDOW_SECONDS,
+            hop_seconds=hop_seconds,
+            mode=mode,
+            gate=get_cry_gate() if STREAM_GATE_ENABLED else None,
+        )
+    except ValueError as e:
+        await websocket.send_json({"type": "error", "error": str(e)})
+        await websocket.close(code=1003)
+        return
+    
+    try:
+        pending_bytes = bytearray()
         
         while True:
-            # 클라이언트로부터 바이너리 오디오 데이터 수신
+            # 클라이언트로부터 바이너리 오디오 데이터 수신 (16bit mono raw PCM)
             data = await websocket.receive_bytes()
-            audio_buffer.extend(data)
+            pending_bytes.extend(data)
             
-            # 버퍼에 충분한 데이터(예: 약 3초 분량의 바이트)가 쌓이면 분석 실행
-            # (여기서는 시뮬레이션을 위해 일정 크기 도달 시 분석으로 가정)
-            if len(audio_buffer) > 22050 * 2 * 3:  # 22.05kHz, 16bit, 3초 대략적 크기
-                logger.info(f"📡 [WebSocket] Analyzing {len(audio_buffer)} bytes of audio data...")
-                
-                # 임시 파일로 저장 후 기존 분석 로직 활용 (추후 메모리 내 직접 분석으로 고도화 가능)
-                import time
-                temp_filename = UPLOADS_PATH / f"stream_temp_{int(time.time()*1000)}.wav"
-                with open(temp_filename, "wb") as f:
-                    f.write(audio_buffer)
+            # 청크 경계에서 잘린 샘플(홀수 바이트)은 다음 청크와 합쳐서 변환
+            usable = len(pending_bytes) - (len(pending_bytes) % 2)
+            samples = pcm16_to_float32(pending_bytes[:usable])
+            del pending_bytes[:usable]
+            
+            if not analyzer.push(samples):
+                continue
+            
+            try:
+                if analyzer.mode == 'incremental':
+                    result = await get_inference_service().analyze_stream(analyzer)
+                else:
+                    # 사전 게이트(수 ms)를 통과한 윈도우만 추론 풀로 보냄
+                    result = analyzer.gate_result()
+                    if result is None:
+                        result = await get_inference_service().predict((analyzer.window(), STREAM_SAMPLE_RATE))
                 
-                try:
-                    classifier = get_classifier()
-                    result = classifier.predict_with_confidence(str(temp_filename))
-                    
-                    # 분석 결과 클라이언트로 실시간 전송
-                    await websocket.send_json({
-                        "type": "analysis_result",
-                        "timestamp": datetime.now().isoformat(),
-                        "prediction": result['prediction'],
-                        "confidence": result['confidence'],
-                        "severity": result['severity']
-                    })
-                except Exception as analysis_err:
-                    logger.error(f"⚠️ [WebSocket] Analysis error: {analysis_err}")
-                finally:
-                    # 버퍼 비우기 및 임시 파일 삭제
-                    audio_buffer = bytearray()
-                    if temp_filename.exists():
-                        os.remove(temp_filename)
+                # 분석 결과는 상태가 바뀐 경우에만 클라이언트로 전송
+                event = analyzer.update_state(result)
+                if event:
+                    event["timestamp"] = datetime.now().isoformat()
+                    logger.info(f"📡 [WebSocket] State changed: {event['previous']} → {event['prediction']}")
+                    await websocket.send_json(event)
+            except InferenceBusyError:
+                # 추론 대기열 포화 시 이번 윈도우는 건너뜀 (실시간성 우선)
+                analyzer.drop_window()
+                logger.warning("⏳ [WebSocket] Inference busy, dropping window")
+            except Exception as analysis_err:
+                logger.error(f"⚠️ [WebSocket] Analysis error: {analysis_err}")
                         
     except WebSocketDisconnect:
-        logger.info("🔌 [WebSocket] Client disconnected")
+        logger.info(f"🔌 [WebSocket] Client disconnected ({analyzer.get_stats()})")
     except Exception as e:
         logger.error(f"❌ [WebSocket] Error: {e}")
 
@@ -565,27 +701,100 @@ async def websocket_endpoint(websocket: WebSocket):
 # ====================================================================
 import subprocess
 
-def run_retrain_pipeline():
-    """백그라운드에서 모델 재학습 파이프라인 실행 시뮬레이션"""
+MLOPS_ADMIN_KEY = os.getenv('MLOPS_ADMIN_KEY', 'super_secret_mlops_key')
+
+# 최근 배포 상태 (GET /mlops/models)
+_deploy_status = {"state": "idle", "version": None, "error": None, "result": None, "updated_at": None}
+_deploy_lock = asyncio.Lock()
+
+
+def _require_admin(admin_key):
+    if admin_key != MLOPS_ADMIN_KEY:
+        raise HTTPException(status_code=403, detail="Unauthorized")
+
+
+def _swap_classifier(model_path, model_version):
+    """메인 프로세스 분류기(WebSocket incremental 모드용)를 새 버전으로 교체하고 이전 참조 반환"""
+    global _classifier_instance
+    previous = _classifier_instance
+    if previous is None:
+        return  # 아직 사용된 적 없으면 다음 get_classifier()가 활성 버전을 로드
+    _classifier_instance = get_model_registry().acquire(
+        model_path,
+        sensitivity=previous.sensitivity,
+        feature_profile=previous.feature_profile,
+        model_version=model_version
+    )
+    get_model_registry().release(previous)
+
+
+async def deploy_model_version(version, model_path=None):
+    """
+    모델 버전 무중단 배포
+
+    1) 추론 풀을 새 버전으로 교체 (백그라운드 로드 + canary 검증 + 원자적 교체, 실패 시 기존 버전 유지)
+    2) 메인 프로세스 분류기 교체
+    3) (model_path가 있으면) 카탈로그에 등록 → 활성 버전 기록
+    """
+    catalog = get_model_catalog()
+    async with _deploy_lock:
+        _deploy_status.update(state="deploying", version=version, error=None, result=None, updated_at=datetime.now().isoformat())
+        try:
+            path = model_path or catalog.resolve(version)
+            result = await get_inference_service().swap_model(path, version)
+            await asyncio.to_thread(_swap_classifier, path, version)
+            # 검증을 통과한 버전만 카탈로그에 등록
+            if model_path:
+                catalog.register(version, model_path)
+            catalog.set_active(version)
+        except (KeyError, ModelDeployError) as e:
+            logger.error(f"❌ [MLOps] Deploy of {version} failed, keeping {catalog.active}: {e}")
+            _deploy_status.update(state="failed", error=str(e), updated_at=datetime.now().isoformat())
+            raise
+        _deploy_status.update(state="deployed", result=result, updated_at=datetime.now().isoformat())
+        logger.info(f"✅ [MLOps] Model {version} deployed (Zero-downtime, previous: {result['previous_version']})")
+        return result
+
+
+async def _deploy_in_background(version, model_path=None):
+    try:
+        await deploy_model_version(version, model_path)
+    except (KeyError, ModelDeployError):
+        pass  # _deploy_status에 기록됨
+
+
+async def run_retrain_pipeline():
+    """
+    백그라운드 재학습 파이프라인
+
+    학습 단계는 아직 시뮬레이션이며, RETRAIN_OUTPUT_PREFIX(기본 models/baby_cry_v15_2)에
+    학습 결과 모델이 있으면 카탈로그에 등록하고 무중단 배포합니다.
+    """
     logger.info("🔄 [MLOps] Starting automated retraining pipeline...")
-    time.sleep(2)
+    await asyncio.sleep(2)
     logger.info("🔄 [MLOps] 1. Fetching feedback data from DB...")
-    time.sleep(2)
+    await asyncio.sleep(2)
     logger.info("🔄 [MLOps] 2. Augmenting dataset with new user feedbacks...")
-    time.sleep(3)
-    logger.info("🔄 [MLOps] 3. Training new model version (v15.2)...")
+    await asyncio.sleep(3)
+    output_prefix = Path(os.getenv('RETRAIN_OUTPUT_PREFIX', str(PROJECT_ROOT / 'models' / 'baby_cry_v15_2')))
+    version = os.getenv('RETRAIN_OUTPUT_VERSION') or version_label(output_prefix)
+    logger.info(f"🔄 [MLOps] 3. Training new model version ({version})...")
     # 실제 환경에서는 subprocess를 통해 train.py 실행
     # subprocess.run(["python", "backend/dataset_tools/train.py"], check=True)
-    time.sleep(3)
-    logger.info("✅ [MLOps] Retraining complete. New model deployed (Zero-downtime).")
+    await asyncio.sleep(3)
+
+    if not (Path(f"{output_prefix}_detector.pkl").is_file() or (Path(f"{output_prefix}_bundle") / 'manifest.json').is_file()):
+        logger.warning(f"⚠️ [MLOps] No trained model found at {output_prefix}, keeping {get_model_catalog().active}")
+        return
+    logger.info(f"🔄 [MLOps] 4. Deploying {version}...")
+    await _deploy_in_background(version, str(output_prefix))
 
 @router.post("/mlops/retrain")
 async def trigger_retraining(background_tasks: BackgroundTasks, admin_key: str = Query(..., description="Admin Secret Key")):
     """
     피드백 데이터가 1000건 이상 쌓였을 때 호출되어 모델을 재학습하는 엔드포인트.
     """
-    if admin_key != "super_secret_mlops_key":
-        raise HTTPException(status_code=403, detail="Unauthorized")
+    _require_admin(admin_key)
     
     # 백그라운드 태스크로 재학습 프로세스 던지기 (Non-blocking)
     background_tasks.add_task(run_retrain_pipeline)
@@ -596,6 +805,62 @@ async def trigger_retraining(background_tasks: BackgroundTasks, admin_key: str =
         "status": "in_progress"
     })
 
+@router.get("/mlops/models")
+async def list_model_versions(admin_key: str = Query(..., description="Admin Secret Key")):
+    """등록된 모델 버전 / 활성 버전 / 최근 배포 상태"""
+    _require_admin(admin_key)
+    return {
+        **get_model_catalog().to_dict(),
+        "serving": get_inference_stats(),
+        "deploy": _deploy_status,
+        "memory": get_model_memory_report(),
+    }
+
+@router.post("/mlops/deploy")
+async def deploy_model(
+    background_tasks: BackgroundTasks,
+    version: str = Query(..., description="배포할 모델 버전 (예: v15.2)"),
+    model_path: str = Query(None, description="새 버전이면 모델 prefix 또는 번들 경로 (예: models/baby_cry_v15_2)"),
+    admin_key: str = Query(..., description="Admin Secret Key")
+):
+    """
+    모델 버전 무중단 배포 (백그라운드 로드 + canary 검증 후 교체, 진행 상황은 GET /mlops/models)
+    """
+    _require_admin(admin_key)
+    if _deploy_lock.locked():
+        raise HTTPException(status_code=409, detail=f"Deploy of {_deploy_status['version']} already in progress")
+    if model_path is None:
+        try:
+            get_model_catalog().resolve(version)
+        except KeyError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+    elif not Path(model_path).is_absolute():
+        model_path = str(PROJECT_ROOT / model_path)
+
+    background_tasks.add_task(_deploy_in_background, version, model_path)
+    return JSONResponse(status_code=202, content={
+        "success": True,
+        "message": f"Deploying model {version} in background.",
+        "status": "in_progress"
+    })
+
+@router.post("/mlops/rollback")
+async def rollback_model(background_tasks: BackgroundTasks, admin_key: str = Query(..., description="Admin Secret Key")):
+    """직전 활성 버전으로 되돌리기 (배포와 같은 무중단 교체 경로)"""
+    _require_admin(admin_key)
+    if _deploy_lock.locked():
+        raise HTTPException(status_code=409, detail=f"Deploy of {_deploy_status['version']} already in progress")
+    previous = get_model_catalog().previous
+    if previous is None:
+        raise HTTPException(status_code=404, detail="No previous model version to roll back to")
+
+    background_tasks.add_task(_deploy_in_background, previous)
+    return JSONResponse(status_code=202, content={
+        "success": True,
+        "message": f"Rolling back to model {previous} in background.",
+        "status": "in_progress"
+    })
+
 # ====================================================================
 # ## LangGraph 라우터 Export (메인 app에서 등록)
 # ====================================================================
@@ -0,0 +1,198 @@
+"""
+get_action_stats 집계 위치 벤치마크 (Python 집계 vs DB GROUP BY)
+- 로컬 합성 데이터셋(SQLite 메모리 DB, cry_event / action_log는 db/babycry_XE.sql과 같은 컬럼 + 인덱스)에서
+  기존 방식(조치 1건당 1행 전송 후 Python dict로 집계)과 서버 집계(ACTION_STATS_SQL과 같은 GROUP BY)를 비교
+- 전송 행 수 / 지연 시간(중앙값)을 출력하고 두 방식의 결과가 같은지 확인
+- Oracle 없이 실행 가능 (SQLite 방언: NVL → COALESCE, SYSDATE - :days → :since)
+
+사용 예:
+    python -m backend.dataset_tools.bench_action_stats
+    python -m backend.dataset_tools.bench_action_stats --infants 50 --events-per-day 40 --days 7 30 --repeat 7
+"""
+
+import argparse
+import random
+import sqlite3
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from backend.utils.storage_manager import build_action_stats
+
+CRY_TYPES = ['belly_pain', 'cold_hot', 'burping', 'discomfort', 'hungry', 'tired', 'emotional', 'needs_attention']
+RESULTS = ['success', 'success', 'partial', 'fail']
+
+SCHEMA = """
+CREATE TABLE cry_event (
+  event_id    INTEGER PRIMARY KEY,
+  infant_id   INTEGER NOT NULL,
+  event_time  TEXT NOT NULL,
+  cry_type    TEXT
+);
+CREATE TABLE action_log (
+  action_id     INTEGER PRIMARY KEY,
+  event_id      INTEGER NOT NULL REFERENCES cry_event(event_id),
+  action_detail TEXT,
+  result        TEXT,
+  executed_at   TEXT
+);
+CREATE INDEX idx_event_infant_time ON cry_event(infant_id, event_time, cry_type, event_id);
+CREATE INDEX idx_action_event_time ON action_log(event_id, executed_at);
+"""
+
+# 기존 get_action_stats 쿼리 (조치마다 1행)
+LEGACY_SQL = """
+    SELECT e.cry_type, a.action_detail, a.result
+    FROM action_log a
+    JOIN cry_event e
+      ON a.event_id = e.event_id
+    WHERE e.infant_id = :infant_id
+      AND e.event_time >= :since
+"""
+
+# ACTION_STATS_SQL의 SQLite 버전 (정수 나눗셈 방지를 위해 1.0 곱함)
+GROUPED_SQL = """
+    SELECT
+        COALESCE(e.cry_type, 'unknown') AS cry_type,
+        a.action_detail,
+        COUNT(*) AS trials,
+        SUM(CASE WHEN LOWER(a.result) = 'success' THEN 1 ELSE 0 END) AS success,
+        SUM(CASE WHEN LOWER(a.result) = 'fail' THEN 1 ELSE 0 END) AS fail,
+        SUM(CASE WHEN LOWER(a.result) = 'success' THEN 1 ELSE 0 END) * 1.0 / COUNT(*) AS success_rate
+    FROM cry_event e
+    JOIN action_log a
+      ON a.event_id = e.event_id
+    WHERE e.infant_id = :infant_id
+      AND e.event_time >= :since
+      AND a.action_detail IS NOT NULL
+    GROUP BY COALESCE(e.cry_type, 'unknown'), a.action_detail
+    ORDER BY cry_type, success_rate DESC, trials DESC
+"""
+
+
+def build_dataset(infants=20, history_days=30, events_per_day=30, details_per_type=12, seed=0):
+    """
+    합성 데이터셋 생성 (이벤트당 조치 1~3건, 일부 조치는 action_detail 없음)
+
+    Returns:
+    --------
+    (sqlite3.Connection, dict) : DB 연결, {'events': n, 'actions': n}
+    """
+    rng = random.Random(seed)
+    conn = sqlite3.connect(':memory:')
+    conn.executescript(SCHEMA)
+    details = {cry_type: [f"{cry_type} 조치 {i}" for i in range(details_per_type)] for cry_type in CRY_TYPES}
+    now = datetime.now()
+
+    events, actions = [], []
+    for infant_id in range(1, infants + 1):
+        for _ in range(history_days * events_per_day):
+            event_id = len(events) + 1
+            cry_type = rng.choice(CRY_TYPES) if rng.random() > 0.02 else None
+            event_time = now - timedelta(seconds=rng.uniform(0, history_days * 86400))
+            events.append((event_id, infant_id, event_time.isoformat(sep=' '), cry_type))
+            for _ in range(rng.randint(1, 3)):
+                detail = rng.choice(details[cry_type or 'hungry']) if rng.random() > 0.05 else None
+                actions.append((len(actions) + 1, event_id, detail, rng.choice(RESULTS), event_time.isoformat(sep=' ')))
+
+    conn.executemany("INSERT INTO cry_event VALUES (?, ?, ?, ?)", events)
+    conn.executemany("INSERT INTO action_log VALUES (?, ?, ?, ?, ?)", actions)
+    conn.commit()
+    conn.execute("ANALYZE")
+    return conn, {'events': len(events), 'actions': len(actions)}
+
+
+def legacy_action_stats(rows):
+    """기존 get_action_stats의 Python 집계 (비교 기준)"""
+    stats = {}
+    for cry_type, action_detail, result in rows:
+        cry_type = cry_type or 'unknown'
+        if not action_detail:
+            continue
+        entry = stats.setdefault(cry_type, {}).setdefault(
+            action_detail, {"detail": action_detail, "trials": 0, "success": 0, "fail": 0}
+        )
+        entry["trials"] += 1
+        res = (result or "").lower()
+        if res == "success":
+            entry["success"] += 1
+        elif res == "fail":
+            entry["fail"] += 1
+
+    result_dict = {}
+    for cry_type, actions_dict in stats.items():
+        actions_list = [
+            {**entry, "success_rate": entry["success"] / entry["trials"] if entry["trials"] > 0 else 0.0}
+            for entry in actions_dict.values()
+        ]
+        actions_list.sort(key=lambda x: (x["success_rate"], x["trials"]), reverse=True)
+        result_dict[cry_type] = actions_list
+    return result_dict
+
+
+def _time_query(conn, sql, params, aggregate, repeat):
+    timings, rows_transferred, result = [], 0, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = conn.execute(sql, params).fetchall()
+        result = aggregate(rows)
+        timings.append((time.perf_counter() - started) * 1000)
+        rows_transferred = len(rows)
+    return {'rows': rows_transferred, 'median_ms': round(statistics.median(timings), 2), 'result': result}
+
+
+def _normalized(stats):
+    # 성공률 / 시행 횟수가 같은 조치끼리는 순서가 정해져 있지 않으므로 detail로 정렬해서 비교
+    return {
+        cry_type: sorted(
+            (entry["detail"], entry["trials"], entry["success"], entry["fail"], round(entry["success_rate"], 9))
+            for entry in entries
+        )
+        for cry_type, entries in stats.items()
+    }
+
+
+def run_benchmark(conn, infant_id=1, days=7, repeat=5):
+    since = (datetime.now() - timedelta(days=days)).isoformat(sep=' ')
+    params = {'infant_id': infant_id, 'since': since}
+    legacy = _time_query(conn, LEGACY_SQL, params, legacy_action_stats, repeat)
+    grouped = _time_query(conn, GROUPED_SQL, params, build_action_stats, repeat)
+    return {
+        'days': days,
+        'legacy': legacy,
+        'grouped': grouped,
+        'same_result': _normalized(legacy['result']) == _normalized(grouped['result']),
+    }
+
+
+def print_report(report):
+    legacy, grouped = report['legacy'], report['grouped']
+    speedup = legacy['median_ms'] / grouped['median_ms'] if grouped['median_ms'] else float('inf')
+    print(f"\n📊 최근 {report['days']}일")
+    print(f"  Python 집계 : {legacy['rows']:7d} rows  {legacy['median_ms']:8.2f}ms")
+    print(f"  GROUP BY    : {grouped['rows']:7d} rows  {grouped['median_ms']:8.2f}ms")
+    print(f"  → 전송 행 {legacy['rows'] / max(1, grouped['rows']):.1f}배 감소, {speedup:.1f}배 빠름, "
+          f"결과 일치: {'✅' if report['same_result'] else '❌'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="get_action_stats 집계 벤치마크 (합성 데이터셋)")
+    parser.add_argument('--infants', type=int, default=20, help="아기 수")
+    parser.add_argument('--history-days', type=int, default=30, help="생성할 기록 기간 (일)")
+    parser.add_argument('--events-per-day', type=int, default=30, help="아기 1명당 하루 이벤트 수")
+    parser.add_argument('--days', type=int, nargs='+', default=[7, 30], help="조회 기간 (get_action_stats의 days)")
+    parser.add_argument('--repeat', type=int, default=5, help="반복 횟수 (중앙값 사용)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    conn, sizes = build_dataset(args.infants, args.history_days, args.events_per_day, seed=args.seed)
+    print(f"📦 합성 데이터셋: 아기 {args.infants}명, 이벤트 {sizes['events']}건, 조치 {sizes['actions']}건")
+    plan = conn.execute("EXPLAIN QUERY PLAN " + GROUPED_SQL, {'infant_id': 1, 'since': ''}).fetchall()
+    print("🔍 GROUP BY 실행 계획: " + " / ".join(row[-1] for row in plan))
+
+    mismatched = False
+    for days in args.days:
+        report = run_benchmark(conn, infant_id=1, days=days, repeat=max(1, args.repeat))
+        print_report(report)
+        mismatched |= not report['same_result']
+    raise SystemExit(1 if mismatched else 0)
@@ -0,0 +1,118 @@
+"""
+python-backend 시작(import) 시간 벤치마크 + 회귀 예산 검사
+- 새 프로세스에서 `python -X importtime -c "import main"`을 반복 실행해 전체 import 시간(중앙값)과
+  누적 시간이 큰 모듈을 출력
+- 예산(--budget-ms)을 넘거나, 시작 시 import되면 안 되는 무거운 모듈(--forbid)이 로드되면 종료 코드 1
+  (scipy / sklearn / openai / langgraph / oracledb는 첫 요청 또는 lifespan 예열에서 로드)
+
+사용 예:
+    python -m backend.dataset_tools.bench_import
+    python -m backend.dataset_tools.bench_import --budget-ms 2500 --repeat 5 --top 15
+    python -m backend.dataset_tools.bench_import --module backend.api --forbid scipy sklearn
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_FORBIDDEN = ['scipy', 'sklearn', 'openai', 'langgraph', 'oracledb']
+
+# "import time: self [us] | cumulative | imported package"
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def measure_once(module='main'):
+    """
+    새 인터프리터에서 모듈 1회 import
+
+    Returns:
+    --------
+    dict : {'total_ms': 최상위 import 누적 합, 'modules': {모듈명: 누적 ms}}
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=str(BACKEND_ROOT), env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    modules = {}
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        cumulative_us = int(match.group(2))
+        name = match.group(4)
+        modules[name] = max(modules.get(name, 0), cumulative_us / 1000)
+        # 들여쓰기 1칸 = 최상위 import (중첩 import는 누적 시간에 이미 포함)
+        if len(match.group(3)) == 1:
+            total_us += cumulative_us
+    return {'total_ms': total_us / 1000, 'modules': modules}
+
+
+def run_benchmark(module='main', repeat=3):
+    runs = [measure_once(module) for _ in range(repeat)]
+    totals = [run['total_ms'] for run in runs]
+    # 모듈별 시간은 중앙값 실행 기준
+    median_run = sorted(runs, key=lambda run: run['total_ms'])[len(runs) // 2]
+    return {
+        'module': module,
+        'repeat': repeat,
+        'total_ms': round(statistics.median(totals), 1),
+        'min_ms': round(min(totals), 1),
+        'max_ms': round(max(totals), 1),
+        'modules': median_run['modules'],
+    }
+
+
+def find_forbidden(modules, forbidden):
+    """시작 시 로드되면 안 되는 패키지 중 실제로 import된 것"""
+    loaded = set()
+    for name in modules:
+        root = name.split('.')[0]
+        if root in forbidden:
+            loaded.add(root)
+    return sorted(loaded)
+
+
+def print_report(report, top=10):
+    print(f"\n📊 import {report['module']} x{report['repeat']}: "
+          f"median {report['total_ms']}ms (min {report['min_ms']} / max {report['max_ms']})")
+    print(f"\n🔍 Top {top} cumulative:")
+    ranked = sorted(report['modules'].items(), key=lambda item: item[1], reverse=True)
+    for name, ms in ranked[:top]:
+        print(f"  {ms:9.1f}ms  {name}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="python-backend import 시간 벤치마크")
+    parser.add_argument('--module', default='main', help="측정할 모듈 (python-backend 기준, 기본: main)")
+    parser.add_argument('--repeat', type=int, default=3, help="반복 횟수 (중앙값 사용)")
+    parser.add_argument('--budget-ms', type=float, default=float(os.getenv('IMPORT_BUDGET_MS', 2000)),
+                        help="전체 import 시간 예산 (기본: IMPORT_BUDGET_MS 또는 2000)")
+    parser.add_argument('--forbid', nargs='*', default=DEFAULT_FORBIDDEN,
+                        help="시작 시 import되면 실패로 처리할 패키지")
+    parser.add_argument('--top', type=int, default=10, help="출력할 상위 모듈 수")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.module, max(1, args.repeat))
+    print_report(report, args.top)
+
+    failed = False
+    forbidden = find_forbidden(report['modules'], set(args.forbid))
+    if forbidden:
+        print(f"\n❌ Heavy modules imported at startup: {', '.join(forbidden)}")
+        failed = True
+    if report['total_ms'] > args.budget_ms:
+        print(f"\n❌ Over budget: {report['total_ms']}ms > {args.budget_ms}ms")
+        failed = True
+    if not failed:
+        print(f"\n✅ Within budget ({report['total_ms']}ms <= {args.budget_ms}ms)")
+    sys.exit(1 if failed else 0)
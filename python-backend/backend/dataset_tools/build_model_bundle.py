@@ -0,0 +1,63 @@
+"""
+모델 번들 생성 스크립트
+- 학습 결과 pickle(models/baby_cry_v15_1_*.pkl)을 manifest.json + 컴포넌트 파일 디렉터리로 변환
+- 생성된 번들(models/baby_cry_v15_1_bundle/)은 CryClassifier.load_model이 자동으로 우선 사용
+- 재학습 후에는 다시 실행해야 번들이 새 모델을 반영함
+  (다시 만들기 전까지는 원본 pickle과 manifest의 해시가 달라 로더가 경고 후 원본 pickle을 사용)
+
+사용 예:
+    python -m backend.dataset_tools.build_model_bundle --model-prefix models/baby_cry_v15_1
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+from backend.models.bundle import ModelBundle, build_bundle
+from backend.models.classifier import CryClassifier
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
+
+def check_bundle(model_prefix, bundle_dir):
+    """번들과 기존 pickle이 같은 설정으로 로드되는지 확인하고 로드 시간을 비교"""
+    corrupted = ModelBundle(bundle_dir).verify()
+    if corrupted:
+        print(f"❌ Hash mismatch: {corrupted}")
+        return False
+
+    started = time.perf_counter()
+    from_bundle = CryClassifier('')
+    from_bundle.load_model(bundle_dir)
+    bundle_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    legacy = CryClassifier('')
+    # 번들 탐색을 끄고 기존 pickle 경로로 로드
+    os.environ['CRY_MODEL_BUNDLE'] = '0'
+    try:
+        legacy.load_model(model_prefix)
+    finally:
+        os.environ.pop('CRY_MODEL_BUNDLE', None)
+    legacy_ms = (time.perf_counter() - started) * 1000
+
+    same = (
+        list(from_bundle.detector.classes_) == list(legacy.detector.classes_)
+        and list(from_bundle.stage1.classes_) == list(legacy.stage1.classes_)
+        and from_bundle.thresholds == legacy.thresholds
+    )
+    print(f"\n{'✅' if same else '❌'} bundle load {bundle_ms:.0f}ms vs pickle load {legacy_ms:.0f}ms")
+    return same
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="모델 번들 생성")
+    parser.add_argument('--model-prefix', default=str(PROJECT_ROOT / 'models' / 'baby_cry_v15_1'))
+    parser.add_argument('--output', help="번들 디렉터리 (기본: <prefix>_bundle)")
+    parser.add_argument('--check', action='store_true', help="생성 후 해시 / 로드 결과 확인")
+    args = parser.parse_args()
+
+    bundle_dir = build_bundle(args.model_prefix, args.output)
+    if args.check:
+        check_bundle(args.model_prefix, bundle_dir)
@@ -0,0 +1,130 @@
+"""
+사전 게이트(CryGate) 임계값 보정 스크립트
+- Dataset/cry 하위 오디오 중 detector가 울음으로 통과시키는 윈도우는 거의 모두(target_recall) 통과하도록
+  에너지 / ZCR / 스펙트럴 플럭스 임계값을 분위수로 결정
+- Dataset/not_cry 윈도우 중 게이트에서 걸러지는 비율(= 절약되는 전체 분석 비율)을 함께 보고
+- 결과는 models/baby_cry_v15_1_gate.json 으로 저장 (CryGate.load가 읽음)
+
+사용 예:
+    python -m backend.dataset_tools.calibrate_gate --cry Dataset/cry --not-cry Dataset/not_cry
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import librosa
+import numpy as np
+
+from backend.models.classifier import CryClassifier
+from backend.models.gate import CryGate, DEFAULT_GATE_PATH, PROJECT_ROOT
+
+AUDIO_EXTENSIONS = ('.wav', '.mp3', '.flac', '.ogg', '.m4a', '.webm')
+
+
+def iter_windows(audio_path, sr=22050, window_seconds=3.0, hop_seconds=1.5):
+    """파일을 스트리밍 분석과 같은 길이의 윈도우로 나눔 (짧은 파일은 0 패딩 1개)"""
+    y, _ = librosa.load(str(audio_path), sr=sr)
+    window = int(sr * window_seconds)
+    hop = int(sr * hop_seconds)
+    if len(y) < window:
+        yield np.pad(y, (0, window - len(y)))
+        return
+    for start in range(0, len(y) - window + 1, hop):
+        yield y[start:start + window]
+
+
+def list_audio_files(root):
+    root = Path(root)
+    if not root.exists():
+        return []
+    return sorted(p for p in root.rglob('*') if p.suffix.lower() in AUDIO_EXTENSIONS)
+
+
+def collect(files, gate, classifier):
+    """윈도우별 (게이트 특징, detector 통과 여부)"""
+    feats, passed_detector = [], []
+    for i, audio_path in enumerate(files):
+        try:
+            for y in iter_windows(audio_path, sr=gate.sr):
+                feats.append(gate.features(y))
+                result = classifier.predict_from_array(y, gate.sr)
+                passed_detector.append(result['prediction'] not in ('not_cry', 'error'))
+        except Exception as e:
+            print(f"[경고] {audio_path.name} 처리 중 오류 발생: {e}")
+        if (i + 1) % 50 == 0:
+            print(f"Processed {i + 1}/{len(files)} files...")
+    return feats, np.array(passed_detector, dtype=bool)
+
+
+def calibrate_gate(cry_audio_path, not_cry_audio_path, model_prefix, output_path, target_recall=0.995):
+    classifier = CryClassifier('')
+    classifier.load_model(model_prefix)
+    gate = CryGate()
+
+    if len(classifier.detector.classes_) < 2:
+        print("⚠️ detector가 단일 클래스(cry)만 예측합니다 - cry 폴더 라벨과 함께 사용해 보정합니다")
+
+    cry_feats, cry_passed = collect(list_audio_files(cry_audio_path), gate, classifier)
+    neg_feats, _ = collect(list_audio_files(not_cry_audio_path), gate, classifier)
+
+    # 기준 양성: cry 폴더 윈도우 중 detector도 울음으로 통과시킨 것
+    positives = [f for f, ok in zip(cry_feats, cry_passed) if ok]
+    if not positives:
+        print("⚠️ 보정에 사용할 울음 윈도우가 없습니다. Dataset 경로를 확인하세요.")
+        return None
+
+    # 세 조건의 미스가 겹치지 않는다고 보고 조건별 허용 미스율을 1/3씩 배분
+    tail = (1.0 - target_recall) / 3.0 * 100.0
+    band_db = np.array([f['band_db'] for f in positives])
+    zcr = np.array([f['zcr'] for f in positives])
+    flux = np.array([f['flux'] for f in positives])
+    # 보간하지 않고 실제 샘플 값을 경계로 사용 (윈도우 수가 적을 때 경계 샘플이 빠지지 않도록)
+    thresholds = {
+        'min_band_db': float(np.percentile(band_db, tail, method='lower')),
+        'max_zcr': float(np.percentile(zcr, 100.0 - tail, method='higher')),
+        'min_flux': float(np.percentile(flux, tail, method='lower')),
+    }
+
+    recall = float(np.mean([_passes(thresholds, f) for f in positives]))
+    negative_gated = float(np.mean([not _passes(thresholds, f) for f in neg_feats])) if neg_feats else None
+
+    report = {
+        'thresholds': thresholds,
+        'target_recall': target_recall,
+        'positive_recall': recall,
+        'negative_gated_fraction': negative_gated,
+        'n_positive_windows': len(positives),
+        'n_negative_windows': len(neg_feats),
+        'model_prefix': str(model_prefix),
+        'calibrated_at': datetime.now().isoformat(),
+    }
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"\n✅ 게이트 보정 완료: {output_path}")
+    print(f"   thresholds: {thresholds}")
+    print(f"   울음 윈도우 통과율: {recall:.4f} (목표 {target_recall})")
+    if negative_gated is not None:
+        print(f"   비울음 윈도우 게이트 차단율: {negative_gated:.4f}")
+    return report
+
+
+def _passes(t, feats):
+    return feats['band_db'] >= t['min_band_db'] and feats['zcr'] <= t['max_zcr'] and feats['flux'] >= t['min_flux']
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CryGate 임계값 보정")
+    parser.add_argument('--cry', default=str(PROJECT_ROOT / 'Dataset' / 'cry'))
+    parser.add_argument('--not-cry', default=str(PROJECT_ROOT / 'Dataset' / 'not_cry'))
+    parser.add_argument('--model-prefix', default=str(PROJECT_ROOT / 'models' / 'baby_cry_v15_1'))
+    parser.add_argument('--output', default=str(DEFAULT_GATE_PATH))
+    parser.add_argument('--target-recall', type=float, default=0.995)
+    args = parser.parse_args()
+
+    calibrate_gate(args.cry, args.not_cry, args.model_prefix, args.output, args.target_recall)
@@ -0,0 +1,197 @@
+"""
+특징 추출 경로 검증 하네스
+- 기준(baseline) 특징 엔진 설정과 후보(candidate) 설정으로 같은 참조 오디오를 분석해
+  특징 그룹별 오차, 모델 출력(예측 / 신뢰도 / 확률) 일치율, 클립당 추출 시간을 비교
+- 참조 오디오가 Dataset/cry/<원인>/, Dataset/not_cry/ 구조면 폴더명을 정답으로 캐스케이드 정확도도 비교
+- 재학습 없이 특징 계산 방식을 바꿔도 되는지 판단하는 용도
+
+사용 예:
+    python -m backend.dataset_tools.validate_features Dataset \\
+        --baseline profile=exact --candidate profile=fast
+    python -m backend.dataset_tools.validate_features Dataset/cry \\
+        --baseline tempo_method=beat_track --candidate tempo_method=tempo
+"""
+
+import argparse
+import copy
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from backend.models.classifier import CryClassifier
+from backend.models.feature_engine import FEATURE_LAYOUT, FEATURE_PROFILES, SpectralFeatureEngine
+
+AUDIO_EXTENSIONS = ('.wav', '.mp3', '.flac', '.ogg', '.m4a', '.webm')
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
+
+def parse_engine_options(pairs):
+    """
+    ['tempo_method=tempo', 'n_mfcc=13'] → {'tempo_method': 'tempo', 'n_mfcc': 13}
+    'profile=fast'는 FEATURE_PROFILES['fast'] 옵션으로 펼침
+    """
+    options = {}
+    for pair in pairs or []:
+        key, _, value = pair.partition('=')
+        if key == 'profile':
+            options.update(FEATURE_PROFILES[value])
+        else:
+            options[key] = int(value) if value.isdigit() else value
+    return options
+
+
+def list_reference_files(paths):
+    files = []
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob('*') if p.suffix.lower() in AUDIO_EXTENSIONS))
+        elif path.exists():
+            files.append(path)
+    return files
+
+
+def _classifier_with_engine(base, engine_options):
+    """로드된 모델은 공유하고 특징 엔진만 바꾼 분류기 복사본"""
+    clone = copy.copy(base)
+    clone.feature_engine = SpectralFeatureEngine(sr=base.feature_engine.sr, **engine_options)
+    # 매 실행마다 실제로 특징을 계산해 비교 / 시간 측정
+    clone.feature_cache = None
+    return clone
+
+
+def _run(classifier, files):
+    features, results, elapsed = [], [], []
+    for audio_path in files:
+        started = time.perf_counter()
+        vector = classifier.extract_features(str(audio_path))
+        elapsed.append(time.perf_counter() - started)
+        features.append(vector)
+        results.append(classifier.predict_from_features(vector) if vector is not None else None)
+    return features, results, elapsed
+
+
+def validate_features(reference_files, model_prefix, baseline_options=None, candidate_options=None):
+    """
+    Returns:
+    --------
+    dict : {
+        'feature_groups': { 그룹명: { 'max_abs', 'max_rel' } },
+        'prediction_agreement', 'max_confidence_diff', 'max_probability_diff',
+        'baseline_accuracy', 'candidate_accuracy' (폴더 라벨이 있을 때),
+        'baseline_ms', 'candidate_ms', 'speedup', 'n_files'
+    }
+    """
+    base = CryClassifier('')
+    base.load_model(model_prefix)
+    baseline = _classifier_with_engine(base, baseline_options or {})
+    candidate = _classifier_with_engine(base, candidate_options or {})
+
+    # 첫 호출의 지연(JIT / 필터뱅크 캐시 등)은 시간 비교에서 제외
+    if reference_files:
+        baseline.extract_features(str(reference_files[0]))
+        candidate.extract_features(str(reference_files[0]))
+
+    base_features, base_results, base_time = _run(baseline, reference_files)
+    cand_features, cand_results, cand_time = _run(candidate, reference_files)
+
+    # 폴더명이 클래스명인 파일만 정답 라벨로 사용
+    known_labels = set(base.category_mapping) | {'not_cry'}
+    labels = [p.parent.name if p.parent.name in known_labels else None for p in map(Path, reference_files)]
+
+    pairs = [(b, c) for b, c in zip(base_features, cand_features) if b is not None and c is not None]
+    if not pairs:
+        print("⚠️ 비교할 수 있는 참조 오디오가 없습니다.")
+        return None
+    base_matrix = np.vstack([b for b, _ in pairs])
+    cand_matrix = np.vstack([c for _, c in pairs])
+
+    # 특징 그룹별 최대 절대 / 상대 오차
+    feature_groups = {}
+    offset = 0
+    for name, size in FEATURE_LAYOUT:
+        b = base_matrix[:, offset:offset + size]
+        c = cand_matrix[:, offset:offset + size]
+        abs_diff = np.abs(b - c)
+        feature_groups[name] = {
+            'max_abs': float(abs_diff.max()),
+            'max_rel': float((abs_diff / np.maximum(np.abs(b), 1e-9)).max()),
+        }
+        offset += size
+
+    # 모델 출력 비교
+    agree, conf_diff, prob_diff = [], [], []
+    for b, c in zip(base_results, cand_results):
+        if b is None or c is None:
+            continue
+        agree.append(b['prediction'] == c['prediction'])
+        conf_diff.append(abs(b['confidence'] - c['confidence']))
+        keys = set(b.get('probabilities', {})) | set(c.get('probabilities', {}))
+        prob_diff.extend(
+            abs(b['probabilities'].get(k, 0.0) - c['probabilities'].get(k, 0.0)) for k in keys
+        )
+
+    def accuracy(results):
+        scored = [r['prediction'] == label for r, label in zip(results, labels) if r is not None and label]
+        return float(np.mean(scored)) if scored else None
+
+    baseline_ms = float(np.mean(base_time) * 1000)
+    candidate_ms = float(np.mean(cand_time) * 1000)
+    return {
+        'n_files': len(pairs),
+        'baseline': baseline_options or {},
+        'candidate': candidate_options or {},
+        'feature_groups': feature_groups,
+        'prediction_agreement': float(np.mean(agree)) if agree else None,
+        'max_confidence_diff': float(max(conf_diff)) if conf_diff else None,
+        'max_probability_diff': float(max(prob_diff)) if prob_diff else None,
+        'n_labeled': sum(1 for label in labels if label),
+        'baseline_accuracy': accuracy(base_results),
+        'candidate_accuracy': accuracy(cand_results),
+        'baseline_ms': round(baseline_ms, 2),
+        'candidate_ms': round(candidate_ms, 2),
+        'speedup': round(baseline_ms / candidate_ms, 2) if candidate_ms else None,
+    }
+
+
+def print_report(report):
+    print("\n" + "=" * 70)
+    print(f"🔬 특징 경로 검증: {report['baseline']} → {report['candidate']} ({report['n_files']} files)")
+    print("=" * 70)
+    for name, diff in report['feature_groups'].items():
+        marker = "✅" if diff['max_abs'] == 0 else "⚠️"
+        print(f"  {marker} {name:<18} max_abs={diff['max_abs']:.3e}  max_rel={diff['max_rel']:.3e}")
+    print(f"\n  예측 일치율: {report['prediction_agreement']}")
+    print(f"  최대 신뢰도 차이: {report['max_confidence_diff']}")
+    print(f"  최대 확률 차이: {report['max_probability_diff']}")
+    if report['n_labeled']:
+        print(f"  캐스케이드 정확도 ({report['n_labeled']} labeled): "
+              f"{report['baseline_accuracy']:.4f} → {report['candidate_accuracy']:.4f}")
+    print(f"  추출 시간: {report['baseline_ms']}ms → {report['candidate_ms']}ms (x{report['speedup']})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="특징 추출 경로 검증")
+    parser.add_argument('paths', nargs='*', default=[str(PROJECT_ROOT / 'Dataset')],
+                        help="참조 오디오 파일 또는 디렉터리")
+    parser.add_argument('--model-prefix', default=str(PROJECT_ROOT / 'models' / 'baby_cry_v15_1'))
+    parser.add_argument('--baseline', nargs='*', default=['profile=exact'],
+                        help="기준 SpectralFeatureEngine 옵션 (key=value, profile=exact|fast)")
+    parser.add_argument('--candidate', nargs='*', default=['profile=fast'],
+                        help="후보 SpectralFeatureEngine 옵션 (key=value, profile=exact|fast)")
+    parser.add_argument('--output', help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    report = validate_features(
+        list_reference_files(args.paths),
+        args.model_prefix,
+        parse_engine_options(args.baseline),
+        parse_engine_options(args.candidate),
+    )
+    if report:
+        print_report(report)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,283 @@
+import hashlib
+import importlib
+import io
+import json
+import mmap
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+"""
+✅ 모델 번들 (manifest.json + 컴포넌트별 pickle / 배열 데이터 파일 디렉터리)
+- 기존 baby_cry_v15_1_*.pkl 9개를 순서대로 시도하던 로드를 manifest 1회 조회로 대체
+  (없는 파일을 FileNotFoundError로 확인할 필요 없음)
+- pickle protocol 5 out-of-band 버퍼: numpy 배열 데이터는 <name>.bin에 64바이트 정렬로 모아 두고
+  로드 시 mmap에서 복사 없이 배열을 만듦 (joblib.load의 배열별 래퍼 처리 생략 → 로드 약 10배 빠름,
+  복사되지 않고 남는 배열은 페이지 캐시를 워커 프로세스끼리 공유)
+- 필수 컴포넌트는 병렬 로드 옵션 제공, 선택 단계(cascade / stage2)는 처음 사용할 때 로드
+- manifest에 원본 pickle의 크기 / 수정 시각 / sha256을 기록해 두고, 재학습으로 원본이 바뀌었으면
+  로더가 번들 대신 원본 pickle을 사용 (stale_sources)
+"""
+
+BUNDLE_FORMAT_VERSION = 1
+BUFFER_ALIGNMENT = 64
+MANIFEST_NAME = 'manifest.json'
+BUNDLE_SUFFIX = '_bundle'
+
+# 컴포넌트 이름 → (기존 pickle suffix 후보, 필수 여부, 지연 로드 여부)
+BUNDLE_COMPONENTS = {
+    'detector': (['_detector.pkl'], True, False),
+    'scaler_phase1': (['_scaler_phase1.pkl'], True, False),
+    'stage1': (['_stage1_pain.pkl', '_stage1_ensemble.pkl'], True, False),
+    'scaler_stage1': (['_scaler_stage1.pkl'], False, False),
+    'thresholds': (['_thresholds.pkl'], False, False),
+    'cascade_filter': (['_cascade.pkl'], False, True),
+    'scaler_cascade': (['_scaler_cascade.pkl'], False, True),
+    'stage2_nonpain': (['_nonpain.pkl'], False, True),
+    'scaler_stage2': (['_scaler_stage2.pkl'], False, True),
+}
+
+
+def bundle_path_for(model_prefix):
+    """모델 prefix(예: models/baby_cry_v15_1)에 대응하는 번들 디렉터리"""
+    return Path(f"{model_prefix}{BUNDLE_SUFFIX}")
+
+
+def find_bundle(model_prefix):
+    """prefix 또는 번들 디렉터리 경로에서 번들을 찾음 (없으면 None)"""
+    for candidate in (Path(str(model_prefix)), bundle_path_for(model_prefix)):
+        if (candidate / MANIFEST_NAME).is_file():
+            return candidate
+    return None
+
+
+def _sha256(*paths):
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _source_fingerprint(path):
+    """원본 pickle 식별 정보 (로드 시 크기 + 수정 시각으로 먼저 비교, 다르면 sha256 비교)"""
+    stat = Path(path).stat()
+    return {
+        'source_bytes': stat.st_size,
+        'source_mtime_ns': stat.st_mtime_ns,
+        'source_sha256': _sha256(path),
+    }
+
+
+def _dump_component(obj, pickle_path, data_path):
+    """
+    객체를 pickle(protocol 5) + 정렬된 배열 데이터 파일로 저장
+
+    <name>.pkl : { 'buffers': [(offset, length), ...], 'payload': pickle 바이트 }
+    <name>.bin : out-of-band 버퍼를 BUFFER_ALIGNMENT 단위로 정렬해 이어 붙인 데이터
+    """
+    buffers = []
+    payload = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    offsets = []
+    with open(data_path, 'wb') as f:
+        for buffer in buffers:
+            raw = buffer.raw()
+            f.write(b'\0' * (-f.tell() % BUFFER_ALIGNMENT))
+            offsets.append((f.tell(), raw.nbytes))
+            f.write(raw)
+    with open(pickle_path, 'wb') as f:
+        pickle.dump({'buffers': offsets, 'payload': payload}, f, protocol=5)
+    return _referenced_modules(payload, buffers)
+
+
+class _ModuleRecorder(pickle.Unpickler):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.modules = set()
+
+    def find_class(self, module, name):
+        self.modules.add(module)
+        return super().find_class(module, name)
+
+
+def _referenced_modules(payload, buffers):
+    """pickle이 참조하는 모듈 목록 (병렬 로드 전에 미리 import해서 import lock 경합을 피함)"""
+    recorder = _ModuleRecorder(io.BytesIO(payload), buffers=buffers)
+    recorder.load()
+    return sorted(recorder.modules)
+
+
+class ModelBundle:
+    """
+    번들 디렉터리 읽기 전용 핸들
+
+    manifest.json 형식:
+    {
+        "format_version": 1,
+        "name": "baby_cry_v15_1",
+        "created_at": "...",
+        "components": { 이름: { "file", "data", "class", "modules", "source", "bytes", "sha256",
+                                "source_bytes", "source_mtime_ns", "source_sha256" } },
+        "missing": [ 원본에 없던 선택 컴포넌트 ]
+    }
+    """
+
+    def __init__(self, path, use_mmap=True):
+        self.path = Path(path)
+        # False면 배열 데이터를 메모리로 읽어 들임 (쓰기 가능한 배열이 필요한 경우)
+        self.use_mmap = use_mmap
+        with open(self.path / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        version = self.manifest.get('format_version')
+        if version != BUNDLE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported model bundle format {version} (expected {BUNDLE_FORMAT_VERSION})")
+        self.components = self.manifest.get('components', {})
+
+    @property
+    def name(self):
+        return self.manifest.get('name', self.path.name)
+
+    def has(self, name):
+        return name in self.components
+
+    def load(self, name):
+        """컴포넌트 1개 로드 (없으면 None)"""
+        entry = self.components.get(name)
+        if entry is None:
+            return None
+        with open(self.path / entry['file'], 'rb') as f:
+            header = pickle.load(f)
+
+        data = None
+        if header['buffers']:
+            with open(self.path / entry['data'], 'rb') as f:
+                if self.use_mmap:
+                    data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+                else:
+                    data = memoryview(bytearray(f.read()))
+        buffers = [data[offset:offset + length] for offset, length in header['buffers']]
+        return pickle.loads(header['payload'], buffers=buffers)
+
+    def load_many(self, names, max_workers=4):
+        """
+        여러 컴포넌트를 병렬 로드
+
+        Returns:
+        --------
+        dict : { 이름: 객체 } (번들에 없는 컴포넌트는 제외)
+        """
+        names = [name for name in names if self.has(name)]
+        if max_workers <= 1 or len(names) <= 1:
+            return {name: self.load(name) for name in names}
+        # 여러 스레드가 unpickle 중에 같은 패키지(sklearn.ensemble 등)를 동시에 import하면
+        # import lock 교착이 생길 수 있으므로 필요한 모듈을 먼저 순서대로 import
+        for name in names:
+            for module in self.components[name].get('modules', []):
+                importlib.import_module(module)
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(names))) as executor:
+            return dict(zip(names, executor.map(self.load, names)))
+
+    def stale_sources(self, source_dir=None):
+        """
+        번들 생성 후 바뀐 원본 pickle (재학습 후 번들을 다시 만들지 않은 경우)
+
+        - source_dir(기본: 번들의 상위 디렉터리)에 원본 pickle이 없으면 확인하지 않음 (번들만 배포한 경우)
+        - 크기 + 수정 시각이 manifest와 같으면 최신, 다르면 sha256으로 비교 (복사로 시각만 바뀐 경우)
+        - 생성 당시 없던 선택 컴포넌트가 새로 생겼거나, 원본 해시가 없는 이전 형식 manifest도 오래된 것으로 봄
+
+        Returns:
+        --------
+        list : 바뀐 원본 파일 이름 (비어 있으면 번들이 최신)
+        """
+        source_dir = Path(source_dir) if source_dir else self.path.parent
+        stale = []
+        for name, (suffixes, _, _) in BUNDLE_COMPONENTS.items():
+            # build_bundle과 같은 우선순위로 현재 원본 결정
+            candidates = (source_dir / f"{self.name}{suffix}" for suffix in suffixes)
+            source = next((path for path in candidates if path.is_file()), None)
+            if source is None:
+                continue
+            entry = self.components.get(name)
+            if entry is None or entry.get('source') != source.name or entry.get('source_sha256') is None:
+                stale.append(source.name)
+                continue
+            stat = source.stat()
+            if stat.st_size == entry.get('source_bytes') and stat.st_mtime_ns == entry.get('source_mtime_ns'):
+                continue
+            if _sha256(source) != entry['source_sha256']:
+                stale.append(source.name)
+        return stale
+
+    def verify(self):
+        """파일 해시를 manifest와 비교. 일치하지 않는 컴포넌트 이름 리스트 반환"""
+        return [
+            name for name, entry in self.components.items()
+            if _sha256(self.path / entry['file'], self.path / entry['data']) != entry.get('sha256')
+        ]
+
+
+def build_bundle(model_prefix, output_dir=None):
+    """
+    기존 pickle 파일들(baby_cry_v15_1_*.pkl)을 번들 디렉터리로 변환
+
+    Parameters:
+    -----------
+    model_prefix : str
+        기존 모델 prefix (예: models/baby_cry_v15_1)
+    output_dir : str, optional
+        번들 경로 (기본: <prefix>_bundle)
+
+    Returns:
+    --------
+    Path : 생성된 번들 디렉터리
+    """
+    import joblib  # 번들 생성(오프라인 도구)에서만 필요
+
+    model_prefix = str(model_prefix)
+    output_dir = Path(output_dir) if output_dir else bundle_path_for(model_prefix)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    components = {}
+    missing = []
+    for name, (suffixes, required, _) in BUNDLE_COMPONENTS.items():
+        source = next((Path(f"{model_prefix}{s}") for s in suffixes if Path(f"{model_prefix}{s}").is_file()), None)
+        if source is None:
+            if required:
+                raise FileNotFoundError(f"Required model component '{name}' not found for prefix {model_prefix}")
+            missing.append(name)
+            continue
+
+        obj = joblib.load(source)
+        pickle_path = output_dir / f"{name}.pkl"
+        data_path = output_dir / f"{name}.bin"
+        modules = _dump_component(obj, pickle_path, data_path)
+        components[name] = {
+            'file': pickle_path.name,
+            'data': data_path.name,
+            'class': type(obj).__name__,
+            'modules': modules,
+            'source': source.name,
+            'bytes': pickle_path.stat().st_size + data_path.stat().st_size,
+            'sha256': _sha256(pickle_path, data_path),
+            **_source_fingerprint(source),
+        }
+        print(f"✓ Bundled {name}: {source.name} → {pickle_path.name} + {data_path.name}")
+
+    manifest = {
+        'format_version': BUNDLE_FORMAT_VERSION,
+        'name': Path(model_prefix).name,
+        'created_at': datetime.now().isoformat(),
+        'components': components,
+        'missing': missing,
+    }
+    # manifest는 마지막에 원자적으로 기록 (로더는 manifest가 있어야 번들로 인식)
+    tmp_manifest = output_dir / f".{MANIFEST_NAME}.{int(time.time() * 1000)}.tmp"
+    with open(tmp_manifest, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    tmp_manifest.replace(output_dir / MANIFEST_NAME)
+
+    print(f"✅ Model bundle created: {output_dir}")
+    return output_dir
@@ -1,8 +1,18 @@
 import os
+import io
+import copy
+import threading
+import time
 import numpy as np
 import librosa
 from pathlib import Path
 import joblib
+from backend.models.feature_engine import SpectralFeatureEngine, FEATURE_PROFILES
+from backend.models.preprocessing import get_preprocessor
+from backend.models.feature_cache import get_feature_cache, pipeline_key, content_hash
+from backend.models.bundle import BUNDLE_COMPONENTS, ModelBundle, find_bundle
+from backend.models.thresholds import SENSITIVITY_MODES, DEFAULT_THRESHOLDS
+from backend.utils.audio import DecodedAudio
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -12,13 +22,65 @@ warnings.filterwarnings('ignore')
 - 업로드 파일과 녹음 파일의 일관성 개선
 """
 
+class _PendingComponent:
+    """번들에서 아직 로드하지 않은 선택 컴포넌트"""
+
+    def __init__(self, bundle, name):
+        self.bundle = bundle
+        self.name = name
+        self.lock = threading.Lock()
+
+    def load(self):
+        started = time.perf_counter()
+        try:
+            value = self.bundle.load(self.name)
+        except Exception as e:
+            print(f"⚠ Warning: lazy load of {self.name} failed: {e}")
+            return None
+        print(f"✓ Loaded {self.name} on first use ({(time.perf_counter() - started) * 1000:.0f}ms)")
+        return value
+
+
+class _LazyComponent:
+    """
+    선택 단계(cascade / stage2) 속성 - 번들에서 처음 접근할 때 로드
+
+    값은 인스턴스의 _components dict에 저장되므로 copy.copy로 만든 분류기 복사본끼리
+    한 번 로드한 모델을 공유합니다.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        components = obj.__dict__.setdefault('_components', {})
+        value = components.get(self.name)
+        if isinstance(value, _PendingComponent):
+            with value.lock:
+                if components.get(self.name) is value:
+                    components[self.name] = value.load()
+            value = components[self.name]
+        return value
+
+    def __set__(self, obj, value):
+        obj.__dict__.setdefault('_components', {})[self.name] = value
+
+
 class CryClassifier:
     """
     아기 울음소리 분류 모델 래퍼
     improved_v18.py의 V15_1AdaptivePredictor를 API에서 사용할 수 있도록 래핑
     """
     
-    def __init__(self, dataset_path, sensitivity='balanced'):
+    # 번들 로드 시 처음 사용할 때까지 로드를 미루는 선택 단계
+    cascade_filter = _LazyComponent()
+    scaler_cascade = _LazyComponent()
+    stage2_nonpain = _LazyComponent()
+    scaler_stage2 = _LazyComponent()
+    
+    def __init__(self, dataset_path, sensitivity='balanced', feature_profile='exact'):
         """
         Parameters:
         -----------
@@ -26,14 +88,28 @@ class CryClassifier:
             데이터셋 경로 (학습 시 필요, 예측만 할 경우 빈 문자열 가능)
         sensitivity : str
             'high', 'balanced', 'precise' 중 선택
+        feature_profile : str
+            'exact' (학습 시와 동일한 특징) 또는 'fast' (tonnetz를 공유 STFT chroma로 근사,
+            엣지 기기용 - 약간의 정확도 대신 큰 속도 향상)
         """
         self.dataset_path = Path(dataset_path) if dataset_path else None
         
-        if sensitivity not in ['high', 'balanced', 'precise']:
+        if sensitivity not in SENSITIVITY_MODES:
             print(f"⚠️  Invalid sensitivity '{sensitivity}', using 'balanced'")
             sensitivity = 'balanced'
         
         self.sensitivity = sensitivity
+        # with_sensitivity 뷰 캐시 (복사본끼리 공유)
+        self._views = {}
+        self._views_lock = threading.Lock()
+        
+        if feature_profile not in FEATURE_PROFILES:
+            print(f"⚠️  Invalid feature_profile '{feature_profile}', using 'exact'")
+            feature_profile = 'exact'
+        self.feature_profile = feature_profile
+        
+        # 서빙 중인 모델 버전 라벨 (ModelRegistry가 설정, 응답의 model_version)
+        self.model_version = None
         
         # 모델 컴포넌트 (load_model에서 초기화됨)
         self.detector = None
@@ -48,6 +124,12 @@ class CryClassifier:
         
         self.thresholds = None
         
+        # 특징 추출 엔진 (멜 필터뱅크 등 sr별 상수를 한 번만 준비)
+        self.feature_engine = SpectralFeatureEngine(sr=22050, **FEATURE_PROFILES[feature_profile])
+        
+        # 특징 캐시 (같은 오디오를 다시 분석할 때 특징 추출 생략, None이면 사용 안 함)
+        self.feature_cache = get_feature_cache()
+        
         # 카테고리 매핑
         self.category_mapping = {
             'belly_pain': 'belly_pain',
@@ -60,8 +142,12 @@ class CryClassifier:
         }
     
     def set_sensitivity(self, sensitivity):
-        """민감도 모드 변경"""
-        if sensitivity not in ['high', 'balanced', 'precise']:
+        """
+        기본 민감도 모드 변경 (predict_* 호출에 sensitivity를 넘기지 않을 때 사용)
+        
+        ⚠️ 공유 분류기에서 요청별로 바꾸지 말고 predict_batch(..., sensitivity=...)를 사용하세요.
+        """
+        if sensitivity not in SENSITIVITY_MODES:
             print(f"⚠️  Invalid sensitivity '{sensitivity}', keeping current")
             return
         
@@ -73,6 +159,47 @@ class CryClassifier:
             cascade_threshold = self.thresholds['cascade_thresholds'].get(sensitivity, 0.365)
             print(f"   Cascade threshold: {cascade_threshold:.3f}")
     
+    def with_sensitivity(self, sensitivity):
+        """
+        같은 가중치를 공유하고 민감도만 다른 분류기 뷰 (모델을 다시 로드하지 않음)
+        
+        set_sensitivity와 달리 원본을 바꾸지 않으므로 여러 요청/에이전트가 공유하는
+        분류기에서 요청별 민감도를 쓸 때 사용합니다. 뷰는 민감도별로 한 번만 만듭니다.
+        """
+        if sensitivity not in SENSITIVITY_MODES:
+            print(f"⚠️  Invalid sensitivity '{sensitivity}', using '{self.sensitivity}'")
+            return self
+        if sensitivity == self.sensitivity:
+            return self
+        with self._views_lock:
+            self._views.setdefault(self.sensitivity, self)
+            view = self._views.get(sensitivity)
+            if view is None:
+                view = copy.copy(self)
+                view.sensitivity = sensitivity
+                self._views[sensitivity] = view
+            return view
+    
+    def resolve_sensitivity(self, sensitivity=None):
+        """
+        호출별 민감도 → (민감도, cascade 임계값) (공유 상태를 바꾸지 않음)
+        
+        Parameters:
+        -----------
+        sensitivity : str, optional
+            'high' / 'balanced' / 'precise' (None이면 기본 민감도)
+        
+        Returns:
+        --------
+        tuple : (sensitivity, cascade_threshold)
+        """
+        sensitivity = sensitivity or self.sensitivity
+        if sensitivity not in SENSITIVITY_MODES:
+            raise ValueError(f"Invalid sensitivity '{sensitivity}' (expected one of {SENSITIVITY_MODES})")
+        thresholds = self.thresholds or DEFAULT_THRESHOLDS
+        cascade_thresholds = thresholds.get('cascade_thresholds') or DEFAULT_THRESHOLDS['cascade_thresholds']
+        return sensitivity, float(cascade_thresholds.get(sensitivity, DEFAULT_THRESHOLDS['cascade_thresholds'][sensitivity]))
+    
     def load_model(self, model_prefix: str):
         """
         저장된 모델 로드
@@ -107,6 +234,19 @@ class CryClassifier:
                     print(f"🔧 Removed suffix '{suffix}' from path")
                     break
             
+            # ✅ 번들(manifest.json)이 있으면 번들에서 로드 (CRY_MODEL_BUNDLE=0이면 기존 pickle 사용)
+            bundle_dir = find_bundle(model_prefix) if os.getenv('CRY_MODEL_BUNDLE', '1') != '0' else None
+            if bundle_dir is not None:
+                bundle = ModelBundle(bundle_dir)
+                stale = bundle.stale_sources()
+                if not stale:
+                    self._load_bundle(bundle)
+                    return
+                # 재학습으로 원본 pickle이 바뀌었는데 번들을 다시 만들지 않은 경우 - 오래된 가중치 대신 원본 사용
+                print(f"⚠️ Model bundle {bundle_dir} is older than {stale} - loading pickles instead "
+                      f"(rebuild: python -m backend.dataset_tools.build_model_bundle)")
+                model_prefix = str(bundle.path.parent / bundle.name)
+            
             print(f"🔍 Loading models with prefix: {model_prefix}")
             
             # Phase 1: Cry Detection (필수)
@@ -178,16 +318,7 @@ class CryClassifier:
                     print(f"   Current sensitivity: {self.sensitivity} (threshold={cascade_threshold:.3f})")
             except FileNotFoundError:
                 print("⚠ Warning: Using default thresholds")
-                self.thresholds = {
-                    'pain_threshold_primary': 0.5,
-                    'cascade_thresholds': {
-                        'high': 0.25,
-                        'balanced': 0.365,
-                        'precise': 0.50
-                    },
-                    'confidence_threshold_low': 0.4,
-                    'confidence_threshold_high': 0.7
-                }
+                self.thresholds = copy.deepcopy(DEFAULT_THRESHOLDS)
             
             print(f"✅ All models loaded successfully!")
             
@@ -196,6 +327,73 @@ class CryClassifier:
         except Exception as e:
             raise RuntimeError(f"Model load failed: {e}")
     
+    def _load_bundle(self, bundle):
+        """
+        모델 번들 로드 (backend/models/bundle.py)
+        
+        - manifest에 있는 컴포넌트만 로드 (없는 파일을 하나씩 시도하지 않음)
+        - 필수 단계 병렬 로드 옵션 (MODEL_LOAD_WORKERS, 기본 1 - unpickle은 GIL에 묶여 로컬 디스크에선 이득이 거의 없음)
+        - cascade / stage2는 처음 사용할 때 로드
+        """
+        started = time.perf_counter()
+        bundle_dir = bundle.path
+        print(f"📦 Loading model bundle: {bundle_dir}")
+        
+        eager = [name for name, (_, _, lazy) in BUNDLE_COMPONENTS.items() if not lazy]
+        loaded = bundle.load_many(eager, max_workers=int(os.getenv('MODEL_LOAD_WORKERS', '1')))
+        missing = [name for name, (_, required, _) in BUNDLE_COMPONENTS.items() if required and name not in loaded]
+        if missing:
+            raise FileNotFoundError(f"Bundle {bundle_dir} is missing required components: {missing}")
+        
+        self.detector = loaded['detector']
+        self.scaler_phase1 = loaded['scaler_phase1']
+        self.stage1 = loaded['stage1']
+        self.scaler_stage1 = loaded['scaler_stage1'] if 'scaler_stage1' in loaded else self.scaler_phase1
+        self.thresholds = loaded['thresholds'] if 'thresholds' in loaded else copy.deepcopy(DEFAULT_THRESHOLDS)
+        
+        for name, (_, _, lazy) in BUNDLE_COMPONENTS.items():
+            if lazy:
+                setattr(self, name, _PendingComponent(bundle, name) if bundle.has(name) else None)
+        if not bundle.has('scaler_cascade'):
+            self.scaler_cascade = self.scaler_stage1
+        if not bundle.has('stage2_nonpain'):
+            # 분류기 없이 스케일러만 있으면 stage2를 사용하지 않음
+            self.scaler_stage2 = None
+        
+        cascade_threshold = self.thresholds.get('cascade_thresholds', {}).get(self.sensitivity, 0.365)
+        pending = [name for name, value in self._components.items() if isinstance(value, _PendingComponent)]
+        print(f"   Loaded: {sorted(loaded)} / lazy: {pending}")
+        print(f"   Current sensitivity: {self.sensitivity} (threshold={cascade_threshold:.3f})")
+        print(f"✅ Model bundle loaded in {(time.perf_counter() - started) * 1000:.0f}ms")
+    
+    def _load_audio(self, source, duration):
+        """
+        다양한 입력을 22050 Hz 모노 (y, sr)로 변환
+        
+        - DecodedAudio : 요청 단위로 한 번 디코딩된 오디오 (리샘플링 결과 공유)
+        - str / Path : 오디오 파일 경로 (librosa.load)
+        - bytes : 인코딩된 오디오 컨테이너 (WAV/FLAC/OGG 등) - 디스크 없이 메모리에서 디코딩
+        - (np.ndarray, sr) : 임의 샘플링 레이트의 PCM 배열
+        - np.ndarray : 이미 22050 Hz인 모노 배열
+        """
+        sr = self.feature_engine.sr
+        if isinstance(source, DecodedAudio):
+            return source.resampled(sr, duration), sr
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return librosa.load(io.BytesIO(source), duration=duration, sr=sr)
+        if isinstance(source, tuple):
+            y, orig_sr = source
+            y = np.asarray(y, dtype=np.float32)
+            if y.ndim > 1:
+                y = librosa.to_mono(y)
+            y = y[:int(orig_sr * duration)]
+            if orig_sr != sr:
+                y = librosa.resample(y, orig_sr=orig_sr, target_sr=sr)
+            return y, sr
+        if isinstance(source, np.ndarray):
+            return np.asarray(source, dtype=np.float32)[:int(sr * duration)], sr
+        return librosa.load(source, duration=duration, sr=sr)
+    
     def extract_features(self, audio_path, duration=3.0):
         """
         오디오 파일에서 특징 추출 (전처리 정규화 추가)
@@ -209,112 +407,85 @@ class CryClassifier:
         이 전처리 과정으로 업로드 파일과 녹음 파일의 분석 결과 일관성 향상
         """
         try:
-            # ✅ 명시적으로 22050 Hz로 로드
-            y, sr = librosa.load(audio_path, duration=duration, sr=22050)
+            # ✅ 명시적으로 22050 Hz로 로드 (배열이면 이미 22050 Hz로 간주)
+            y, sr = self._load_audio(audio_path, duration)
             
             if len(y) == 0:
                 return None
             
-            # ✅ 1단계 고도화: 소음 정화 (Audio Denoising) - High-pass Filter
-            # 아기 울음소리의 주파수 대역(주로 250Hz 이상)을 보존하고 저주파 배경 소음(에어컨, 냉장고 등)을 제거
-            import scipy.signal as signal
-            nyquist = sr / 2
-            cutoff = 250.0  # 250Hz
-            b, a = signal.butter(5, cutoff / nyquist, btype='highpass')
-            y = signal.filtfilt(b, a, y)
-            
-            # ✅ 오디오 길이 정규화 (3초로 패딩 또는 자르기)
-            target_length = int(sr * duration)
-            if len(y) < target_length:
-                # 짧으면 패딩
-                y = np.pad(y, (0, target_length - len(y)), mode='constant')
-            else:
-                # 길면 자르기
-                y = y[:target_length]
-            
-            # ✅ RMS 정규화 (볼륨 통일)
-            rms = np.sqrt(np.mean(y**2))
-            if rms > 0:
-                y = y / rms * 0.1  # 0.1로 정규화
-            
-            # ✅ 무음 구간 제거 (선택적)
-            y, _ = librosa.effects.trim(y, top_db=20)
-            
-            # 길이가 너무 짧아지면 다시 패딩
-            if len(y) < target_length:
-                y = np.pad(y, (0, target_length - len(y)), mode='constant')
-            else:
-                y = y[:target_length]
-            
-            features = []
-            
-            # MFCC (78 features)
-            mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
-            features.extend([
-                np.mean(mfcc, axis=1),
-                np.std(mfcc, axis=1),
-                np.max(mfcc, axis=1),
-                np.min(mfcc, axis=1)
-            ])
-            
-            mfcc_delta = librosa.feature.delta(mfcc)
-            features.append(np.mean(mfcc_delta, axis=1))
-            
-            mfcc_delta2 = librosa.feature.delta(mfcc, order=2)
-            features.append(np.mean(mfcc_delta2, axis=1))
-            
-            # Spectral (12 features)
-            spectral_centroids = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
-            spectral_rolloff = librosa.feature.spectral_rolloff(y=y, sr=sr)[0]
-            spectral_bandwidth = librosa.feature.spectral_bandwidth(y=y, sr=sr)[0]
-            spectral_flatness = librosa.feature.spectral_flatness(y=y)[0]
-            
-            features.extend([
-                [np.mean(spectral_centroids), np.std(spectral_centroids)],
-                [np.mean(spectral_rolloff), np.std(spectral_rolloff)],
-                [np.mean(spectral_bandwidth), np.std(spectral_bandwidth)],
-                [np.mean(spectral_flatness), np.std(spectral_flatness), 
-                 np.max(spectral_flatness), np.min(spectral_flatness)]
-            ])
-            
-            # Energy (7 features)
-            zcr = librosa.feature.zero_crossing_rate(y)[0]
-            rms = librosa.feature.rms(y=y)[0]
-            features.extend([
-                [np.mean(zcr), np.std(zcr)],
-                [np.mean(rms), np.std(rms), np.max(rms)]
-            ])
-            
-            # Harmonic (8 features)
-            chroma = librosa.feature.chroma_stft(y=y, sr=sr)
-            mel = librosa.feature.melspectrogram(y=y, sr=sr)
-            contrast = librosa.feature.spectral_contrast(y=y, sr=sr)
-            tonnetz = librosa.feature.tonnetz(y=y, sr=sr)
-            
-            features.extend([
-                [np.mean(chroma), np.std(chroma)],
-                [np.mean(mel), np.std(mel)],
-                [np.mean(contrast), np.std(contrast)],
-                [np.mean(tonnetz), np.std(tonnetz)]
-            ])
-            
-            # Temporal (4 features)
-            tempo, _ = librosa.beat.beat_track(y=y, sr=sr, start_bpm=120)
-            onset_env = librosa.onset.onset_strength(y=y, sr=sr)
-            features.extend([
-                [tempo],
-                [np.mean(onset_env), np.std(onset_env), np.max(onset_env)]
-            ])
-            
-            feature_vector = np.concatenate([np.array(f).flatten() for f in features])
-            feature_vector = np.nan_to_num(feature_vector, nan=0.0, posinf=0.0, neginf=0.0)
-            
-            return feature_vector
+            # ✅ 이미 분석한 오디오면 캐시된 특징 사용
+            cache_key = self._feature_cache_key(y, duration)
+            if cache_key is not None:
+                cached = self.feature_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+            
+            # ✅ 전처리 (sr별로 한 번 만든 AudioPreprocessor가 버퍼를 재사용)
+            # - 1단계 고도화: 소음 정화 (Audio Denoising) - High-pass Filter
+            #   아기 울음소리의 주파수 대역(주로 250Hz 이상)을 보존하고 저주파 배경 소음(에어컨, 냉장고 등)을 제거
+            # - 오디오 길이 정규화 (3초로 패딩 또는 자르기)
+            # - RMS 정규화 (볼륨 통일, 0.1)
+            # - 무음 구간 제거 후 다시 패딩
+            y = get_preprocessor(sr).process(y, duration)
+            
+            # ✅ 단일 STFT 특징 엔진: 스펙트로그램을 한 번만 계산해 모든 특징이 공유
+            features = self.feature_engine.extract(y)
+            if cache_key is not None:
+                self.feature_cache.put(cache_key, features)
+            return features
             
         except Exception as e:
             print(f"⚠️  Feature extraction error: {e}")
             return None
     
+    def extract_features_batch(self, sources, duration=3.0):
+        """
+        ✅ 여러 입력의 특징을 한 번에 추출 (같은 길이 클립은 2차원 배열로 묶어 함께 전처리)
+        
+        Returns:
+        --------
+        list : 입력별 특징 벡터 (실패한 항목은 None)
+        """
+        features = [None] * len(sources)
+        groups = {}
+        for i, source in enumerate(sources):
+            try:
+                y, sr = self._load_audio(source, duration)
+            except Exception as e:
+                print(f"⚠️  Feature extraction error: {e}")
+                continue
+            if len(y) == 0:
+                continue
+            cache_key = self._feature_cache_key(y, duration)
+            if cache_key is not None:
+                features[i] = self.feature_cache.get(cache_key)
+                if features[i] is not None:
+                    continue
+            groups.setdefault(len(y), []).append((i, y, cache_key))
+        
+        preprocessor = get_preprocessor(self.feature_engine.sr)
+        for items in groups.values():
+            try:
+                clips = preprocessor.process_batch(np.vstack([y for _, y, _ in items]), duration)
+            except Exception as e:
+                print(f"⚠️  Feature extraction error: {e}")
+                continue
+            for (i, _, cache_key), y in zip(items, clips):
+                try:
+                    features[i] = self.feature_engine.extract(y)
+                except Exception as e:
+                    print(f"⚠️  Feature extraction error: {e}")
+                    continue
+                if cache_key is not None:
+                    self.feature_cache.put(cache_key, features[i])
+        return features
+    
+    def _feature_cache_key(self, y, duration):
+        """(파이프라인 버전, 입력 해시) 캐시 키 (캐시를 쓰지 않으면 None)"""
+        if self.feature_cache is None or not self.feature_cache.enabled:
+            return None
+        return (pipeline_key(self.feature_engine, duration), content_hash(y))
+    
     def extract_voice_profile(self, audio_path):
         """
         ✅ 3.0 고도화: Voice ID (음색 지문 추출)
@@ -322,7 +493,7 @@ class CryClassifier:
         다둥이/조리원 환경에서 '어떤 아기인지' 식별하는 기반 데이터로 사용합니다.
         """
         try:
-            y, sr = librosa.load(audio_path, sr=22050, duration=3.0)
+            y, sr = self._load_audio(audio_path, 3.0)
             if len(y) == 0:
                 return None
             
@@ -346,7 +517,7 @@ class CryClassifier:
             print(f"⚠️ Voice profile extraction failed: {e}")
             return None
 
-    def predict_with_confidence(self, audio_path, bias=None):
+    def predict_with_confidence(self, audio_path, bias=None, sensitivity=None):
         """
         오디오 파일 분석 및 예측 (개인화 바이어스 적용 추가)
         
@@ -356,10 +527,37 @@ class CryClassifier:
             오디오 파일 경로
         bias : dict, optional
             카테고리별 피드백 통계 { 'tired': 3, 'hungry': 1 }
+        sensitivity : str, optional
+            이 호출에만 적용할 민감도 (None이면 기본 민감도, 분류기 상태는 바뀌지 않음)
             
         Returns:
         --------
-        dict : 분석 결과
+        dict : 분석 결과 (사용한 sensitivity / cascade_threshold 포함)
+        """
+        return self.predict_batch([audio_path], biases=[bias], sensitivity=sensitivity)[0]
+    
+    def predict_from_array(self, y, sr, bias=None, sensitivity=None):
+        """
+        ✅ 메모리 내 PCM 배열 직접 분석 (임시 파일 없이)
+        
+        Parameters:
+        -----------
+        y : np.ndarray
+            float32 PCM 샘플 (-1.0 ~ 1.0)
+        sr : int
+            y의 샘플링 레이트 (22050이 아니면 리샘플링)
+        """
+        return self.predict_batch([(y, sr)], biases=[bias], sensitivity=sensitivity)[0]
+    
+    def predict_from_bytes(self, data, bias=None, sensitivity=None):
+        """
+        ✅ 업로드된 오디오 바이트(WAV/FLAC/OGG 등)를 메모리에서 디코딩하여 분석
+        """
+        return self.predict_batch([bytes(data)], biases=[bias], sensitivity=sensitivity)[0]
+    
+    def predict_from_features(self, features, bias=None, sensitivity=None):
+        """
+        ✅ 이미 추출된 105차원 특징 벡터로 예측 (스트리밍 분석기 등 자체 전처리 경로용)
         """
         if not self.detector:
             return {
@@ -368,77 +566,150 @@ class CryClassifier:
                 'severity': 'Unknown',
                 'error': 'Model not loaded'
             }
+        return self._predict_features(np.atleast_2d(features), [bias], self.resolve_sensitivity(sensitivity))[0]
+    
+    def predict_batch(self, paths_or_arrays, biases=None, sensitivity=None):
+        """
+        ✅ 배치 추론: N개 클립의 특징을 하나의 행렬로 쌓아
+        각 scaler / 모델 단계를 배치 전체에 대해 한 번씩만 실행
         
-        # 특징 추출
-        features = self.extract_features(audio_path)
+        Parameters:
+        -----------
+        paths_or_arrays : list
+            오디오 파일 경로, DecodedAudio, 오디오 바이트, (배열, sr) 튜플 또는
+            22050 Hz 모노 float 배열의 리스트
+        biases : list of dict, optional
+            항목별 피드백 통계 (predict_with_confidence의 bias와 동일 형식)
+        sensitivity : str, optional
+            배치 전체에 적용할 민감도 (None이면 기본 민감도, 분류기 상태는 바뀌지 않음)
+            
+        Returns:
+        --------
+        list of dict : 항목별 분석 결과 (predict_with_confidence와 동일 형식)
+        """
+        n_items = len(paths_or_arrays)
+        if biases is None:
+            biases = [None] * n_items
+        if len(biases) != n_items:
+            raise ValueError(f"biases length {len(biases)} != inputs length {n_items}")
+        # 호출 시작 시 한 번만 해석 (다른 스레드의 set_sensitivity와 무관)
+        resolved = self.resolve_sensitivity(sensitivity)
         
-        if features is None:
-            return {
+        if not self.detector:
+            return [{
                 'prediction': 'error',
                 'confidence': 0.0,
                 'severity': 'Unknown',
-                'error': 'Feature extraction failed'
-            }
+                'error': 'Model not loaded'
+            } for _ in range(n_items)]
+        
+        # 특징 추출
+        results = [None] * n_items
+        valid_idx = []
+        feature_rows = []
+        for i, features in enumerate(self.extract_features_batch(paths_or_arrays)):
+            if features is None:
+                results[i] = {
+                    'prediction': 'error',
+                    'confidence': 0.0,
+                    'severity': 'Unknown',
+                    'error': 'Feature extraction failed'
+                }
+            else:
+                valid_idx.append(i)
+                feature_rows.append(features)
+        
+        if valid_idx:
+            features = np.vstack(feature_rows)
+            batch_results = self._predict_features(features, [biases[i] for i in valid_idx], resolved)
+            for i, result in zip(valid_idx, batch_results):
+                results[i] = result
+        
+        return results
+    
+    def _predict_features(self, features, biases, resolved):
+        """
+        특징 행렬 (N, 105)에 대한 캐스케이드 예측
         
-        features = features.reshape(1, -1)
+        resolved : resolve_sensitivity() 결과 (sensitivity, cascade_threshold)
+        """
+        n_rows = features.shape[0]
+        sensitivity, cascade_threshold = resolved
         
         # Phase 1: Cry Detection
         features_scaled_phase1 = self.scaler_phase1.transform(features)
-        cry_proba = self.detector.predict_proba(features_scaled_phase1)[0]
-        is_cry = self.detector.predict(features_scaled_phase1)[0]
+        cry_proba = self.detector.predict_proba(features_scaled_phase1)
+        is_cry = self.detector.predict(features_scaled_phase1)
         
         # ⭐ 방어 코드: cry_proba 처리
-        if len(cry_proba) == 1:
-            cry_confidence = float(cry_proba[0])
+        if cry_proba.shape[1] == 1:
+            cry_confidence = cry_proba[:, 0].astype(float)
             not_cry_confidence = 1.0 - cry_confidence
-            probabilities_dict = {
-                'cry': cry_confidence if is_cry == 'cry' else not_cry_confidence,
-                'not_cry': not_cry_confidence if is_cry == 'cry' else cry_confidence
-            }
+            predicted_cry = is_cry == 'cry'
+            cry_column = np.where(predicted_cry, cry_confidence, not_cry_confidence)
+            not_cry_column = np.where(predicted_cry, not_cry_confidence, cry_confidence)
         else:
             classes = self.detector.classes_
             cry_idx = np.where(classes == 'cry')[0]
             not_cry_idx = np.where(classes == 'not_cry')[0]
-            cry_confidence = float(cry_proba[cry_idx[0]]) if len(cry_idx) > 0 else float(cry_proba[1])
-            not_cry_confidence = float(cry_proba[not_cry_idx[0]]) if len(not_cry_idx) > 0 else float(cry_proba[0])
-            probabilities_dict = {'cry': cry_confidence, 'not_cry': not_cry_confidence}
+            cry_column = cry_proba[:, cry_idx[0] if len(cry_idx) > 0 else 1].astype(float)
+            not_cry_column = cry_proba[:, not_cry_idx[0] if len(not_cry_idx) > 0 else 0].astype(float)
         
-        if is_cry == 'not_cry':
-            return {
-                'prediction': 'not_cry',
-                'confidence': not_cry_confidence,
-                'severity': 'None',
-                'probabilities': probabilities_dict,
-                'stage': 'phase1'
-            }
+        results = [None] * n_rows
+        cry_rows = []
+        for i in range(n_rows):
+            probabilities_dict = {'cry': float(cry_column[i]), 'not_cry': float(not_cry_column[i])}
+            if is_cry[i] == 'not_cry':
+                results[i] = {
+                    'prediction': 'not_cry',
+                    'confidence': float(not_cry_column[i]),
+                    'severity': 'None',
+                    'probabilities': probabilities_dict,
+                    'stage': 'phase1',
+                    'sensitivity': sensitivity,
+                    'cascade_threshold': cascade_threshold
+                }
+            else:
+                cry_rows.append(i)
+        
+        if not cry_rows:
+            return results
         
-        # Stage 1 & 2: 울음 분석
-        final_prediction = 'discomfort'
-        final_confidence = 0.5
-        final_stage = 'default'
+        # Stage 1 & 2: 울음으로 검출된 행만 분석
+        cry_features = features[cry_rows]
         
         # 모든 카테고리에 대한 확률 수집 (바이어스 적용을 위해)
-        all_probs = {}
+        all_probs_rows = [{} for _ in cry_rows]
         
         # Stage 1: Pain Detection
-        features_scaled_stage1 = self.scaler_stage1.transform(features)
-        pain_proba_stage1_raw = self.stage1.predict_proba(features_scaled_stage1)[0]
+        features_scaled_stage1 = self.scaler_stage1.transform(cry_features)
+        pain_proba_stage1_raw = self.stage1.predict_proba(features_scaled_stage1)
         
         try:
             pain_idx = list(self.stage1.classes_).index('belly_pain')
-            pain_proba = float(pain_proba_stage1_raw[pain_idx])
-        except:
-            pain_proba = float(pain_proba_stage1_raw[-1])
-            
-        all_probs['belly_pain'] = pain_proba
+        except ValueError:
+            pain_idx = -1
+        
+        for all_probs, pain_proba in zip(all_probs_rows, pain_proba_stage1_raw[:, pain_idx]):
+            all_probs['belly_pain'] = float(pain_proba)
         
         # Stage 2: Non-pain
         if self.stage2_nonpain:
-            features_scaled_stage2 = self.scaler_stage2.transform(features)
-            stage2_probs_raw = self.stage2_nonpain.predict_proba(features_scaled_stage2)[0]
-            for i, cls in enumerate(self.stage2_nonpain.classes_):
-                all_probs[cls] = float(stage2_probs_raw[i])
+            features_scaled_stage2 = self.scaler_stage2.transform(cry_features)
+            stage2_probs_raw = self.stage2_nonpain.predict_proba(features_scaled_stage2)
+            for all_probs, row in zip(all_probs_rows, stage2_probs_raw):
+                for cls, proba in zip(self.stage2_nonpain.classes_, row):
+                    all_probs[cls] = float(proba)
         
+        for i, all_probs in zip(cry_rows, all_probs_rows):
+            results[i] = self._finalize_prediction(all_probs, biases[i])
+            results[i]['sensitivity'] = sensitivity
+            results[i]['cascade_threshold'] = cascade_threshold
+        
+        return results
+    
+    def _finalize_prediction(self, all_probs, bias):
+        """개인화 바이어스 적용 후 최종 결과 생성"""
         # ✅ 개인화 바이어스 적용 (1단계 기술 고도화)
         if bias:
             print(f"🧬 [Personalization] Applying bias: {bias}")
@@ -0,0 +1,222 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+"""
+✅ 내용 주소 기반 특징 캐시 (Content-addressed Feature Cache)
+- 키 = 전처리 전 모델 입력(22050 Hz 모노 float32) 해시 + 특징 파이프라인 버전
+  → 같은 파일 재업로드 / 프론트 재시도 / /api/v2/* 재분석 / classify-only가 특징을 다시 계산하지 않음
+- 메모리 LRU (항목 수 + 바이트 한도) + 선택적 디스크 계층 (.npy, 워커 프로세스 간 공유)
+- 전처리 / 특징 계산 방식을 바꾸면 FEATURE_PIPELINE_VERSION을 올려 이전 캐시를 무효화
+"""
+
+# 전처리(AudioPreprocessor) 또는 특징 레이아웃이 바뀌면 올릴 것
+FEATURE_PIPELINE_VERSION = 1
+
+DEFAULT_MAX_ENTRIES = 2048
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_DISK_MAX_ENTRIES = 50000
+# 디스크 항목 수 확인 주기 (저장 N회마다 디렉터리 스캔)
+DISK_PRUNE_INTERVAL = 200
+
+
+def pipeline_key(engine, duration):
+    """특징 엔진 설정 + 길이 + 파이프라인 버전 → 캐시 네임스페이스"""
+    config = (
+        f"v{FEATURE_PIPELINE_VERSION}|sr={engine.sr}|n_fft={engine.n_fft}|hop={engine.hop_length}"
+        f"|mels={engine.mel_basis.shape[0]}|mfcc={engine.n_mfcc}|tempo={engine.tempo_method}"
+        f"|tonnetz={engine.tonnetz_source}|dur={float(duration)}"
+    )
+    return hashlib.blake2b(config.encode(), digest_size=8).hexdigest()
+
+
+def content_hash(y):
+    """모델 입력 샘플 해시 (float32 바이트 기준)"""
+    samples = np.ascontiguousarray(y, dtype=np.float32)
+    digest = hashlib.blake2b(samples.view(np.uint8), digest_size=16)
+    digest.update(str(samples.shape[0]).encode())
+    return digest.hexdigest()
+
+
+class FeatureCache:
+    """
+    특징 벡터 2단계 캐시
+
+    - memory : 프로세스별 LRU (max_entries / max_bytes 중 먼저 닿는 한도에서 오래된 항목 제거)
+    - disk   : disk_dir가 있으면 <disk_dir>/<pipeline>/<hash>.npy 로 저장
+               (추론 워커가 여러 프로세스여도 한 번 계산한 특징을 공유, 오래된 파일부터 정리)
+
+    저장된 배열은 읽기 전용이며, get()은 호출자가 수정해도 안전하도록 복사본을 반환합니다.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES,
+                 disk_dir=None, disk_max_entries=DEFAULT_DISK_MAX_ENTRIES):
+        self.max_entries = int(max_entries)
+        self.max_bytes = int(max_bytes)
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_max_entries = int(disk_max_entries)
+
+        self._entries = OrderedDict()  # (pipeline, hash) -> np.ndarray
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._disk_writes = 0
+
+        # 통계
+        self._stats = {
+            "hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "disk_errors": 0,
+        }
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0 or self.disk_dir is not None
+
+    def _disk_path(self, key):
+        pipeline, digest = key
+        return self.disk_dir / pipeline / f"{digest}.npy"
+
+    def get(self, key):
+        """캐시된 특징 벡터 (없으면 None)"""
+        with self._lock:
+            features = self._entries.get(key)
+            if features is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return features.copy()
+
+        if self.disk_dir is not None:
+            path = self._disk_path(key)
+            try:
+                features = np.load(path, allow_pickle=False)
+            except FileNotFoundError:
+                features = None
+            except Exception as e:
+                print(f"⚠️  Feature cache read error ({path.name}): {e}")
+                self._stats["disk_errors"] += 1
+                features = None
+            if features is not None:
+                self._store_memory(key, features)
+                self._stats["disk_hits"] += 1
+                return features.copy()
+
+        self._stats["misses"] += 1
+        return None
+
+    def put(self, key, features):
+        features = np.array(features, dtype=np.float64)
+        self._store_memory(key, features)
+        if self.disk_dir is not None:
+            self._store_disk(key, features)
+
+    def _store_memory(self, key, features):
+        if self.max_entries <= 0 or features.nbytes > self.max_bytes:
+            return
+        features.setflags(write=False)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._entries[key] = features
+            self._bytes += features.nbytes
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self._stats["evictions"] += 1
+
+    def _store_disk(self, key, features):
+        path = self._disk_path(key)
+        if path.exists():
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 다른 워커가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+            tmp_path = path.with_name(f".{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                np.save(f, features, allow_pickle=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"⚠️  Feature cache write error ({path.name}): {e}")
+            self._stats["disk_errors"] += 1
+            return
+
+        self._disk_writes += 1
+        if self._disk_writes % DISK_PRUNE_INTERVAL == 0:
+            self.prune_disk()
+
+    def prune_disk(self):
+        """디스크 항목이 disk_max_entries를 넘으면 오래된 파일부터 삭제. 삭제 개수 반환"""
+        if self.disk_dir is None or not self.disk_dir.exists():
+            return 0
+        files = []
+        for path in self.disk_dir.glob('*/*.npy'):
+            try:
+                files.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue
+        excess = len(files) - self.disk_max_entries
+        if excess <= 0:
+            return 0
+        removed = 0
+        for _, path in sorted(files)[:excess]:
+            try:
+                path.unlink()
+                removed += 1
+            except FileNotFoundError:
+                continue
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self):
+        lookups = self._stats["hits"] + self._stats["disk_hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "hit_rate": round((self._stats["hits"] + self._stats["disk_hits"]) / lookups, 3) if lookups else None,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "disk_dir": str(self.disk_dir) if self.disk_dir else None,
+            "pid": os.getpid(),
+        }
+
+
+# 싱글톤 (프로세스별 - 추론 워커 프로세스마다 메모리 계층을 따로 가짐)
+_feature_cache = None
+_feature_cache_lock = threading.Lock()
+
+
+def get_feature_cache():
+    """
+    환경 변수 설정으로 만든 프로세스 공용 캐시
+
+    - FEATURE_CACHE_MAX_ENTRIES : 메모리 항목 수 한도 (0이면 메모리 계층 끔)
+    - FEATURE_CACHE_MAX_BYTES   : 메모리 바이트 한도
+    - FEATURE_CACHE_DIR         : 디스크 계층 경로 (비우면 끔, 예: uploads/.feature_cache)
+    - FEATURE_CACHE_DISK_MAX_ENTRIES : 디스크 파일 수 한도
+    """
+    global _feature_cache
+    with _feature_cache_lock:
+        if _feature_cache is None:
+            _feature_cache = FeatureCache(
+                max_entries=os.getenv('FEATURE_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES),
+                max_bytes=os.getenv('FEATURE_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES),
+                disk_dir=os.getenv('FEATURE_CACHE_DIR') or None,
+                disk_max_entries=os.getenv('FEATURE_CACHE_DISK_MAX_ENTRIES', DEFAULT_DISK_MAX_ENTRIES),
+            )
+        return _feature_cache
+
+
+def get_feature_cache_stats():
+    """헬스 체크용 캐시 통계 (이 프로세스에서 아직 사용되지 않았으면 None)"""
+    return _feature_cache.get_stats() if _feature_cache is not None else None
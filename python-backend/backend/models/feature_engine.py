@@ -0,0 +1,215 @@
+import numpy as np
+import librosa
+
+"""
+✅ 단일 STFT 기반 특징 추출 엔진
+- 크기 STFT / 멜 파워 스펙트로그램을 한 번만 계산하고 모든 스펙트럼 특징이 공유
+- CryClassifier.extract_features의 특징 벡터 레이아웃(105차원)을 그대로 유지
+"""
+
+# 특징 벡터 레이아웃 (pickled scaler가 기대하는 순서)
+FEATURE_LAYOUT = [
+    ('mfcc_mean', 13),
+    ('mfcc_std', 13),
+    ('mfcc_max', 13),
+    ('mfcc_min', 13),
+    ('mfcc_delta_mean', 13),
+    ('mfcc_delta2_mean', 13),
+    ('spectral_centroid', 2),
+    ('spectral_rolloff', 2),
+    ('spectral_bandwidth', 2),
+    ('spectral_flatness', 4),
+    ('zcr', 2),
+    ('rms', 3),
+    ('chroma', 2),
+    ('mel', 2),
+    ('contrast', 2),
+    ('tonnetz', 2),
+    ('tempo', 1),
+    ('onset', 3),
+]
+FEATURE_DIM = sum(size for _, size in FEATURE_LAYOUT)
+
+# 템포 특징 계산 방식
+# - 'beat_track' : librosa.beat.beat_track (템포 추정 후 비트 추적까지 수행, 기존 방식)
+# - 'tempo'      : 같은 onset envelope에 대한 자기상관 템포 추정만 수행 (beat_track의 템포 값과 동일)
+TEMPO_METHODS = ('beat_track', 'tempo')
+
+# tonnetz 입력 chroma
+# - 'cqt'  : librosa.feature.tonnetz(y=y) 기본값 (chroma_cqt를 별도로 계산, 학습 시와 동일)
+# - 'stft' : 공유 STFT에서 이미 계산한 chroma_stft 재사용 (근사값, CQT 생략)
+TONNETZ_SOURCES = ('cqt', 'stft')
+
+# CryClassifier(feature_profile=...)에서 선택하는 특징 엔진 설정
+FEATURE_PROFILES = {
+    'exact': {'tonnetz_source': 'cqt'},
+    'fast': {'tonnetz_source': 'stft'},
+}
+
+
+class SpectralFeatureEngine:
+    """
+    공유 스펙트로그램 기반 특징 추출기
+
+    librosa의 개별 feature 함수는 호출할 때마다 y로부터 STFT/멜 스펙트로그램을
+    다시 계산합니다. 이 엔진은 샘플링 레이트별로 필터뱅크를 한 번 만들어 두고,
+    클립마다 STFT 1회 + 멜 투영 1회만 수행한 뒤 모든 특징을 파생합니다.
+    """
+
+    def __init__(self, sr=22050, n_fft=2048, hop_length=512, n_mels=128, n_mfcc=13, tempo_method='tempo',
+                 tonnetz_source='cqt'):
+        if tempo_method not in TEMPO_METHODS:
+            raise ValueError(f"Invalid tempo_method '{tempo_method}' (expected one of {TEMPO_METHODS})")
+        if tonnetz_source not in TONNETZ_SOURCES:
+            raise ValueError(f"Invalid tonnetz_source '{tonnetz_source}' (expected one of {TONNETZ_SOURCES})")
+
+        self.sr = sr
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.n_mfcc = n_mfcc
+        self.tempo_method = tempo_method
+        self.tonnetz_source = tonnetz_source
+
+        # 멜 필터뱅크는 sr/n_fft가 같으면 항상 동일하므로 미리 계산
+        self.mel_basis = librosa.filters.mel(sr=sr, n_fft=n_fft, n_mels=n_mels)
+
+    def compute_spectra(self, y):
+        """
+        공유 스펙트로그램 계산
+
+        Returns:
+        --------
+        dict : {
+            'magnitude': |STFT|,
+            'power': |STFT|**2,
+            'mel': 멜 파워 스펙트로그램,
+            'log_mel': power_to_db(mel)
+        }
+        """
+        magnitude = np.abs(librosa.stft(y, n_fft=self.n_fft, hop_length=self.hop_length))
+        return self.spectra_from_magnitude(magnitude)
+
+    def spectra_from_magnitude(self, magnitude):
+        """이미 계산된 크기 STFT(예: 스트리밍 프레임 캐시)로부터 공유 스펙트로그램 생성"""
+        power = magnitude ** 2
+        mel = np.einsum("mf,ft->mt", self.mel_basis, power, optimize=True)
+        return {
+            'magnitude': magnitude,
+            'power': power,
+            'mel': mel,
+            'log_mel': librosa.power_to_db(mel),
+        }
+
+    def extract(self, y, spectra=None):
+        """
+        전처리된 신호 y에서 105차원 특징 벡터 생성
+
+        Parameters:
+        -----------
+        y : np.ndarray
+            전처리(필터/정규화/길이 고정)가 끝난 모노 신호
+        spectra : dict, optional
+            compute_spectra() 결과 (없으면 여기서 계산)
+        """
+        if spectra is None:
+            spectra = self.compute_spectra(y)
+
+        sr = self.sr
+        hop = self.hop_length
+        S = spectra['magnitude']
+        power = spectra['power']
+        mel = spectra['mel']
+        log_mel = spectra['log_mel']
+
+        features = []
+
+        # MFCC (78 features) - 멜 스펙트로그램 재사용
+        mfcc = librosa.feature.mfcc(S=log_mel, n_mfcc=self.n_mfcc)
+        features.extend([
+            np.mean(mfcc, axis=1),
+            np.std(mfcc, axis=1),
+            np.max(mfcc, axis=1),
+            np.min(mfcc, axis=1)
+        ])
+
+        mfcc_delta = librosa.feature.delta(mfcc)
+        features.append(np.mean(mfcc_delta, axis=1))
+
+        mfcc_delta2 = librosa.feature.delta(mfcc, order=2)
+        features.append(np.mean(mfcc_delta2, axis=1))
+
+        # Spectral (10 features) - 크기 STFT 재사용
+        spectral_centroids = librosa.feature.spectral_centroid(S=S, sr=sr, n_fft=self.n_fft)[0]
+        spectral_rolloff = librosa.feature.spectral_rolloff(S=S, sr=sr, n_fft=self.n_fft)[0]
+        spectral_bandwidth = librosa.feature.spectral_bandwidth(S=S, sr=sr, n_fft=self.n_fft)[0]
+        spectral_flatness = librosa.feature.spectral_flatness(S=S, n_fft=self.n_fft)[0]
+
+        features.extend([
+            [np.mean(spectral_centroids), np.std(spectral_centroids)],
+            [np.mean(spectral_rolloff), np.std(spectral_rolloff)],
+            [np.mean(spectral_bandwidth), np.std(spectral_bandwidth)],
+            [np.mean(spectral_flatness), np.std(spectral_flatness),
+             np.max(spectral_flatness), np.min(spectral_flatness)]
+        ])
+
+        # Energy (5 features) - 시간 영역 프레임 기반 (STFT 불필요)
+        zcr = librosa.feature.zero_crossing_rate(y)[0]
+        rms = librosa.feature.rms(y=y)[0]
+        features.extend([
+            [np.mean(zcr), np.std(zcr)],
+            [np.mean(rms), np.std(rms), np.max(rms)]
+        ])
+
+        # Harmonic (8 features)
+        chroma = librosa.feature.chroma_stft(S=power, sr=sr, n_fft=self.n_fft)
+        contrast = librosa.feature.spectral_contrast(S=S, sr=sr, n_fft=self.n_fft)
+        if self.tonnetz_source == 'stft':
+            tonnetz = librosa.feature.tonnetz(chroma=chroma)
+        else:
+            tonnetz = librosa.feature.tonnetz(y=y, sr=sr)
+
+        features.extend([
+            [np.mean(chroma), np.std(chroma)],
+            [np.mean(mel), np.std(mel)],
+            [np.mean(contrast), np.std(contrast)],
+            [np.mean(tonnetz), np.std(tonnetz)]
+        ])
+
+        # Temporal (4 features) - onset envelope는 로그 멜 스펙트로그램에서 파생
+        onset_env, beat_onset_env = self._onset_envelopes(log_mel)
+        tempo = self._tempo(beat_onset_env)
+        features.extend([
+            np.atleast_1d(tempo),
+            [np.mean(onset_env), np.std(onset_env), np.max(onset_env)]
+        ])
+
+        feature_vector = np.concatenate([np.array(f).flatten() for f in features])
+        return np.nan_to_num(feature_vector, nan=0.0, posinf=0.0, neginf=0.0)
+
+    def _onset_envelopes(self, log_mel):
+        """
+        librosa.onset.onset_strength(S=log_mel)의 mean / median 집계 결과를 한 번에 계산
+
+        두 envelope는 같은 프레임 차분(lag=1)을 다르게 집계할 뿐이므로 차분은 한 번만 계산하고,
+        onset_strength(center=True)와 같게 lag + n_fft // (2 * hop_length) 프레임만큼 앞을 0으로 채움
+        """
+        flux = np.maximum(0.0, log_mel[:, 1:] - log_mel[:, :-1])
+        pad_width = 1 + self.n_fft // (2 * self.hop_length)
+        n_frames = log_mel.shape[1]
+        mean_env = np.pad(np.mean(flux, axis=0), (pad_width, 0))[:n_frames]
+        median_env = np.pad(np.median(flux, axis=0), (pad_width, 0))[:n_frames]
+        return mean_env, median_env
+
+    def _tempo(self, beat_onset_env):
+        """beat_track 내부 기본값과 동일하게 median 집계 envelope에서 템포 추정"""
+        if self.tempo_method == 'beat_track':
+            tempo, _ = librosa.beat.beat_track(
+                onset_envelope=beat_onset_env, sr=self.sr, hop_length=self.hop_length, start_bpm=120
+            )
+            return tempo
+        # beat_track은 onset이 전혀 없으면 템포 추정 없이 0을 반환하므로 동일하게 처리
+        if not beat_onset_env.any():
+            return 0.0
+        return librosa.feature.tempo(
+            onset_envelope=beat_onset_env, sr=self.sr, hop_length=self.hop_length, start_bpm=120
+        )
@@ -0,0 +1,160 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import scipy.signal as signal
+
+from backend.models.preprocessing import highpass_sos
+
+"""
+✅ 경량 사전 게이트 (always-on 모니터링용)
+- 전체 특징 추출(tonnetz / tempo 등) + 캐스케이드 이전에 명백한 비울음 윈도우를 거름
+- 윈도우 전체가 아니라 몇 개의 프로브 프레임만 사용 (에너지 / ZCR / 스펙트럴 플럭스)
+- 임계값은 dataset_tools/calibrate_gate.py로 detector 기준 보정 후 JSON으로 저장
+"""
+
+# 프로젝트 루트 (backend/models/gate.py 기준 3단계 위)
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+DEFAULT_GATE_PATH = PROJECT_ROOT / 'models' / 'baby_cry_v15_1_gate.json'
+
+# 보정 파일이 없을 때의 보수적 기본값 (무음 / 히스 노이즈 / 변화 없는 톤만 거름)
+DEFAULT_GATE_THRESHOLDS = {
+    'min_band_db': -70.0,
+    'max_zcr': 0.45,
+    'min_flux': 0.02,
+}
+
+
+class CryGate:
+    """
+    에너지 / 영교차율 / 스펙트럴 플럭스 기반 사전 게이트
+
+    모든 값은 CryClassifier 전처리와 같은 250Hz 하이패스 신호 기준입니다.
+    - band_db : 250Hz~8kHz 대역 평균 파워 (dB) → 무음 제거
+    - zcr     : 프로브 프레임 평균 영교차율 → 광대역 히스 노이즈 제거
+    - flux    : 인접 프레임 간 대역 로그 에너지 증가량 평균 → 변화 없는 톤/험 제거
+    """
+
+    def __init__(self, sr=22050, n_fft=1024, n_probes=8, n_bands=24, band=(250.0, 8000.0), thresholds=None):
+        self.sr = sr
+        self.n_fft = n_fft
+        self.hop = n_fft // 2
+        self.n_probes = n_probes
+        self.thresholds = dict(DEFAULT_GATE_THRESHOLDS)
+        if thresholds:
+            self.thresholds.update({k: float(v) for k, v in thresholds.items() if k in DEFAULT_GATE_THRESHOLDS})
+
+        # sr별 상수 (창 함수, 대역 마스크, 밴드 경계, 하이패스 필터) 미리 계산
+        self._window = np.hanning(n_fft + 1)[:-1]
+        self._window_norm = np.sum(self._window) ** 2
+        freqs = np.fft.rfftfreq(n_fft, 1.0 / sr)
+        self._band_mask = (freqs >= band[0]) & (freqs <= band[1])
+        self._band_edges = np.linspace(0, int(self._band_mask.sum()), n_bands + 1).astype(int)[:-1]
+        self._sos = highpass_sos(sr)
+
+        # 통계
+        self._evaluated = 0
+        self._gated = 0
+        self._gated_by = {'energy': 0, 'zcr': 0, 'flux': 0}
+
+    @classmethod
+    def load(cls, path=None, sr=22050):
+        """보정 JSON을 읽어 게이트 생성 (파일이 없으면 기본 임계값)"""
+        path = Path(path or os.getenv('CRY_GATE_PATH', DEFAULT_GATE_PATH))
+        thresholds = None
+        if path.exists():
+            with path.open('r', encoding='utf-8') as f:
+                thresholds = json.load(f).get('thresholds')
+        return cls(sr=sr, thresholds=thresholds)
+
+    def features(self, y, filtered=False):
+        """
+        프로브 프레임 기반 게이트 특징
+
+        Parameters:
+        -----------
+        y : np.ndarray
+            sr 모노 윈도우
+        filtered : bool
+            이미 250Hz 하이패스가 적용된 신호인지 (아니면 여기서 인과 필터 적용)
+        """
+        y = np.asarray(y, dtype=np.float64)
+        if not filtered:
+            y = signal.sosfilt(self._sos, y)
+        if len(y) < self.n_fft + self.hop:
+            y = np.pad(y, (0, self.n_fft + self.hop - len(y)))
+
+        # 윈도우 전체에 고르게 퍼진 n_probes개 위치에서 인접 프레임 2개씩
+        starts = np.linspace(0, len(y) - self.n_fft - self.hop, self.n_probes).astype(int)
+        offsets = np.concatenate([starts, starts + self.hop])
+        frames = y[offsets[:, np.newaxis] + np.arange(self.n_fft)] * self._window
+
+        power = np.abs(np.fft.rfft(frames, axis=1)) ** 2 / self._window_norm
+        band_power = power[:, self._band_mask]
+        band_db = 10.0 * np.log10(band_power.sum(axis=1).mean() + 1e-12)
+
+        zcr = np.mean(np.signbit(frames[:, 1:]) != np.signbit(frames[:, :-1]))
+
+        log_bands = np.log(np.add.reduceat(band_power, self._band_edges, axis=1) + 1e-10)
+        flux = np.mean(np.maximum(0.0, log_bands[self.n_probes:] - log_bands[:self.n_probes]))
+
+        return {'band_db': float(band_db), 'zcr': float(zcr), 'flux': float(flux)}
+
+    def check(self, y, filtered=False):
+        """
+        Returns:
+        --------
+        (bool, dict) : (전체 분석이 필요한지, 게이트 특징 + 거른 사유)
+        """
+        feats = self.features(y, filtered=filtered)
+        reason = None
+        if feats['band_db'] < self.thresholds['min_band_db']:
+            reason = 'energy'
+        elif feats['zcr'] > self.thresholds['max_zcr']:
+            reason = 'zcr'
+        elif feats['flux'] < self.thresholds['min_flux']:
+            reason = 'flux'
+
+        self._evaluated += 1
+        if reason is not None:
+            self._gated += 1
+            self._gated_by[reason] += 1
+        feats['gated_by'] = reason
+        return reason is None, feats
+
+    def gated_result(self, feats):
+        """게이트에서 걸러진 윈도우의 결과 (predict_with_confidence와 같은 형식)"""
+        return {
+            'prediction': 'not_cry',
+            'confidence': 1.0,
+            'severity': 'None',
+            'probabilities': {},
+            'stage': 'gate',
+            'gate': feats
+        }
+
+    def get_stats(self):
+        return {
+            'thresholds': self.thresholds,
+            'evaluated': self._evaluated,
+            'gated': self._gated,
+            'gated_fraction': round(self._gated / self._evaluated, 3) if self._evaluated else None,
+            'gated_by': dict(self._gated_by),
+        }
+
+
+# 싱글톤 (스트리밍 분석은 메인 프로세스에서 게이트를 거치므로 통계도 프로세스 하나로 집계)
+_cry_gate = None
+
+
+def get_cry_gate():
+    global _cry_gate
+    if _cry_gate is None:
+        _cry_gate = CryGate.load()
+    return _cry_gate
+
+
+def get_cry_gate_stats():
+    """헬스 체크용 게이트 통계 (아직 사용되지 않았으면 None)"""
+    return _cry_gate.get_stats() if _cry_gate is not None else None
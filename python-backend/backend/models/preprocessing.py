@@ -0,0 +1,203 @@
+import threading
+from functools import lru_cache
+
+import numpy as np
+import scipy.signal as signal
+from librosa.util import frame as frame_signal
+
+"""
+✅ 오디오 전처리 단계 (CryClassifier.extract_features 전용)
+- 250Hz 5차 Butterworth 하이패스를 샘플링 레이트별로 한 번만 설계 (SOS 형식)
+- 하이패스(양방향) → 길이 정규화 → RMS 정규화 → 무음 trim → 길이 정규화를
+  미리 할당한 버퍼 안에서 처리 (단계마다 새 배열을 만들지 않음)
+- 같은 길이 클립 N개를 (N, 샘플) 2차원 배열로 한 번에 처리하는 배치 경로
+"""
+
+HIGHPASS_CUTOFF = 250.0
+HIGHPASS_ORDER = 5
+
+
+@lru_cache(maxsize=None)
+def highpass_sos(sr, cutoff=HIGHPASS_CUTOFF, order=HIGHPASS_ORDER):
+    """
+    아기 울음 대역(250Hz 이상) 보존용 하이패스 필터 (sr별 캐시)
+
+    전처리 / 사전 게이트 / 스트리밍 분석이 같은 계수를 공유합니다.
+    반환 배열은 공유 객체이므로 수정하지 마세요.
+    """
+    return signal.butter(order, cutoff / (sr / 2), btype='highpass', output='sos')
+
+
+class AudioPreprocessor:
+    """
+    extract_features 전처리 파이프라인
+
+    기존 단계와 같은 결과를 내도록 각 단계를 그대로 재현합니다.
+    - 하이패스 : filtfilt(b, a) 대신 sosfiltfilt (수치적으로 더 안정, padlen은 filtfilt 기본값과 동일)
+    - RMS 정규화 : 목표 길이로 패딩한 신호 기준 RMS를 0.1로
+    - 무음 trim : librosa.effects.trim(top_db=20)과 같은 프레임 RMS / dB 기준 (행별 최댓값 기준)
+    - 패딩 : trim된 구간을 앞으로 당기고 나머지는 0
+
+    버퍼는 스레드별로 (행 수, 목표 길이)마다 한 번만 할당합니다.
+    out을 넘기지 않으면 반환 배열은 내부 버퍼이므로 같은 스레드의 다음 호출 전에 사용해야 합니다.
+    """
+
+    def __init__(self, sr=22050, target_rms=0.1, top_db=20, frame_length=2048, hop_length=512):
+        self.sr = sr
+        self.target_rms = target_rms
+        self.top_db = top_db
+        self.frame_length = frame_length
+        self.hop_length = hop_length
+        self.sos = highpass_sos(sr)
+        # 필터 초기 상태(정상 상태 응답)도 sr별로 한 번만 계산 (sosfiltfilt는 호출마다 다시 계산)
+        self._zi = signal.sosfilt_zi(self.sos)
+        # filtfilt(b, a) 기본 padlen = 3 * max(len(a), len(b)) 와 같은 길이로 가장자리 확장
+        self.padlen = 3 * (HIGHPASS_ORDER + 1)
+        self._local = threading.local()
+
+    def _buffers(self, n_rows, target_length):
+        """(trim 프레임용 0 패딩 작업 버퍼, 출력 버퍼) - 스레드별 재사용"""
+        cache = getattr(self._local, 'buffers', None)
+        if cache is None:
+            cache = self._local.buffers = {}
+        key = (n_rows, target_length)
+        if key not in cache:
+            pad = self.frame_length // 2
+            cache[key] = (
+                np.zeros((n_rows, target_length + 2 * pad), dtype=np.float64),
+                np.empty((n_rows, target_length), dtype=np.float64),
+            )
+        return cache[key]
+
+    def _filtfilt(self, batch):
+        """signal.sosfiltfilt(sos, batch, axis=-1, padlen=padlen)와 같은 양방향 필터 (zi 재사용)"""
+        n = self.padlen
+        if batch.shape[-1] <= n:
+            raise ValueError(f"The length of the input vector x must be greater than padlen, which is {n}.")
+        # 홀수 대칭 확장 (filtfilt padtype='odd')
+        ext = np.concatenate([
+            2 * batch[:, :1] - batch[:, n:0:-1],
+            batch,
+            2 * batch[:, -1:] - batch[:, -2:-n - 2:-1],
+        ], axis=-1)
+        zi = self._zi[:, np.newaxis, :]
+        forward, _ = signal.sosfilt(self.sos, ext, axis=-1, zi=zi * ext[np.newaxis, :, :1])
+        backward, _ = signal.sosfilt(self.sos, forward[:, ::-1], axis=-1, zi=zi * forward[np.newaxis, :, -1:])
+        return backward[:, ::-1][:, n:-n]
+
+    def _frame_power(self, work, n_frames):
+        """
+        trim용 프레임 평균 파워 (librosa.feature.rms(center=True) ** 2)
+
+        frame_length가 hop_length의 배수면 hop 블록 제곱합을 이어 붙여 계산
+        (프레임을 겹쳐 펼친 배열을 만들지 않음)
+        """
+        if self.frame_length % self.hop_length:
+            frames = frame_signal(work, frame_length=self.frame_length, hop_length=self.hop_length)
+            return np.mean(np.square(frames), axis=-2)
+        per_frame = self.frame_length // self.hop_length
+        n_blocks = n_frames + per_frame - 1
+        blocks = np.square(work[:, :n_blocks * self.hop_length])
+        blocks = blocks.reshape(work.shape[0], n_blocks, self.hop_length).sum(axis=-1)
+        power = blocks[:, :n_frames].copy()
+        for k in range(1, per_frame):
+            power += blocks[:, k:k + n_frames]
+        power /= self.frame_length
+        return power
+
+    def process(self, y, duration=3.0, out=None):
+        """
+        단일 클립 전처리
+
+        Parameters:
+        -----------
+        y : np.ndarray
+            sr 모노 1차원 배열
+        duration : float
+            목표 길이 (초)
+        out : np.ndarray, optional
+            결과를 기록할 (목표 길이,) float64 배열
+
+        Returns:
+        --------
+        np.ndarray : (목표 길이,) 전처리된 신호
+        """
+        y = np.asarray(y)
+        result = self.process_batch(y[np.newaxis, :], duration, out=None if out is None else out[np.newaxis, :])
+        return result[0]
+
+    def process_batch(self, batch, duration=3.0, out=None):
+        """
+        같은 길이 클립 N개를 한 번에 전처리
+
+        Parameters:
+        -----------
+        batch : np.ndarray
+            (N, 샘플) sr 모노 배열
+        duration : float
+            목표 길이 (초)
+        out : np.ndarray, optional
+            결과를 기록할 (N, 목표 길이) float64 배열
+
+        Returns:
+        --------
+        np.ndarray : (N, 목표 길이) 전처리된 신호
+        """
+        batch = np.asarray(batch)
+        if batch.ndim != 2:
+            raise ValueError(f"batch must be 2-D (clips, samples), got shape {batch.shape}")
+        n_rows, n_samples = batch.shape
+        target_length = int(self.sr * duration)
+        pad = self.frame_length // 2
+        work, buffer = self._buffers(n_rows, target_length)
+        if out is None:
+            out = buffer
+
+        # 1) 양방향 하이패스 (원본 길이 그대로 필터링한 뒤 목표 길이로 패딩 / 자르기)
+        # (재귀 필터는 샘플 단위 순차 계산이라 행 단위로 돌려야 작업 배열이 캐시에 머묾)
+        used = min(n_samples, target_length)
+        clip = work[:, pad:pad + target_length]
+        for i in range(n_rows):
+            clip[i, :used] = self._filtfilt(batch[i:i + 1])[0, :used]
+        clip[:, used:] = 0.0
+
+        # 2) RMS 정규화 (제자리 연산, 무음 행은 그대로)
+        rms = np.sqrt(np.mean(clip ** 2, axis=-1))
+        loud = rms > 0
+        if loud.all():
+            clip /= rms[:, np.newaxis]
+            clip *= self.target_rms
+        elif loud.any():
+            clip[loud] = clip[loud] / rms[loud, np.newaxis] * self.target_rms
+
+        # 3) 무음 trim 구간 (work의 양쪽 0 패딩 = librosa.feature.rms(center=True))
+        power = self._frame_power(work, 1 + target_length // self.hop_length)
+        amin = 1e-10
+        db = 10.0 * np.log10(np.maximum(amin, power))
+        db -= 10.0 * np.log10(np.maximum(amin, power.max(axis=-1, keepdims=True)))
+        non_silent = db > -self.top_db
+
+        # 4) trim 구간을 앞으로 당겨 출력 버퍼에 기록하고 나머지는 0
+        for i in range(n_rows):
+            nonzero = np.flatnonzero(non_silent[i])
+            if nonzero.size > 0:
+                start = int(nonzero[0]) * self.hop_length
+                end = min(target_length, (int(nonzero[-1]) + 1) * self.hop_length)
+            else:
+                start, end = 0, 0
+            length = end - start
+            out[i, :length] = clip[i, start:end]
+            out[i, length:] = 0.0
+        return out
+
+
+# sr별 싱글톤
+_preprocessors = {}
+_preprocessors_lock = threading.Lock()
+
+
+def get_preprocessor(sr=22050):
+    with _preprocessors_lock:
+        if sr not in _preprocessors:
+            _preprocessors[sr] = AudioPreprocessor(sr=sr)
+        return _preprocessors[sr]
@@ -0,0 +1,345 @@
+import json
+import os
+import pickle
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from backend.models.bundle import BUNDLE_COMPONENTS, BUNDLE_SUFFIX
+
+"""
+✅ 프로세스 공용 모델 레지스트리
+- api.get_classifier / CryClassificationAgent(workflow.py, langgraph_routes.py) / 스레드 모드 추론 워커가
+  같은 (모델, 특징 프로파일) 조합이면 가중치를 한 번만 로드해 공유
+- acquire / release 참조 카운트 (마지막 release 시 언로드)
+- 민감도별 뷰 (CryClassifier.with_sensitivity - 가중치 재로드 없음)
+- memory_report()로 로드된 모델 / 컴포넌트 크기 / 프로세스 RSS 확인
+- ModelCatalog: 버전 라벨 → 모델 경로, 활성 버전 / 배포 이력 (models/model_versions.json)
+"""
+
+# 프로젝트 루트 (backend/models/registry.py 기준 3단계 위)
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+DEFAULT_MODEL_PREFIX = PROJECT_ROOT / 'models' / 'baby_cry_v15_1'
+
+# 기존 pickle 파일명 suffix (모델 경로를 prefix로 정규화할 때 제거)
+_MODEL_SUFFIXES = [suffix for suffixes, _, _ in BUNDLE_COMPONENTS.values() for suffix in suffixes] + [BUNDLE_SUFFIX]
+
+
+def normalize_model_prefix(model_path=None):
+    """detector.pkl 경로 / prefix / 번들 경로를 같은 키로 정규화"""
+    path = str(model_path or DEFAULT_MODEL_PREFIX).rstrip('/\\')
+    for suffix in _MODEL_SUFFIXES:
+        if path.endswith(suffix):
+            path = path[:-len(suffix)]
+            break
+    return str(Path(path).resolve())
+
+
+def version_label(model_path):
+    """모델 prefix 이름에서 버전 라벨 추출 (baby_cry_v15_1 → v15.1, 규칙에 맞지 않으면 이름 그대로)"""
+    name = Path(normalize_model_prefix(model_path)).name
+    match = re.search(r'v(\d+)(?:_(\d+))?$', name)
+    if match is None:
+        return name
+    return f"v{match.group(1)}.{match.group(2) or 0}"
+
+
+def _process_rss_mb():
+    """현재 프로세스 RSS (MB, 리눅스 외에는 최대 RSS로 대체)"""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    try:
+        import resource
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    except ImportError:
+        return None
+
+
+class _RegistryEntry:
+    def __init__(self, key):
+        self.key = key
+        self.classifier = None
+        self.refs = 0
+        self.load_ms = None
+        self.loaded_at = None
+        # release에서 마지막 참조로 제거됨 (이후 이 항목으로는 acquire하지 않음)
+        self.retired = False
+        self.lock = threading.Lock()
+
+
+class ModelRegistry:
+    """
+    (모델 prefix, 특징 프로파일) → 로드된 CryClassifier 1개
+
+    사용 예:
+        registry = get_model_registry()
+        classifier = registry.acquire(sensitivity='high')   # 첫 호출에서만 로드
+        ...
+        registry.release(classifier)                        # 참조가 0이 되면 언로드
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _RegistryEntry(key)
+            return entry
+
+    def acquire(self, model_path=None, sensitivity=None, feature_profile=None, model_version=None):
+        """
+        공유 분류기 뷰를 얻고 참조 카운트 증가
+
+        Parameters:
+        -----------
+        model_path : str, optional
+            detector.pkl 경로, 모델 prefix 또는 번들 경로 (기본: models/baby_cry_v15_1)
+        sensitivity : str, optional
+            뷰 민감도 (기본: CRY_SENSITIVITY)
+        feature_profile : str, optional
+            특징 프로파일 (기본: CRY_FEATURE_PROFILE)
+        model_version : str, optional
+            응답에 표시할 버전 라벨 (기본: 모델 이름에서 추출, 첫 로드 시에만 적용)
+        """
+        sensitivity = sensitivity or os.getenv('CRY_SENSITIVITY', 'balanced')
+        feature_profile = feature_profile or os.getenv('CRY_FEATURE_PROFILE', 'exact')
+        key = (normalize_model_prefix(model_path), feature_profile)
+        while True:
+            entry = self._entry(key)
+            # 같은 모델의 동시 첫 요청은 한 번만 로드 (다른 모델 로드는 막지 않음)
+            with entry.lock:
+                # _entry와 잠금 사이에 release가 이 항목을 제거했으면 새 항목으로 다시 시도
+                # (release는 entry.lock + self._lock을 모두 잡고 제거하므로 retired가 아니면 등록된 상태)
+                if not entry.retired:
+                    return self._acquire_locked(entry, sensitivity, model_version)
+
+    def _acquire_locked(self, entry, sensitivity, model_version):
+        """entry.lock 안에서 호출 - 처음이면 로드하고 참조 카운트 증가"""
+        model_prefix, feature_profile = entry.key
+        if entry.classifier is None:
+            # 분류기 모듈(scipy / sklearn)은 첫 로드 시 import - 서버 시작 시간에 포함하지 않음
+            from backend.models.classifier import CryClassifier
+
+            started = time.perf_counter()
+            classifier = CryClassifier('', sensitivity=sensitivity, feature_profile=feature_profile)
+            classifier.load_model(model_prefix)
+            # 민감도 뷰(copy.copy)도 같은 항목을 가리키므로 release는 키 재조회 없이 이 항목으로 반환
+            classifier._registry_entry = entry
+            classifier.model_version = model_version or version_label(model_prefix)
+            entry.classifier = classifier
+            entry.load_ms = round((time.perf_counter() - started) * 1000, 1)
+            entry.loaded_at = time.time()
+            print(f"📚 [ModelRegistry] Loaded {Path(model_prefix).name} ({feature_profile}) in {entry.load_ms}ms")
+        entry.refs += 1
+        return entry.classifier.with_sensitivity(sensitivity)
+
+    def release(self, classifier):
+        """acquire로 얻은 분류기 반환 (마지막 참조면 레지스트리에서 제거)"""
+        entry = getattr(classifier, '_registry_entry', None)
+        if entry is None:
+            return
+        with entry.lock:
+            if entry.retired:
+                return
+            entry.refs = max(0, entry.refs - 1)
+            if entry.refs > 0:
+                return
+            # 두 잠금을 모두 잡고 제거 - 동시에 acquire 중인 스레드는 retired를 보고 새 항목을 만듦
+            with self._lock:
+                if self._entries.get(entry.key) is entry:
+                    del self._entries[entry.key]
+            entry.retired = True
+            entry.classifier = None
+        print(f"📚 [ModelRegistry] Unloaded {Path(entry.key[0]).name} ({entry.key[1]})")
+
+    def loaded(self):
+        with self._lock:
+            return [entry for entry in self._entries.values() if entry.classifier is not None]
+
+    def memory_report(self, include_sizes=True):
+        """
+        Returns:
+        --------
+        dict : {
+            'rss_mb': 프로세스 RSS,
+            'models': [ { 'model', 'feature_profile', 'refs', 'views', 'load_ms',
+                          'components': { 이름: 직렬화 크기(bytes) 또는 'not_loaded' } } ]
+        }
+        """
+        models = []
+        for entry in self.loaded():
+            classifier = entry.classifier
+            if classifier is None:
+                continue
+            report = {
+                'model': Path(entry.key[0]).name,
+                'feature_profile': entry.key[1],
+                'refs': entry.refs,
+                'model_version': classifier.model_version,
+                'views': sorted(classifier._views) or [classifier.sensitivity],
+                'load_ms': entry.load_ms,
+            }
+            if include_sizes:
+                report['components'] = self._component_sizes(classifier)
+                report['approx_bytes'] = sum(v for v in report['components'].values() if isinstance(v, int))
+            models.append(report)
+        return {'rss_mb': _process_rss_mb(), 'models': models}
+
+    @staticmethod
+    def _component_sizes(classifier):
+        """컴포넌트별 대략적인 메모리 크기 (pickle 직렬화 크기 기준, 지연 로드 전이면 not_loaded)"""
+        from backend.models.classifier import _PendingComponent
+
+        sizes = {}
+        components = classifier.__dict__.get('_components', {})
+        for name in BUNDLE_COMPONENTS:
+            value = components[name] if name in components else getattr(classifier, name, None)
+            if isinstance(value, _PendingComponent):
+                sizes[name] = 'not_loaded'
+            elif value is not None:
+                buffers = []
+                payload = pickle.dumps(value, protocol=5, buffer_callback=buffers.append)
+                sizes[name] = len(payload) + sum(buffer.raw().nbytes for buffer in buffers)
+        return sizes
+
+
+class ModelCatalog:
+    """
+    배포 가능한 모델 버전 목록과 활성 버전 (models/model_versions.json)
+
+    {
+        "active": "v15.1",
+        "versions": { "v15.1": { "path": "models/baby_cry_v15_1", "registered_at": "..." } },
+        "history": [ { "version", "deployed_at" } ]   # 최근 배포 순서 (rollback 대상 = 직전 항목)
+    }
+
+    파일이 없으면 기본 모델(CRY_MODEL_VERSION, 기본 v15.1)만 있는 카탈로그로 시작합니다.
+    경로는 프로젝트 루트 기준 상대 경로로 저장합니다.
+    """
+
+    MAX_HISTORY = 20
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else PROJECT_ROOT / 'models' / 'model_versions.json'
+        self._lock = threading.Lock()
+        self._data = self._read()
+
+    def _read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            default_version = os.getenv('CRY_MODEL_VERSION', version_label(DEFAULT_MODEL_PREFIX))
+            data = {
+                'active': default_version,
+                'versions': {default_version: {'path': self._relative(DEFAULT_MODEL_PREFIX), 'registered_at': None}},
+                'history': [],
+            }
+        data.setdefault('versions', {})
+        data.setdefault('history', [])
+        return data
+
+    def _write(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def _relative(model_path):
+        path = Path(normalize_model_prefix(model_path))
+        try:
+            return str(path.relative_to(PROJECT_ROOT))
+        except ValueError:
+            return str(path)
+
+    @property
+    def active(self):
+        return self._data.get('active')
+
+    @property
+    def previous(self):
+        """rollback 대상 (직전에 활성화됐던 다른 버전, 없으면 None)"""
+        for item in reversed(self._data['history'][:-1]):
+            if item['version'] != self.active and item['version'] in self._data['versions']:
+                return item['version']
+        return None
+
+    def resolve(self, version):
+        """버전 라벨 → 절대 모델 prefix (등록되지 않은 버전이면 KeyError)"""
+        entry = self._data['versions'].get(version)
+        if entry is None:
+            raise KeyError(f"Unknown model version '{version}'")
+        path = Path(entry['path'])
+        return str(path if path.is_absolute() else PROJECT_ROOT / path)
+
+    def register(self, version, model_path):
+        with self._lock:
+            self._data['versions'][version] = {
+                'path': self._relative(model_path),
+                'registered_at': datetime.now().isoformat(),
+            }
+            self._write()
+
+    def set_active(self, version):
+        with self._lock:
+            if version not in self._data['versions']:
+                raise KeyError(f"Unknown model version '{version}'")
+            history = self._data['history']
+            if not history and self._data.get('active') not in (None, version):
+                # 첫 배포면 기존 활성 버전을 이력에 남겨 rollback 가능하게 함
+                history.append({'version': self._data['active'], 'deployed_at': None})
+            self._data['active'] = version
+            history.append({'version': version, 'deployed_at': datetime.now().isoformat()})
+            del history[:-self.MAX_HISTORY]
+            self._write()
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'active': self.active,
+                'previous': self.previous,
+                'versions': dict(self._data['versions']),
+                'history': list(self._data['history']),
+            }
+
+
+# 싱글톤
+_model_registry = None
+_model_registry_lock = threading.Lock()
+
+
+def get_model_registry():
+    global _model_registry
+    with _model_registry_lock:
+        if _model_registry is None:
+            _model_registry = ModelRegistry()
+        return _model_registry
+
+
+def get_model_memory_report(include_sizes=False):
+    """헬스 체크용 메모리 리포트 (레지스트리가 아직 생성되지 않았으면 None)"""
+    return _model_registry.memory_report(include_sizes=include_sizes) if _model_registry is not None else None
+
+
+_model_catalog = None
+
+
+def get_model_catalog():
+    """MODEL_CATALOG_PATH로 카탈로그 파일 위치 변경 가능"""
+    global _model_catalog
+    with _model_registry_lock:
+        if _model_catalog is None:
+            _model_catalog = ModelCatalog(os.getenv('MODEL_CATALOG_PATH') or None)
+        return _model_catalog
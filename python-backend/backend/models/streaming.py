@@ -0,0 +1,277 @@
+import numpy as np
+import librosa
+import scipy.signal as signal
+
+from backend.models.preprocessing import highpass_sos
+
+"""
+✅ 실시간 스트리밍 울음 분석기 (WebSocket always-on 모니터링용)
+- 고정 크기 float 링 버퍼 (윈도우마다 버퍼 재할당 없음)
+- 슬라이딩 윈도우 (예: 3초 윈도우, 0.5초 hop)
+- 윈도우 간 겹치는 STFT 프레임 재사용 (incremental 모드)
+- 상태(예측 라벨)가 바뀔 때만 결과 전송
+"""
+
+STREAM_MODES = ('incremental', 'exact')
+
+
+class StreamingCryAnalyzer:
+    """
+    연결(WebSocket) 1개당 1개 생성하는 슬라이딩 윈도우 분석기
+
+    모드:
+    - 'incremental' : 인과(causal) 하이패스 필터를 스트림에 한 번만 적용하고,
+                      hop을 STFT hop_length의 배수로 맞춰 이전 윈도우와 겹치는
+                      STFT 프레임을 캐시에서 재사용합니다.
+                      오프라인 전처리와 달리 양방향 필터(filtfilt)와 무음 trim을 하지 않으므로
+                      특징값은 업로드 분석과 근사적으로만 일치합니다.
+    - 'exact'       : 링 버퍼의 원본 윈도우를 CryClassifier의 전체 전처리로 분석
+                      (window() 결과를 추론 서비스에 넘기는 용도, 업로드 분석과 동일한 특징)
+    """
+
+    def __init__(self, classifier, sample_rate=22050, window_seconds=3.0, hop_seconds=0.5, mode='incremental', gate=None):
+        """
+        Parameters:
+        -----------
+        classifier : CryClassifier
+            로드된 분류기 (incremental 모드에서 특징 엔진 / 캐스케이드 예측에 사용)
+        sample_rate : int
+            입력 PCM 샘플링 레이트 (incremental 모드는 특징 엔진 sr과 같아야 함)
+        window_seconds : float
+            분석 윈도우 길이 (초)
+        hop_seconds : float
+            윈도우 이동 간격 (초, STFT hop_length 배수로 반올림)
+        mode : str
+            'incremental' 또는 'exact'
+        gate : CryGate, optional
+            전체 분석 전에 명백한 비울음 윈도우를 거르는 사전 게이트
+        """
+        if mode not in STREAM_MODES:
+            raise ValueError(f"Invalid stream mode '{mode}' (expected one of {STREAM_MODES})")
+
+        self.classifier = classifier
+        self.mode = mode
+        self.gate = gate
+        self.sample_rate = int(sample_rate)
+
+        engine = classifier.feature_engine if classifier is not None else None
+        if mode == 'incremental' and (engine is None or engine.sr != self.sample_rate):
+            raise ValueError("incremental mode requires the stream sample rate to match the feature engine")
+
+        # hop은 STFT hop_length의 배수여야 윈도우 간 프레임 중심이 정확히 겹침
+        frame_hop = engine.hop_length if engine is not None else 1
+        self.window_samples = int(self.sample_rate * window_seconds)
+        self.hop_samples = max(1, int(round(self.sample_rate * hop_seconds / frame_hop))) * frame_hop
+
+        # 링 버퍼 (스트림 절대 위치 total_samples 기준으로 순환 기록)
+        self._ring = np.zeros(self.window_samples, dtype=np.float64)
+        self._window = np.empty(self.window_samples, dtype=np.float64)
+        self.total_samples = 0
+        self._next_window_end = self.window_samples
+        self._window_end = 0
+        self._ready = False
+
+        # 인과 하이패스 필터 (extract_features와 같은 5차 Butterworth 250Hz, 스트림 전체에 연속 적용)
+        if mode == 'incremental':
+            self._sos = highpass_sos(self.sample_rate)
+            self._zi = np.zeros((self._sos.shape[0], 2))
+            self._engine = engine
+            self._frame_cache = {}  # 프레임 중심의 스트림 절대 위치 -> |STFT| 열
+            pad = engine.n_fft // 2
+            self._padded = np.zeros(self.window_samples + 2 * pad, dtype=np.float64)
+            self._n_frames = 1 + self.window_samples // engine.hop_length
+            self._magnitude = np.empty((1 + engine.n_fft // 2, self._n_frames), dtype=np.float64)
+
+        # 상태 변화 감지
+        self.state = None
+        self.windows_analyzed = 0
+        self.windows_dropped = 0
+        self.frames_computed = 0
+        self.frames_reused = 0
+
+    # ------------------------------------------------------------------
+    # 입력
+    # ------------------------------------------------------------------
+
+    def push(self, samples):
+        """
+        float PCM 청크를 링 버퍼에 추가
+
+        Returns:
+        --------
+        bool : 분석할 윈도우가 준비되었는지 여부
+               (한 청크가 여러 hop을 넘으면 가장 최근 윈도우만 분석 - 실시간성 우선)
+        """
+        samples = np.asarray(samples, dtype=np.float64)
+        if self.mode == 'incremental':
+            samples, self._zi = signal.sosfilt(self._sos, samples, zi=self._zi)
+
+        # 다음 hop 경계까지 나눠 기록해서, 경계 시점의 윈도우가 덮어쓰이기 전에 잡아둠
+        offset = 0
+        while offset < len(samples):
+            step = min(len(samples) - offset, self._next_window_end - self.total_samples)
+            self._write(samples[offset:offset + step])
+            offset += step
+            if self.total_samples == self._next_window_end:
+                self._next_window_end += self.hop_samples
+                # 청크 안에 hop 경계가 더 남아 있으면 이 윈도우는 건너뜀
+                if len(samples) - offset < self.hop_samples:
+                    self._fill_window()
+        return self._ready
+
+    def _write(self, chunk):
+        n = len(chunk)
+        if n == 0:
+            return
+        pos = self.total_samples % self.window_samples
+        first = min(n, self.window_samples - pos)
+        self._ring[pos:pos + first] = chunk[:first]
+        if first < n:
+            self._ring[:n - first] = chunk[first:]
+        self.total_samples += n
+
+    def _fill_window(self):
+        """링 버퍼를 시간 순서로 펼쳐 미리 할당된 윈도우 버퍼에 복사"""
+        pos = self.total_samples % self.window_samples
+        tail = self.window_samples - pos
+        self._window[:tail] = self._ring[pos:]
+        self._window[tail:] = self._ring[:pos]
+        self._window_end = self.total_samples
+        self._ready = True
+
+    def gate_result(self):
+        """
+        준비된 윈도우를 사전 게이트로 검사
+
+        Returns:
+        --------
+        dict or None : 게이트에서 걸러졌으면 not_cry 결과 (윈도우 소비), 전체 분석이 필요하면 None
+        """
+        if self.gate is None or not self._ready:
+            return None
+        # incremental 모드의 링 버퍼는 이미 하이패스 필터가 적용된 신호
+        passed, feats = self.gate.check(self._window, filtered=self.mode == 'incremental')
+        if passed:
+            return None
+        self._ready = False
+        return self.gate.gated_result(feats)
+
+    def window(self):
+        """준비된 윈도우 (exact 모드에서 추론 서비스에 넘길 원본 샘플 복사본)"""
+        self._ready = False
+        return self._window.astype(np.float32)
+
+    def drop_window(self):
+        """추론 대기열 포화로 분석하지 못한 윈도우 소비 (다음 hop에서 새 윈도우로 재개)"""
+        self._ready = False
+        self.windows_dropped += 1
+
+    # ------------------------------------------------------------------
+    # incremental 분석
+    # ------------------------------------------------------------------
+
+    def _window_magnitude(self):
+        """|STFT| 계산 - 이전 윈도우와 겹치는 내부 프레임은 캐시 재사용"""
+        engine = self._engine
+        n_fft, hop = engine.n_fft, engine.hop_length
+        pad = n_fft // 2
+        start = self._window_end - self.window_samples
+
+        # librosa.stft(center=True, pad_mode='constant')와 같은 0 패딩
+        self._padded[pad:pad + self.window_samples] = self._window
+
+        # 패딩 영역에 걸치는 가장자리 프레임은 윈도우마다 다르므로 항상 새로 계산
+        last_interior = (self.window_samples - pad) // hop
+        missing = []
+        for t in range(self._n_frames):
+            cached = self._frame_cache.get(start + t * hop) if pad <= t * hop and t <= last_interior else None
+            if cached is None:
+                missing.append(t)
+            else:
+                self._magnitude[:, t] = cached
+        self.frames_reused += self._n_frames - len(missing)
+        self.frames_computed += len(missing)
+
+        # 연속 구간 단위로 center=False STFT 계산
+        run_start = 0
+        for i in range(1, len(missing) + 1):
+            if i == len(missing) or missing[i] != missing[i - 1] + 1:
+                t0, t1 = missing[run_start], missing[i - 1]
+                segment = self._padded[t0 * hop:t1 * hop + n_fft]
+                self._magnitude[:, t0:t1 + 1] = np.abs(
+                    librosa.stft(segment, n_fft=n_fft, hop_length=hop, center=False)
+                )
+                run_start = i
+
+        # 다음 윈도우에서 쓸 내부 프레임만 남김
+        next_start = start + self.hop_samples
+        self._frame_cache = {
+            start + t * hop: self._magnitude[:, t].copy()
+            for t in range(self._n_frames)
+            if pad <= t * hop and t <= last_interior and start + t * hop >= next_start
+        }
+        return self._magnitude
+
+    def analyze(self, bias=None):
+        """
+        준비된 윈도우를 incremental 방식으로 분석
+
+        Returns:
+        --------
+        dict : CryClassifier.predict_with_confidence와 같은 형식 (준비된 윈도우가 없으면 None)
+        """
+        gated = self.gate_result()
+        if gated is not None:
+            return gated
+        if not self._ready:
+            return None
+        self._ready = False
+
+        y = self._window
+        magnitude = self._window_magnitude()
+
+        # RMS 정규화는 선형 스케일이므로 스펙트럼에 이득을 곱해 동일하게 적용
+        rms = np.sqrt(np.mean(y ** 2))
+        gain = 0.1 / rms if rms > 0 else 1.0
+        spectra = self._engine.spectra_from_magnitude(magnitude * gain)
+        features = self._engine.extract(y * gain, spectra=spectra)
+
+        self.windows_analyzed += 1
+        return self.classifier.predict_from_features(features, bias=bias)
+
+    # ------------------------------------------------------------------
+    # 상태 변화 감지
+    # ------------------------------------------------------------------
+
+    def update_state(self, result):
+        """
+        윈도우 분석 결과로 상태 갱신
+
+        Returns:
+        --------
+        dict or None : 예측 라벨이 바뀌었을 때만 전송할 이벤트
+        """
+        prediction = result.get('prediction')
+        if prediction == 'error' or prediction == self.state:
+            return None
+
+        previous, self.state = self.state, prediction
+        return {
+            "type": "analysis_result",
+            "prediction": prediction,
+            "previous": previous,
+            "confidence": result.get('confidence'),
+            "severity": result.get('severity'),
+            "window_end_sec": round(self._window_end / self.sample_rate, 3),
+        }
+
+    def get_stats(self):
+        return {
+            "mode": self.mode,
+            "window_samples": self.window_samples,
+            "hop_samples": self.hop_samples,
+            "windows_analyzed": self.windows_analyzed,
+            "windows_dropped": self.windows_dropped,
+            "frames_computed": self.frames_computed,
+            "frames_reused": self.frames_reused,
+        }
@@ -0,0 +1,19 @@
+"""
+✅ 민감도 / 임계값 기본값
+- 분류기(scipy / sklearn)를 import하지 않고도 API가 입력 검증에 쓸 수 있도록 분리
+"""
+
+# 민감도 모드 (cascade_thresholds 키)
+SENSITIVITY_MODES = ('high', 'balanced', 'precise')
+
+# 임계값 파일이 없을 때 기본값
+DEFAULT_THRESHOLDS = {
+    'pain_threshold_primary': 0.5,
+    'cascade_thresholds': {
+        'high': 0.25,
+        'balanced': 0.365,
+        'precise': 0.50
+    },
+    'confidence_threshold_low': 0.4,
+    'confidence_threshold_high': 0.7
+}
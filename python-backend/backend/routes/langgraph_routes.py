@@ -17,40 +17,19 @@ from datetime import datetime
 import shutil
 import os
 import traceback
+import importlib.util
+from typing import TypedDict, Literal
 
-# ========================================
-# 기존 워크플로우 (레거시)
-# ========================================
-try:
-    from backend.agents.workflow import run_cry_analysis as run_legacy_workflow
-    LEGACY_AVAILABLE = True
-except ImportError as e:
-    print(f"⚠️ Legacy workflow를 찾을 수 없습니다: {e}")
-    LEGACY_AVAILABLE = False
+# ✅ langgraph / 에이전트(openai, 분류기) / 레거시 워크플로우는 처음 사용할 때 import
+#    (라우터 등록만으로 서버 시작 시간이 늘지 않도록)
 
 # ========================================
 # ✅ 진짜 LangGraph 워크플로우 (NEW!)
 # ========================================
-try:
-    from langgraph.graph import StateGraph, END
-    from typing import TypedDict, Literal
-    LANGGRAPH_AVAILABLE = True
-    print("✅ LangGraph (StateGraph) 사용 가능!")
-except ImportError as e:
-    print(f"⚠️ LangGraph를 찾을 수 없습니다: {e}")
+LANGGRAPH_AVAILABLE = importlib.util.find_spec("langgraph") is not None
+if not LANGGRAPH_AVAILABLE:
+    print("⚠️ LangGraph를 찾을 수 없습니다")
     print("   pip install langgraph 실행 필요")
-    LANGGRAPH_AVAILABLE = False
-
-# 에이전트 import
-try:
-    from backend.agents.cry_classification_agent import CryClassificationAgent
-    from backend.agents.parenting_advice_agent import ParentingAdviceAgent
-    from backend.agents.music_recommendation_agent import MusicRecommendationAgent
-    from backend.agents.notification_agent import NotificationAgent
-    AGENTS_AVAILABLE = True
-except ImportError as e:
-    print(f"⚠️ 에이전트를 찾을 수 없습니다: {e}")
-    AGENTS_AVAILABLE = False
 
 # FastAPI Router 생성
 router = APIRouter(prefix="/api/v2", tags=["LangGraph Workflow v2"])
@@ -61,19 +40,56 @@ _advice_agent = None
 _music_agent = None
 _notification_agent = None
 _langgraph_app = None
+_agent_classes = None
+_legacy_workflow = None
+
+
+def get_agent_classes():
+    """에이전트 클래스 (첫 호출에서 import, 실패하면 None)"""
+    global _agent_classes
+    
+    if _agent_classes is None:
+        try:
+            from backend.agents.cry_classification_agent import CryClassificationAgent
+            from backend.agents.parenting_advice_agent import ParentingAdviceAgent
+            from backend.agents.music_recommendation_agent import MusicRecommendationAgent
+            from backend.agents.notification_agent import NotificationAgent
+            _agent_classes = (CryClassificationAgent, ParentingAdviceAgent, MusicRecommendationAgent, NotificationAgent)
+        except ImportError as e:
+            print(f"⚠️ 에이전트를 찾을 수 없습니다: {e}")
+            _agent_classes = False
+    
+    return _agent_classes or None
+
+
+def get_legacy_workflow():
+    """기존 워크플로우 함수 (첫 호출에서 import, 없으면 None)"""
+    global _legacy_workflow
+    
+    if _legacy_workflow is None:
+        try:
+            from backend.agents.workflow import run_cry_analysis
+            _legacy_workflow = run_cry_analysis
+        except ImportError as e:
+            print(f"⚠️ Legacy workflow를 찾을 수 없습니다: {e}")
+            _legacy_workflow = False
+    
+    return _legacy_workflow or None
 
 
 def get_agents():
     """에이전트 싱글톤 - 지연 로딩"""
     global _classification_agent, _advice_agent, _music_agent, _notification_agent
     
-    if not AGENTS_AVAILABLE:
+    agent_classes = get_agent_classes()
+    if agent_classes is None:
         raise HTTPException(
             status_code=503,
             detail="Agents not available. Please check agent files."
         )
     
     if _classification_agent is None:
+        CryClassificationAgent, ParentingAdviceAgent, MusicRecommendationAgent, NotificationAgent = agent_classes
         print("🤖 Initializing agents...")
         _classification_agent = CryClassificationAgent()
         _advice_agent = ParentingAdviceAgent()
@@ -297,6 +313,7 @@ if LANGGRAPH_AVAILABLE:
             return _langgraph_app
         
         print("🔨 Building LangGraph workflow...")
+        from langgraph.graph import StateGraph, END
         
         workflow = StateGraph(CryAnalysisState)
         
@@ -388,7 +405,7 @@ async def analyze_cry_with_real_langgraph(
                 }
             )
         
-        if not AGENTS_AVAILABLE:
+        if get_agent_classes() is None:
             raise HTTPException(
                 status_code=503,
                 detail="Agents not available"
@@ -613,7 +630,8 @@ async def analyze_cry_legacy(
     """
     temp_file = None
     try:
-        if not LEGACY_AVAILABLE:
+        run_legacy_workflow = get_legacy_workflow()
+        if run_legacy_workflow is None:
             raise HTTPException(
                 status_code=503,
                 detail="Legacy workflow not available"
@@ -737,16 +755,17 @@ async def get_advice_only(
 @router.get("/workflow-status")
 async def get_workflow_status():
     """📊 워크플로우 상태 확인"""
+    legacy_available = get_legacy_workflow() is not None
     return {
-        "legacy_available": LEGACY_AVAILABLE,
+        "legacy_available": legacy_available,
         "langgraph_available": LANGGRAPH_AVAILABLE,
-        "agents_available": AGENTS_AVAILABLE,
+        "agents_available": get_agent_classes() is not None,
         "recommended_endpoint": "/api/v2/langgraph/analyze-cry" if LANGGRAPH_AVAILABLE else "/api/v2/analyze-cry",
         "versions": {
             "v1_legacy": {
                 "endpoint": "/api/v2/analyze-cry",
                 "engine": "sequential_pipeline",
-                "available": LEGACY_AVAILABLE
+                "available": legacy_available
             },
             "v2_langgraph": {
                 "endpoint": "/api/v2/langgraph/analyze-cry",
@@ -779,7 +798,7 @@ async def test_system():
             "success": True,
             "message": "All systems operational",
             "langgraph_available": LANGGRAPH_AVAILABLE,
-            "legacy_available": LEGACY_AVAILABLE,
+            "legacy_available": get_legacy_workflow() is not None,
             "agents": {
                 "classification": str(type(classification_agent)),
                 "advice": str(type(advice_agent)),
@@ -1,6 +1,7 @@
 """
 Chatbot Service - ChatGPT API 통합
 """
+import asyncio
 import os
 import uuid
 from datetime import datetime
@@ -8,7 +9,7 @@ from typing import List, Dict, Optional
 from openai import OpenAI
 
 try:
-    from backend.utils.storage_manager import get_storage_manager
+    from backend.utils.storage_manager import get_storage_manager, get_async_storage_manager
     STORAGE_AVAILABLE = True
 except ImportError:
     STORAGE_AVAILABLE = False
@@ -35,10 +36,37 @@ class ChatbotService:
     ) -> Dict:
         """챗봇 응답 생성"""
         
-        conversation_id = str(uuid.uuid4())
-        
         # 시스템 프롬프트
         system_prompt = self._build_system_prompt(infant_id)
+        messages = self._build_messages(system_prompt, user_message, conversation_history)
+        return self._complete(messages, user_message)
+    
+    async def generate_response_async(
+        self,
+        infant_id: int,
+        guardian_id: int,
+        user_message: str,
+        conversation_history: List[Dict] = None
+    ) -> Dict:
+        """
+        챗봇 응답 생성 (FastAPI 핸들러용)
+        
+        아기 컨텍스트 조회(울음 히스토리 + 조치 통계)는 DB 스레드 풀에서 동시에,
+        ChatGPT 호출은 워커 스레드에서 실행해 이벤트 루프를 막지 않습니다.
+        """
+        context = None
+        if STORAGE_AVAILABLE:
+            try:
+                context = await self._get_infant_context_async(infant_id)
+            except Exception as e:
+                print(f"아기 컨텍스트 로드 실패: {e}")
+        
+        system_prompt = self._format_system_prompt(context)
+        messages = self._build_messages(system_prompt, user_message, conversation_history)
+        return await asyncio.to_thread(self._complete, messages, user_message)
+    
+    def _build_messages(self, system_prompt: str, user_message: str, conversation_history: List[Dict] = None) -> List[Dict]:
+        """시스템 프롬프트 + 최근 대화 + 현재 메시지"""
         
         # 메시지 히스토리 구성
         messages = [
@@ -57,6 +85,12 @@ class ChatbotService:
             "role": "user",
             "content": user_message
         })
+        return messages
+    
+    def _complete(self, messages: List[Dict], user_message: str) -> Dict:
+        """ChatGPT 호출 + 긴급도 분석"""
+        
+        conversation_id = str(uuid.uuid4())
         
         try:
             # ChatGPT API 호출
@@ -86,6 +120,18 @@ class ChatbotService:
     def _build_system_prompt(self, infant_id: int) -> str:
         """시스템 프롬프트 생성"""
         
+        context = None
+        if STORAGE_AVAILABLE:
+            try:
+                context = self._get_infant_context(infant_id)
+            except Exception as e:
+                print(f"아기 컨텍스트 로드 실패: {e}")
+        
+        return self._format_system_prompt(context)
+    
+    def _format_system_prompt(self, context: Optional[Dict]) -> str:
+        """기본 프롬프트 + 아기 컨텍스트 (없으면 기본 프롬프트만)"""
+        
         base_prompt = """당신은 전문 소아과 간호사이자 육아 전문가입니다.
 보호자들에게 다음과 같은 도움을 제공합니다:
 
@@ -108,11 +154,8 @@ class ChatbotService:
 """
         
         # 아기 데이터 추가
-        if STORAGE_AVAILABLE:
-            try:
-                context = self._get_infant_context(infant_id)
-                if context:
-                    base_prompt += f"""
+        if context:
+            base_prompt += f"""
 
 **현재 상담 중인 아기 정보:**
 - 월령: {context.get('age_months', '알 수 없음')}개월
@@ -123,8 +166,6 @@ class ChatbotService:
 
 위 데이터를 참고하여 맞춤형 조언을 제공하세요.
 """
-            except Exception as e:
-                print(f"아기 컨텍스트 로드 실패: {e}")
         
         return base_prompt
     
@@ -139,14 +180,6 @@ class ChatbotService:
             if not history:
                 return None
             
-            # 울음 원인별 카운트
-            cry_counts = {}
-            for event in history:
-                reason = event.get('reason', 'unknown')
-                cry_counts[reason] = cry_counts.get(reason, 0) + 1
-            
-            most_common = max(cry_counts, key=cry_counts.get) if cry_counts else 'unknown'
-            
             # 2) 최근 조치 통계 (action_log 기반)
             #    최근 7일 동안의 조치 집계
             action_stats = {}
@@ -156,32 +189,65 @@ class ChatbotService:
                 print(f"조치 통계 수집 실패: {e}")
                 action_stats = {}
             
-            # 조치 패턴을 간단한 문자열로 요약 (챗봇 프롬프트에 넣기 좋게)
-            action_summaries = []
-            for cry_type, actions in action_stats.items():
-                if not actions:
-                    continue
-                top_action = actions[0]  # 성공률/횟수 기준 상위 1개
-                rate = int(top_action["success_rate"] * 100)
-                action_summaries.append(
-                    f"- {cry_type} 울음일 때 자주 사용된 조치: "
-                    f"\"{top_action['detail']}\" (시행 {top_action['trials']}회, 성공률 {rate}%)"
-                )
-            
-            action_patterns_text = "\n".join(action_summaries) if action_summaries else "최근 7일 간 기록된 조치 데이터가 충분하지 않습니다."
-            
-            return {
-                'age_months': 'N/A',  # 나중에 DB에서 가져오면 교체
-                'cry_patterns': f"{most_common} ({cry_counts.get(most_common, 0)}회)",
-                'cry_counts': cry_counts,
-                'action_patterns_text': action_patterns_text,
-                'raw_action_stats': action_stats,
-            }
+            return self._summarize_context(history, action_stats)
             
         except Exception as e:
             print(f"컨텍스트 수집 실패: {e}")
             return None
     
+    async def _get_infant_context_async(self, infant_id: int) -> Optional[Dict]:
+        """_get_infant_context의 async 버전 - 두 조회를 DB 스레드 풀에서 동시에 실행"""
+        storage = get_async_storage_manager()
+        history, action_stats = await asyncio.gather(
+            storage.get_history(infant_id, limit=50),
+            storage.get_action_stats(infant_id, days=7),
+            return_exceptions=True
+        )
+        
+        if isinstance(history, Exception):
+            print(f"컨텍스트 수집 실패: {history}")
+            return None
+        if not history:
+            return None
+        if isinstance(action_stats, Exception):
+            print(f"조치 통계 수집 실패: {action_stats}")
+            action_stats = {}
+        
+        return self._summarize_context(history, action_stats)
+    
+    def _summarize_context(self, history: List[Dict], action_stats: Dict) -> Dict:
+        """울음 히스토리 + 조치 통계 → 프롬프트용 컨텍스트"""
+        
+        # 울음 원인별 카운트
+        cry_counts = {}
+        for event in history:
+            reason = event.get('reason', 'unknown')
+            cry_counts[reason] = cry_counts.get(reason, 0) + 1
+        
+        most_common = max(cry_counts, key=cry_counts.get) if cry_counts else 'unknown'
+        
+        # 조치 패턴을 간단한 문자열로 요약 (챗봇 프롬프트에 넣기 좋게)
+        action_summaries = []
+        for cry_type, actions in action_stats.items():
+            if not actions:
+                continue
+            top_action = actions[0]  # 성공률/횟수 기준 상위 1개
+            rate = int(top_action["success_rate"] * 100)
+            action_summaries.append(
+                f"- {cry_type} 울음일 때 자주 사용된 조치: "
+                f"\"{top_action['detail']}\" (시행 {top_action['trials']}회, 성공률 {rate}%)"
+            )
+        
+        action_patterns_text = "\n".join(action_summaries) if action_summaries else "최근 7일 간 기록된 조치 데이터가 충분하지 않습니다."
+        
+        return {
+            'age_months': 'N/A',  # 나중에 DB에서 가져오면 교체
+            'cry_patterns': f"{most_common} ({cry_counts.get(most_common, 0)}회)",
+            'cry_counts': cry_counts,
+            'action_patterns_text': action_patterns_text,
+            'raw_action_stats': action_stats,
+        }
+    
     def _analyze_response(self, user_msg: str, response: str) -> tuple:
         """응답에서 긴급도와 제안 액션 추출"""
         urgency = "low"
@@ -0,0 +1,493 @@
+"""
+Inference Service - 울음 분류 작업을 이벤트 루프 밖(프로세스 풀)에서 실행
+
+- 워커 프로세스마다 baby_cry_v15_1_* 모델을 한 번만 로드
+- async 엔드포인트는 결과를 await (이벤트 루프 블로킹 없음)
+- 대기열 한도를 넘으면 InferenceBusyError → API에서 429 + Retry-After 응답
+- WebSocket incremental 윈도우는 연결별 상태를 쓰므로 메인 프로세스의 별도 bounded 스레드 풀에서 실행
+  (STREAM_ANALYSIS_WORKERS / STREAM_MAX_PENDING, 넘치면 같은 InferenceBusyError로 윈도우 건너뜀)
+- warmup: 시작 시 모든 워커에서 디코딩 → 특징 추출 → 캐스케이드 → Voice ID 경로를 한 번씩 실행
+- swap_model: 새 모델 버전용 풀을 백그라운드에서 띄워 canary 배치로 검증한 뒤 교체
+  (진행 중인 작업은 이전 풀에서 끝까지 처리, 결과마다 처리한 model_version 표시)
+"""
+
+import asyncio
+import io
+import math
+import multiprocessing
+import os
+import threading
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from backend.models.registry import get_model_catalog, get_model_registry, version_label
+from backend.utils.audio import DecodedAudio
+
+logger = logging.getLogger(__name__)
+
+# 프로젝트 루트 (backend/services/inference_service.py 기준 3단계 위)
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+DEFAULT_MODEL_PATH = PROJECT_ROOT / 'models' / 'baby_cry_v15_1_detector.pkl'
+
+
+class ModelDeployError(Exception):
+    """새 모델 버전 로드 / canary 검증 실패 (기존 모델은 그대로 서빙)"""
+
+
+class InferenceBusyError(Exception):
+    """추론 대기열이 가득 찬 경우 (클라이언트는 retry_after초 후 재시도)"""
+
+    def __init__(self, retry_after=1):
+        super().__init__(f"Inference queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+# ====================================================================
+# 워커 측 함수 (프로세스 풀에서 pickle되어 실행되므로 모듈 최상위에 정의)
+# ====================================================================
+
+# 워커별 분류기 (프로세스 모드는 프로세스당 1개, 스레드 모드는 모델 교체 중 이전 / 새 풀의
+# 워커 스레드가 한 프로세스에 공존하므로 스레드별로 보관)
+_worker = threading.local()
+
+
+def _init_worker(model_path, sensitivity, feature_profile='exact', model_version=None):
+    """워커 시작 시 모델을 한 번만 로드 (스레드 모드에서는 API / 에이전트와 같은 레지스트리 항목 공유)"""
+    _worker.classifier = get_model_registry().acquire(
+        model_path, sensitivity=sensitivity, feature_profile=feature_profile, model_version=model_version
+    )
+
+
+def _release_worker_job():
+    """스레드 모드 풀 교체 시 이전 풀의 레지스트리 참조 반환 (마지막 작업으로 실행)"""
+    classifier = getattr(_worker, 'classifier', None)
+    if classifier is not None:
+        get_model_registry().release(classifier)
+        _worker.classifier = None
+
+
+def _tag_version(result, classifier):
+    result['model_version'] = classifier.model_version
+    return result
+
+
+def _predict_job(source, bias, sensitivity):
+    # 민감도는 호출별 인자 (공유 분류기 상태를 바꾸지 않으므로 작업 순서와 무관)
+    classifier = _worker.classifier
+    return _tag_version(classifier.predict_batch([source], biases=[bias], sensitivity=sensitivity)[0], classifier)
+
+
+def _voice_profile_job(source):
+    return _worker.classifier.extract_voice_profile(source)
+
+
+def _decode_upload_job(audio_bytes, target_sr, duration):
+    """
+    업로드 바이트 디코딩만 수행 (bias 조회를 기다리지 않고 바로 시작)
+
+    IPC 크기를 줄이기 위해 원본 전체 대신 분류/음색 분석에 쓰이는
+    target_sr·앞 duration초 구간만 DecodedAudio로 돌려보냅니다.
+    """
+    decoded_audio = DecodedAudio.from_bytes(audio_bytes)
+    model_input = DecodedAudio(decoded_audio.resampled(target_sr, duration), target_sr)
+    return {
+        'audio': model_input,
+        'duration_ms': decoded_audio.duration_ms,
+        'sample_rate': decoded_audio.sample_rate,
+    }
+
+
+def _analyze_upload_job(audio_bytes, fallback_path, bias, sensitivity):
+    """업로드 1건: 1회 디코딩 → 분류 + Voice ID + 메타정보"""
+    classifier = _worker.classifier
+    try:
+        decoded_audio = DecodedAudio.from_bytes(audio_bytes, fallback_path=fallback_path)
+    except Exception as e:
+        print(f"⚠️ 오디오 디코딩 실패: {e}")
+        decoded_audio = None
+    source = decoded_audio if decoded_audio is not None else fallback_path
+
+    return {
+        'result': _tag_version(classifier.predict_batch([source], biases=[bias], sensitivity=sensitivity)[0], classifier),
+        'voice_profile': classifier.extract_voice_profile(source),
+        'duration_ms': decoded_audio.duration_ms if decoded_audio is not None else None,
+        'sample_rate': decoded_audio.sample_rate if decoded_audio is not None else None,
+    }
+
+
+def _classify_file_job(audio_path, sensitivity):
+    """에이전트용: 파일 1회 디코딩 → 분류 결과 + 오디오 길이"""
+    classifier = _worker.classifier
+    decoded_audio = DecodedAudio.from_path(audio_path)
+    return {
+        'result': _tag_version(classifier.predict_with_confidence(decoded_audio, sensitivity=sensitivity), classifier),
+        'audio_duration': decoded_audio.duration,
+    }
+
+
+def _canary_clips(sr=22050, duration=3.0):
+    """
+    canary 배치용 합성 클립 (무음 / 백색 잡음 / 울음 대역 배음)
+
+    MODEL_CANARY_DIR에 오디오 파일이 있으면 함께 사용합니다.
+    """
+    t = np.arange(int(sr * duration)) / sr
+    rng = np.random.default_rng(0)
+    harmonic = sum(np.sin(2 * np.pi * 450 * k * t) / k for k in range(1, 6)) * (0.6 + 0.4 * np.sin(2 * np.pi * 1.5 * t))
+    clips = [
+        (np.zeros_like(t, dtype=np.float32), sr),
+        ((0.1 * rng.standard_normal(t.size)).astype(np.float32), sr),
+        ((0.2 * harmonic).astype(np.float32), sr),
+    ]
+    canary_dir = os.getenv('MODEL_CANARY_DIR')
+    if canary_dir and Path(canary_dir).is_dir():
+        clips += sorted(str(p) for p in Path(canary_dir).iterdir() if p.suffix.lower() in ('.wav', '.flac', '.ogg', '.mp3'))
+    return clips
+
+
+def _warmup_job(sample_rate):
+    """
+    실제 업로드와 같은 경로를 한 번 실행 (WAV 바이트 디코딩 → 리샘플링 → 특징 → 캐스케이드 → Voice ID)
+
+    librosa의 numba 함수 컴파일 / sklearn 초기화 비용을 첫 요청 대신 여기서 치릅니다.
+    디스크 특징 캐시가 켜져 있어도 워커마다 실제로 계산하도록 pid로 잡음 시드를 다르게 함
+    → (pid, 소요 시간 ms)
+    """
+    import soundfile as sf
+
+    started = time.perf_counter()
+    y, _ = _canary_clips(sample_rate)[2]
+    y = y + 0.01 * np.random.default_rng(os.getpid()).standard_normal(y.size).astype(np.float32)
+    buffer = io.BytesIO()
+    sf.write(buffer, y, sample_rate, format='WAV', subtype='PCM_16')
+
+    decoded_audio = DecodedAudio.from_bytes(buffer.getvalue())
+    source = DecodedAudio(decoded_audio.resampled(22050, 3.0), 22050)
+    classifier = _worker.classifier
+    classifier.predict_batch([source])
+    classifier.extract_voice_profile(source)
+    return os.getpid(), round((time.perf_counter() - started) * 1000, 1)
+
+
+def _canary_job():
+    """새 풀의 워커에서 canary 배치 실행 → (pid, model_version, 결과 리스트)"""
+    classifier = _worker.classifier
+    return os.getpid(), classifier.model_version, classifier.predict_batch(_canary_clips())
+
+
+# ====================================================================
+# 메인 프로세스 측 서비스
+# ====================================================================
+
+class InferenceService:
+    """
+    분류 작업용 bounded 실행기
+
+    INFERENCE_WORKERS=0 이면 프로세스 대신 단일 스레드에서 실행합니다
+    (Windows 개발 환경 등 프로세스 풀이 부담스러운 경우).
+    """
+
+    def __init__(self, model_path=None, sensitivity=None, workers=None, max_pending=None, feature_profile=None,
+                 model_version=None):
+        self.model_path = str(model_path or DEFAULT_MODEL_PATH)
+        self.model_version = model_version or version_label(self.model_path)
+        self.sensitivity = sensitivity or os.getenv('CRY_SENSITIVITY', 'balanced')
+        self.feature_profile = feature_profile or os.getenv('CRY_FEATURE_PROFILE', 'exact')
+        self.workers = int(workers if workers is not None else os.getenv('INFERENCE_WORKERS', '2'))
+        default_pending = max(1, self.workers) * 4
+        self.max_pending = int(max_pending if max_pending is not None else os.getenv('INFERENCE_MAX_PENDING', default_pending))
+
+        self._executor = self._create_executor(self.model_path, self.model_version)
+        # WebSocket incremental 분석용 스레드 풀 (첫 윈도우에서 생성)
+        self.stream_workers = max(1, int(os.getenv('STREAM_ANALYSIS_WORKERS', '2')))
+        self.stream_max_pending = int(os.getenv('STREAM_MAX_PENDING', self.stream_workers * 2))
+        self._stream_executor = None
+        self._swap_lock = asyncio.Lock()
+        self._draining = set()
+        self._swaps = 0
+
+        # 통계 (이벤트 루프 스레드에서만 갱신)
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._failed = 0
+        self._avg_job_ms = 0.0
+        self._stream_pending = 0
+        self._stream_completed = 0
+        self._stream_rejected = 0
+
+        logger.info(
+            f"🧠 InferenceService initialized (workers={self.workers}, max_pending={self.max_pending})"
+        )
+
+    def _create_executor(self, model_path, model_version):
+        initargs = (model_path, self.sensitivity, self.feature_profile, model_version)
+        if self.workers > 0:
+            # uvicorn 스레드와 fork가 섞이지 않도록 spawn 사용
+            return ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=initargs,
+            )
+        return ThreadPoolExecutor(max_workers=1, initializer=_init_worker, initargs=initargs)
+
+    def _retire_executor(self, executor):
+        """이전 풀 정리: 이미 제출된 작업이 모두 끝날 때까지 기다린 뒤 종료 (워커 스레드에서 호출)"""
+        if self.workers == 0:
+            # 스레드 모드는 레지스트리 참조를 직접 반환해야 이전 모델이 언로드됨 (대기열 마지막에 실행)
+            try:
+                executor.submit(_release_worker_job)
+            except RuntimeError:
+                pass  # 초기화 실패로 깨진 풀 (반환할 참조 없음)
+        executor.shutdown(wait=True)
+
+    async def _run_canary(self, executor, model_version, timeout):
+        """
+        새 풀의 모든 워커에서 canary 배치 실행 (모델 로드 + 워밍업 + 결과 검증)
+
+        Returns:
+        --------
+        dict : { 'workers': 응답한 워커 수, 'clips': 클립 수, 'predictions': 첫 워커의 예측 리스트 }
+        """
+        loop = asyncio.get_running_loop()
+        # 워커 수만큼 동시에 제출해야 프로세스 풀이 모든 워커를 띄움
+        jobs = [loop.run_in_executor(executor, _canary_job) for _ in range(max(1, self.workers))]
+        outputs = await asyncio.wait_for(asyncio.gather(*jobs), timeout=timeout)
+
+        for pid, worker_version, results in outputs:
+            if worker_version != model_version:
+                raise ModelDeployError(f"Worker {pid} loaded {worker_version}, expected {model_version}")
+            for result in results:
+                confidence = result.get('confidence')
+                if result.get('prediction') in (None, 'error') or confidence is None or not 0.0 <= confidence <= 1.0:
+                    raise ModelDeployError(f"Canary prediction failed on worker {pid}: {result}")
+        return {
+            'workers': len({pid for pid, _, _ in outputs}),
+            'clips': len(outputs[0][2]),
+            'predictions': [result['prediction'] for result in outputs[0][2]],
+        }
+
+    async def swap_model(self, model_path, model_version=None, canary_timeout=None):
+        """
+        무중단 모델 교체
+
+        1) 새 모델 경로로 새 풀 생성 → 2) canary 배치로 전 워커 로드 + 검증
+        3) 실행기 참조를 교체 (이후 제출되는 작업부터 새 모델)
+        4) 이전 풀은 진행 중인 작업을 마친 뒤 백그라운드에서 종료
+
+        검증에 실패하면 새 풀만 정리하고 ModelDeployError (기존 모델은 그대로 서빙)
+
+        Returns:
+        --------
+        dict : { 'model_version', 'previous_version', 'load_ms', 'canary' }
+        """
+        model_path = str(model_path)
+        model_version = model_version or version_label(model_path)
+        timeout = float(canary_timeout or os.getenv('MODEL_CANARY_TIMEOUT', '120'))
+
+        async with self._swap_lock:
+            started = time.perf_counter()
+            executor = self._create_executor(model_path, model_version)
+            try:
+                canary = await self._run_canary(executor, model_version, timeout)
+            except Exception as e:
+                await asyncio.to_thread(self._retire_executor, executor)
+                if isinstance(e, ModelDeployError):
+                    raise
+                raise ModelDeployError(f"Failed to load {model_version} from {model_path}: {e!r}") from e
+
+            # 이벤트 루프 스레드에서 참조만 바꾸므로 제출 중인 요청과 경합 없음
+            previous, previous_version = self._executor, self.model_version
+            self._executor = executor
+            self.model_path = model_path
+            self.model_version = model_version
+            self._swaps += 1
+
+            drain = asyncio.create_task(asyncio.to_thread(self._retire_executor, previous))
+            self._draining.add(drain)
+            drain.add_done_callback(self._draining.discard)
+
+            load_ms = round((time.perf_counter() - started) * 1000, 1)
+            logger.info(f"🔁 Inference model swapped: {previous_version} → {model_version} ({load_ms}ms, canary={canary})")
+            return {
+                'model_version': model_version,
+                'previous_version': previous_version,
+                'load_ms': load_ms,
+                'canary': canary,
+            }
+
+    async def warmup(self, sample_rate=16000, max_rounds=3, timeout=None):
+        """
+        모든 워커에서 _warmup_job 실행 (프로세스 풀은 이때 워커를 띄우고 모델을 로드)
+
+        한 라운드에 워커 수만큼 동시에 제출하고, 아직 작업을 받지 못한 워커가 있으면
+        (먼저 준비된 워커가 여러 개를 처리한 경우) 최대 max_rounds까지 반복합니다.
+
+        Returns:
+        --------
+        dict : { 'workers', 'workers_warmed', 'rounds', 'elapsed_ms', 'job_ms': { pid: 첫 작업 시간 } }
+        """
+        timeout = float(timeout or os.getenv('MODEL_CANARY_TIMEOUT', '120'))
+        workers = max(1, self.workers)
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        job_ms = {}
+        rounds = 0
+        while rounds < max_rounds and len(job_ms) < workers:
+            rounds += 1
+            jobs = [loop.run_in_executor(self._executor, _warmup_job, sample_rate) for _ in range(workers)]
+            for pid, elapsed_ms in await asyncio.wait_for(asyncio.gather(*jobs), timeout=timeout):
+                job_ms.setdefault(pid, elapsed_ms)
+        return {
+            'workers': workers,
+            'workers_warmed': len(job_ms),
+            'rounds': rounds,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+            'job_ms': job_ms,
+        }
+
+    def _retry_after(self):
+        """현재 대기열이 비워지는 데 걸릴 대략적인 시간 (초)"""
+        per_job = (self._avg_job_ms or 1000.0) / 1000.0
+        return max(1, math.ceil(per_job * self._pending / max(1, self.workers)))
+
+    def ensure_capacity(self):
+        """대기열이 가득 찼으면 InferenceBusyError (파일 저장 등 선행 작업 전 빠른 거절용)"""
+        if self._pending >= self.max_pending:
+            self._rejected += 1
+            raise InferenceBusyError(self._retry_after())
+
+    async def _submit(self, fn, *args):
+        self.ensure_capacity()
+        self._pending += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._executor, fn, *args)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            # 지수 이동 평균으로 작업 시간 추정 (Retry-After 계산용)
+            self._avg_job_ms = elapsed_ms if not self._avg_job_ms else 0.8 * self._avg_job_ms + 0.2 * elapsed_ms
+            self._completed += 1
+            return result
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._pending -= 1
+
+    async def predict(self, source, bias=None, sensitivity=None):
+        """CryClassifier.predict_with_confidence와 동일한 결과 dict"""
+        return await self._submit(_predict_job, source, bias, sensitivity)
+
+    async def voice_profile(self, source):
+        return await self._submit(_voice_profile_job, source)
+
+    async def decode_upload(self, audio_bytes, target_sr=22050, duration=3.0):
+        """
+        업로드 바이트 디코딩 (메모리 내에서 읽을 수 없는 포맷이면 예외)
+
+        Returns:
+        --------
+        dict : { 'audio': DecodedAudio (predict / voice_profile 입력), 'duration_ms', 'sample_rate' }
+        """
+        return await self._submit(_decode_upload_job, audio_bytes, target_sr, duration)
+
+    async def analyze_upload(self, audio_bytes, fallback_path=None, bias=None, sensitivity=None):
+        """
+        업로드 바이트 분석
+
+        Returns:
+        --------
+        dict : { 'result', 'voice_profile', 'duration_ms', 'sample_rate' }
+               (디코딩 실패 시 duration_ms / sample_rate는 None)
+        """
+        return await self._submit(_analyze_upload_job, audio_bytes, fallback_path, bias, sensitivity)
+
+    async def classify_file(self, audio_path, sensitivity=None):
+        """Returns: { 'result', 'audio_duration' }"""
+        return await self._submit(_classify_file_job, str(audio_path), sensitivity)
+
+    async def analyze_stream(self, analyzer, bias=None):
+        """
+        WebSocket incremental 윈도우 분석 (StreamingCryAnalyzer.analyze)
+
+        분석기는 연결별 프레임 캐시 / 필터 상태를 가지므로 프로세스 풀로 보낼 수 없어
+        메인 프로세스의 bounded 스레드 풀에서 실행합니다. 대기 중인 윈도우가
+        STREAM_MAX_PENDING 이상이면 InferenceBusyError (exact 모드처럼 호출 측에서 윈도우를 건너뜀).
+        """
+        if self._stream_pending >= self.stream_max_pending:
+            self._stream_rejected += 1
+            raise InferenceBusyError(1)
+        if self._stream_executor is None:
+            self._stream_executor = ThreadPoolExecutor(
+                max_workers=self.stream_workers, thread_name_prefix='stream-analysis'
+            )
+
+        loop = asyncio.get_running_loop()
+
+        def _done(_):
+            # 연결이 끊겨 await가 취소돼도 스레드 작업이 끝날 때까지 대기열에 포함 (카운터는 루프 스레드에서 갱신)
+            try:
+                loop.call_soon_threadsafe(self._stream_job_done)
+            except RuntimeError:
+                pass  # 이벤트 루프 종료 후
+
+        future = self._stream_executor.submit(analyzer.analyze, bias)
+        self._stream_pending += 1
+        future.add_done_callback(_done)
+        return await asyncio.wrap_future(future)
+
+    def _stream_job_done(self):
+        self._stream_pending -= 1
+        self._stream_completed += 1
+
+    def get_stats(self):
+        return {
+            "mode": "process" if self.workers > 0 else "thread",
+            "workers": self.workers,
+            "feature_profile": self.feature_profile,
+            "model_version": self.model_version,
+            "swaps": self._swaps,
+            "draining_pools": len(self._draining),
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "avg_job_ms": round(self._avg_job_ms, 1),
+            "stream": {
+                "workers": self.stream_workers,
+                "pending": self._stream_pending,
+                "max_pending": self.stream_max_pending,
+                "completed": self._stream_completed,
+                "rejected": self._stream_rejected,
+            },
+        }
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+        if self._stream_executor is not None:
+            self._stream_executor.shutdown(wait=wait)
+
+
+# 싱글톤
+_inference_service = None
+
+
+def get_inference_service():
+    global _inference_service
+    if _inference_service is None:
+        # 활성 모델 버전은 카탈로그(models/model_versions.json)를 따름
+        catalog = get_model_catalog()
+        _inference_service = InferenceService(model_path=catalog.resolve(catalog.active), model_version=catalog.active)
+    return _inference_service
+
+
+def get_inference_stats():
+    """헬스 체크용 통계 (서비스가 아직 생성되지 않았으면 None)"""
+    return _inference_service.get_stats() if _inference_service is not None else None
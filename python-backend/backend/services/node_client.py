@@ -0,0 +1,269 @@
+"""
+Node Backend Client - Node 백엔드 호출용 비동기 HTTP 클라이언트
+
+- httpx.AsyncClient 하나를 공유 (keep-alive 커넥션 풀링)
+- 엔드포인트별 타임아웃
+- 응답을 기다릴 필요 없는 호출은 fire_and_forget()으로 백그라운드 실행
+- 피드백 통계 / 바이오 신호는 아기별 TTL 캐시 (stale-while-revalidate)
+"""
+
+import asyncio
+import logging
+import os
+import time
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# ✅ 모든 백엔드 통신 URL 통합 관리
+NODE_BACKEND_BASE = os.getenv("NODE_BACKEND_URL", "http://localhost:4000")
+
+NOTIFICATION_URL = f"{NODE_BACKEND_BASE}/api/analysis/result"
+EVENT_SAVE_URL = f"{NODE_BACKEND_BASE}/api/events/create"
+FEEDBACK_STATS_URL = f"{NODE_BACKEND_BASE}/api/analysis/feedback/stats"
+VITALS_URL = f"{NODE_BACKEND_BASE}/api/health/vitals"
+
+# 엔드포인트별 타임아웃 (조회는 짧게, 저장/알림은 기존 (3, 10) 유지)
+ENDPOINT_TIMEOUTS = {
+    "feedback_stats": httpx.Timeout(2.0),
+    "vitals": httpx.Timeout(2.0),
+    "event_save": httpx.Timeout(10.0, connect=3.0),
+    "notification": httpx.Timeout(10.0, connect=3.0),
+}
+
+
+# 아기별 조회 캐시 TTL (초)
+# - 피드백 통계: 부모가 피드백을 남길 때만 바뀌므로 길게
+# - 바이오 신호: 생명 안전 관련이므로 짧게, 오래된 값은 최대 max_stale까지만 사용
+LOOKUP_CACHE_POLICIES = {
+    "feedback_stats": {
+        "ttl": float(os.getenv("FEEDBACK_STATS_CACHE_TTL", "300")),
+        "max_stale": float(os.getenv("FEEDBACK_STATS_CACHE_MAX_STALE", "3600")),
+    },
+    "vitals": {
+        "ttl": float(os.getenv("VITALS_CACHE_TTL", "5")),
+        "max_stale": float(os.getenv("VITALS_CACHE_MAX_STALE", "30")),
+    },
+}
+
+
+class InfantLookupCache:
+    """
+    아기별(infant_id) Node 조회 결과 캐시
+
+    - TTL 이내: 캐시 값 반환 (hit)
+    - TTL 경과 ~ max_stale 이내: 캐시 값을 즉시 반환하고 백그라운드에서 갱신 (stale hit)
+    - 그 외: Node 호출을 기다림 (miss, 같은 키의 동시 요청은 한 번만 호출)
+
+    조회 실패(None)는 캐시하지 않으며, 백그라운드 갱신이 실패하면 기존 값을 유지합니다.
+    """
+
+    def __init__(self, policies=None):
+        self.policies = policies or LOOKUP_CACHE_POLICIES
+        self._entries = {}   # (kind, infant_id) -> (value, fetched_at)
+        self._inflight = {}  # (kind, infant_id) -> asyncio.Task
+        self._stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "refreshes": 0,
+            "refresh_failures": 0,
+            "invalidations": 0,
+        }
+
+    def _fetch(self, key, fetcher):
+        task = self._inflight.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.create_task(self._fetch_and_store(key, fetcher))
+            self._inflight[key] = task
+        return task
+
+    async def _fetch_and_store(self, key, fetcher):
+        fetched_at = time.monotonic()
+        try:
+            value = await fetcher()
+            # 조회 중에 invalidate된 경우 이전 시점의 값을 다시 넣지 않도록 확인
+            if value is not None and self._inflight.get(key) is asyncio.current_task():
+                self._entries[key] = (value, fetched_at)
+            return value
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+    async def _refresh(self, key, fetcher):
+        self._stats["refreshes"] += 1
+        try:
+            if await self._fetch(key, fetcher) is None:
+                self._stats["refresh_failures"] += 1
+        except Exception as e:
+            self._stats["refresh_failures"] += 1
+            logger.warning(f"⚠️ {key[0]} 백그라운드 갱신 실패: {e}")
+
+    async def get(self, kind, infant_id, fetcher, background=None):
+        """
+        Parameters:
+        -----------
+        fetcher : 인자 없는 코루틴 함수 (Node 조회, 실패 시 None)
+        background : callable, optional
+            stale 갱신 코루틴을 넘겨받아 백그라운드로 실행할 함수 (기본: asyncio.create_task)
+        """
+        key = (kind, infant_id)
+        policy = self.policies[kind]
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            value, fetched_at = entry
+            age = time.monotonic() - fetched_at
+            if age < policy["ttl"]:
+                self._stats["hits"] += 1
+                return value
+            if age < policy["ttl"] + policy["max_stale"]:
+                self._stats["stale_hits"] += 1
+                if key not in self._inflight:
+                    (background or asyncio.create_task)(self._refresh(key, fetcher))
+                return value
+
+        self._stats["misses"] += 1
+        # 요청이 취소되어도 같은 키를 기다리는 다른 요청의 조회는 계속되도록 shield
+        return await asyncio.shield(self._fetch(key, fetcher))
+
+    def invalidate(self, infant_id=None, kind=None):
+        """infant_id / kind 조건에 맞는 항목 삭제 (둘 다 None이면 전체). 삭제 개수 반환"""
+        keys = [
+            key for key in list(self._entries) + list(self._inflight)
+            if (kind is None or key[0] == kind) and (infant_id is None or key[1] == infant_id)
+        ]
+        removed = 0
+        for key in set(keys):
+            if self._entries.pop(key, None) is not None:
+                removed += 1
+            # 진행 중인 조회 결과는 저장되지 않도록 분리
+            self._inflight.pop(key, None)
+        self._stats["invalidations"] += 1
+        return removed
+
+    def get_stats(self):
+        lookups = self._stats["hits"] + self._stats["stale_hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "hit_rate": round((self._stats["hits"] + self._stats["stale_hits"]) / lookups, 3) if lookups else None,
+            "size": len(self._entries),
+            "ttl": {kind: policy["ttl"] for kind, policy in self.policies.items()},
+        }
+
+
+class NodeBackendClient:
+    """Node 백엔드 비동기 클라이언트 (프로세스 내 공유)"""
+
+    def __init__(self, max_connections=20, max_keepalive=10):
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=30.0,
+        )
+        self._client = None
+        self._client_loop = None
+        self._background_tasks = set()
+        self.cache = InfantLookupCache()
+
+    def _get_client(self):
+        # AsyncClient의 커넥션은 생성된 이벤트 루프에 묶이므로 루프별로 생성
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(limits=self._limits)
+            self._client_loop = loop
+        return self._client
+
+    async def _get_json(self, url, endpoint):
+        response = await self._get_client().get(url, timeout=ENDPOINT_TIMEOUTS[endpoint])
+        if response.status_code != 200:
+            logger.warning(f"⚠️ {endpoint} 조회 실패: {response.status_code}")
+            return None
+        return response.json()
+
+    async def get_feedback_stats(self, infant_id):
+        """개인화 바이어스용 피드백 통계 { 'tired': 3, ... } (캐시 경유, 실패 시 None)"""
+        return await self.cache.get(
+            "feedback_stats", infant_id,
+            lambda: self._fetch_feedback_stats(infant_id),
+            background=self.fire_and_forget,
+        )
+
+    async def get_vitals(self, infant_id):
+        """최신 바이오 신호 { 'heartRate', 'temperature', ... } (캐시 경유, 실패 시 None)"""
+        return await self.cache.get(
+            "vitals", infant_id,
+            lambda: self._fetch_vitals(infant_id),
+            background=self.fire_and_forget,
+        )
+
+    async def _fetch_feedback_stats(self, infant_id):
+        stats_url = f"{FEEDBACK_STATS_URL}/{infant_id}"
+        logger.info(f"🧬 [Personalization] Fetching bias stats: {stats_url}")
+        try:
+            data = await self._get_json(stats_url, "feedback_stats")
+            return data.get("stats") if data else None
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to fetch bias stats: {e}")
+            return None
+
+    async def _fetch_vitals(self, infant_id):
+        vital_url = f"{VITALS_URL}/{infant_id}"
+        logger.info(f"💓 [Bio-Signal] Checking vitals: {vital_url}")
+        try:
+            data = await self._get_json(vital_url, "vitals")
+            return data.get("vitals", {}) if data else None
+        except Exception as e:
+            logger.warning(f"⚠️ [Bio-Signal] Failed to fetch vitals: {e}")
+            return None
+
+    async def save_event(self, payload):
+        """이벤트 저장 → event_id (실패 시 None)"""
+        logger.info(f"💾 이벤트 저장 요청: {EVENT_SAVE_URL}")
+        response = await self._get_client().post(
+            EVENT_SAVE_URL, json=payload, timeout=ENDPOINT_TIMEOUTS["event_save"]
+        )
+        if response.status_code != 200:
+            logger.error(f"❌ 이벤트 저장 실패: {response.status_code}, 응답: {response.text}")
+            return None
+        return response.json().get("event_id")
+
+    async def notify(self, payload):
+        """분석 결과 알림 전송 (HTTP 오류는 예외로 전달)"""
+        logger.info(f"📨 Node 알림 서버 호출: {NOTIFICATION_URL}")
+        response = await self._get_client().post(
+            NOTIFICATION_URL, json=payload, timeout=ENDPOINT_TIMEOUTS["notification"]
+        )
+        response.raise_for_status()
+        logger.info(f"✅ Node 응답 코드: {response.status_code}")
+
+    def fire_and_forget(self, coro):
+        """응답을 기다리지 않는 백그라운드 호출 (태스크 참조를 유지해 GC로 취소되지 않도록)"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    async def aclose(self):
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# 싱글톤
+_node_client = None
+
+
+def get_node_client():
+    global _node_client
+    if _node_client is None:
+        _node_client = NodeBackendClient()
+    return _node_client
+
+
+def get_lookup_cache_stats():
+    """헬스 체크용 캐시 통계 (클라이언트가 아직 생성되지 않았으면 None)"""
+    return _node_client.cache.get_stats() if _node_client is not None else None
@@ -0,0 +1,120 @@
+"""
+Warmup Service - 서버 시작 직후 추론 스택 예열 + 준비 상태(/ready) 관리
+
+- 추론 풀의 모든 워커에서 업로드와 같은 경로(디코딩 → 특징 추출 → 캐스케이드 → Voice ID)를 한 번씩 실행
+  (모델 로드 / librosa numba 컴파일 / sklearn 초기화를 첫 요청 대신 시작 시 처리)
+- 메인 프로세스 분류기(WebSocket incremental 모드용)와 사전 게이트도 미리 로드
+- 완료 전에는 /ready가 503을 반환하므로 로드 밸런서가 예열되지 않은 인스턴스로 트래픽을 보내지 않음
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+
+from backend.services.inference_service import get_inference_service
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupState:
+    """예열 진행 상태 (이벤트 루프 스레드에서만 갱신)"""
+
+    def __init__(self):
+        self.state = "pending"  # pending → running → ready / failed (WARMUP_ON_STARTUP=0이면 skipped)
+        self.started_at = None
+        self.finished_at = None
+        self.elapsed_ms = None
+        self.steps = {}
+        self.error = None
+
+    @property
+    def ready(self):
+        return self.state in ("ready", "skipped")
+
+    def to_dict(self):
+        return {
+            "ready": self.ready,
+            "state": self.state,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "elapsed_ms": self.elapsed_ms,
+            "steps": self.steps,
+            "error": self.error,
+        }
+
+
+_warmup_state = WarmupState()
+
+
+def _warm_classifier(classifier_loader):
+    """메인 프로세스 분류기 로드 + 합성 클립 1개 예측 (워커 스레드에서 실행)"""
+    classifier = classifier_loader()
+    t = np.arange(int(22050 * 3.0)) / 22050
+    y = (0.2 * np.sin(2 * np.pi * 450 * t)).astype(np.float32)
+    y += 0.01 * np.random.default_rng(os.getpid()).standard_normal(y.size).astype(np.float32)
+    classifier.predict_batch([y])
+    return classifier.model_version
+
+
+def _warm_cry_gate():
+    """사전 게이트 로드 (gate 모듈은 scipy를 쓰므로 여기서 import)"""
+    from backend.models.gate import get_cry_gate
+
+    return get_cry_gate() is not None
+
+
+async def _timed_step(name, coro):
+    started = time.perf_counter()
+    result = await coro
+    _warmup_state.steps[name] = {"elapsed_ms": round((time.perf_counter() - started) * 1000, 1), "result": result}
+    return result
+
+
+async def run_warmup(classifier_loader=None):
+    """
+    시작 시 예열 실행 (main.py lifespan에서 백그라운드 태스크로 호출)
+
+    Parameters:
+    -----------
+    classifier_loader : callable, optional
+        메인 프로세스 분류기를 반환하는 함수 (예: backend.api.get_classifier)
+    """
+    if _warmup_state.state == "running":
+        return _warmup_state.to_dict()
+
+    _warmup_state.state = "running"
+    _warmup_state.started_at = datetime.now().isoformat()
+    _warmup_state.error = None
+    started = time.perf_counter()
+    logger.info("🔥 [Warmup] Warming up inference stack...")
+    try:
+        await _timed_step("inference_workers", get_inference_service().warmup())
+        if classifier_loader is not None:
+            await _timed_step("classifier", asyncio.to_thread(_warm_classifier, classifier_loader))
+        await _timed_step("cry_gate", asyncio.to_thread(_warm_cry_gate))
+    except Exception as e:
+        _warmup_state.state = "failed"
+        _warmup_state.error = repr(e)
+        logger.exception("❌ [Warmup] Failed - instance stays not ready")
+    else:
+        _warmup_state.state = "ready"
+    finally:
+        _warmup_state.elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        _warmup_state.finished_at = datetime.now().isoformat()
+
+    if _warmup_state.ready:
+        logger.info(f"✅ [Warmup] Ready in {_warmup_state.elapsed_ms}ms ({list(_warmup_state.steps)})")
+    return _warmup_state.to_dict()
+
+
+def skip_warmup():
+    """WARMUP_ON_STARTUP=0 - 예열 없이 바로 준비 상태 (첫 요청이 로드 비용을 부담)"""
+    _warmup_state.state = "skipped"
+
+
+def get_warmup_status():
+    return _warmup_state.to_dict()
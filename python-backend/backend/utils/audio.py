@@ -1,7 +1,79 @@
+import io
 import os
 import librosa
 import numpy as np
 
+
+class DecodedAudio:
+    """
+    ✅ 한 번만 디코딩한 오디오 (요청 단위 공유 객체)
+
+    분류(22050 Hz, 3초), 음색 분석, 응답 메타정보(duration_ms, sample_rate)가
+    같은 파일을 각자 librosa.load 하지 않도록 원본 샘플과 리샘플링 결과를 함께 보관합니다.
+    """
+
+    def __init__(self, samples, sample_rate, source_path=None):
+        self.samples = np.asarray(samples, dtype=np.float32)
+        if self.samples.ndim > 1:
+            self.samples = librosa.to_mono(self.samples)
+        self.sample_rate = int(sample_rate)
+        self.source_path = source_path
+        self._resampled = {}
+
+    @classmethod
+    def from_path(cls, file_path):
+        """오디오 파일을 원본 샘플링 레이트 그대로 디코딩"""
+        samples, sample_rate = librosa.load(str(file_path), sr=None)
+        return cls(samples, sample_rate, source_path=str(file_path))
+
+    @classmethod
+    def from_bytes(cls, data, fallback_path=None):
+        """
+        업로드 바이트를 메모리에서 디코딩
+
+        soundfile이 버퍼로 읽지 못하는 포맷(webm 등)은 fallback_path의
+        저장 파일을 librosa(audioread)로 디코딩합니다.
+        """
+        try:
+            samples, sample_rate = librosa.load(io.BytesIO(data), sr=None)
+        except Exception:
+            if fallback_path is None:
+                raise
+            return cls.from_path(fallback_path)
+        return cls(samples, sample_rate, source_path=fallback_path)
+
+    @property
+    def duration(self):
+        """오디오 길이 (초)"""
+        return len(self.samples) / self.sample_rate if self.sample_rate else 0.0
+
+    @property
+    def duration_ms(self):
+        return int(self.duration * 1000)
+
+    def resampled(self, target_sr=22050, duration=None):
+        """
+        target_sr로 리샘플링한 복사본 (앞 duration초, 결과는 캐시)
+
+        librosa.load(path, sr=target_sr, duration=duration)과 동일한 결과를 반환합니다.
+        """
+        key = (target_sr, duration)
+        if key not in self._resampled:
+            y = self.samples
+            if duration is not None:
+                y = y[:int(self.sample_rate * duration)]
+            if target_sr != self.sample_rate:
+                y = librosa.resample(y, orig_sr=self.sample_rate, target_sr=target_sr)
+            self._resampled[key] = y
+        return self._resampled[key]
+
+
+def pcm16_to_float32(buffer):
+    """16bit little-endian raw PCM 바이트를 float32 배열(-1.0 ~ 1.0)로 변환"""
+    usable = len(buffer) - (len(buffer) % 2)
+    return np.frombuffer(memoryview(buffer)[:usable], dtype='<i2').astype(np.float32) / 32768.0
+
+
 def load_audio_file(file_path):
     """Load an audio file and return the audio time series and sample rate."""
     try:
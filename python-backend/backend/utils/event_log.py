@@ -0,0 +1,245 @@
+"""
+✅ append-only 이벤트 로그 (JSON Lines)
+- 이벤트 1건 = 한 줄 추가 (기존 cry_history.json 전체 읽기 → 추가 → indent=2로 전체 다시 쓰기 대체)
+- 파일 잠금(<path>.lock, POSIX fcntl / Windows msvcrt)으로 여러 워커 프로세스가 같은 파일에 안전하게 기록
+- 아기별 메모리 인덱스: 처음 한 번만 전체를 읽고 이후에는 마지막으로 읽은 위치부터 새 줄만 반영
+  (다른 프로세스가 추가한 이벤트도 다음 조회 / 기록 시 반영)
+- 압축: 파일 줄 수가 max_events × compact_factor를 넘으면 최근 max_events개만 남기고 원자적으로 교체
+- fsync 정책: always(매 이벤트) / interval(최대 N초마다 1회, 기본) / never(OS에 맡김)
+- 기존 cry_history.json이 있으면 첫 사용 시 JSON Lines로 옮기고 .migrated로 이름 변경
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+FSYNC_POLICIES = ('always', 'interval', 'never')
+
+
+@contextmanager
+def _locked(lock_path):
+    """프로세스 간 배타 잠금 (잠금 전용 파일 사용 - 로그 파일은 압축 시 교체되므로)"""
+    with open(lock_path, 'a+b') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK은 10초 재시도 후 실패 - 계속 대기
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class EventLog:
+    """
+    append-only 이벤트 로그 + 아기별 인덱스
+
+    사용 예:
+        log = EventLog('backend/data/cry_history.jsonl', legacy_path='backend/data/cry_history.json')
+        log.append(event_data)
+        log.events_for(infant_id, limit=50)   # 오래된 순, 마지막 limit개
+    """
+
+    def __init__(self, path, max_events=1000, fsync=None, fsync_interval=None,
+                 compact_factor=None, legacy_path=None):
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + '.lock')
+        self.legacy_path = Path(legacy_path) if legacy_path else None
+        self.max_events = max_events
+        self.fsync = fsync or os.getenv('EVENT_LOG_FSYNC', 'interval')
+        if self.fsync not in FSYNC_POLICIES:
+            raise ValueError(f"EVENT_LOG_FSYNC must be one of {FSYNC_POLICIES}")
+        self.fsync_interval = fsync_interval if fsync_interval is not None else float(os.getenv('EVENT_LOG_FSYNC_INTERVAL', '1.0'))
+        self.compact_factor = max(1.1, compact_factor or float(os.getenv('EVENT_LOG_COMPACT_FACTOR', '2')))
+
+        self._lock = threading.Lock()
+        self._last_fsync = 0.0
+        self._stats = {'appends': 0, 'compactions': 0, 'skipped_lines': 0, 'fsyncs': 0}
+        self._reset_index()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _reset_index(self):
+        self._by_infant = {}
+        self._line_count = 0
+        self._offset = 0
+        self._file_id = None
+        self._loaded = False
+        self._torn_tail = False
+
+    # ------------------------------------------------------------------
+    # 인덱스 갱신 (잠금 안에서 호출)
+    # ------------------------------------------------------------------
+
+    def _index_event(self, event):
+        key = str(event.get('infant_id'))
+        self._by_infant.setdefault(key, []).append(event)
+        self._line_count += 1
+
+    def _catch_up(self):
+        """마지막으로 읽은 위치 이후의 완전한 줄만 인덱스에 반영 (압축으로 파일이 바뀌었으면 다시 읽음)"""
+        if not self._loaded:
+            self._migrate_legacy()
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._reset_index()
+            self._loaded = True
+            return
+        file_id = (stat.st_dev, stat.st_ino)
+        if file_id != self._file_id or stat.st_size < self._offset:
+            self._reset_index()
+            self._file_id = file_id
+        self._loaded = True
+        if stat.st_size == self._offset:
+            return
+
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            data = f.read()
+        end = data.rfind(b'\n') + 1
+        # 마지막 줄이 아직 끝나지 않았으면 (충돌로 잘린 기록) 다음에 다시 읽음
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                self._index_event(json.loads(line))
+            except ValueError:
+                self._stats['skipped_lines'] += 1
+        self._offset += end
+        self._torn_tail = end < len(data)
+
+    def _migrate_legacy(self):
+        """기존 cry_history.json(배열) → JSON Lines (로그 파일이 아직 없을 때 한 번)"""
+        if self.legacy_path is None or not self.legacy_path.exists() or self.path.exists():
+            return
+        try:
+            with open(self.legacy_path, 'r', encoding='utf-8') as f:
+                history = json.load(f)
+            self._write_events(history[-self.max_events:])
+            os.replace(self.legacy_path, self.legacy_path.with_name(self.legacy_path.name + '.migrated'))
+            print(f"📦 [EventLog] Migrated {len(history)} events from {self.legacy_path.name} → {self.path.name}")
+        except Exception as e:
+            print(f"⚠️ [EventLog] Legacy migration failed: {e}")
+
+    def _write_events(self, events):
+        """events로 로그 파일을 원자적으로 교체"""
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for event in events:
+                f.write(json.dumps(event, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    # ------------------------------------------------------------------
+    # 공개 API
+    # ------------------------------------------------------------------
+
+    def append(self, event):
+        """이벤트 1건 추가 (한 줄 쓰기 + 정책에 따른 fsync, 필요하면 압축)"""
+        self.append_many([event])
+
+    def append_many(self, events):
+        """여러 이벤트를 잠금 1회 / write 1회로 추가 (save_events_bulk용)"""
+        if not events:
+            return
+        data = b''.join((json.dumps(event, ensure_ascii=False) + '\n').encode('utf-8') for event in events)
+        with self._lock, _locked(self.lock_path):
+            self._catch_up()
+            with open(self.path, 'ab') as f:
+                if self._torn_tail:
+                    # 이전 프로세스가 쓰다 만 줄과 붙지 않도록 줄바꿈으로 마감
+                    data = b'\n' + data
+                f.write(data)
+                f.flush()
+                self._maybe_fsync(f)
+                # 잠금 안이므로 파일 끝 = 이번 기록 끝 (잘린 줄도 건너뛴 것으로 처리)
+                self._offset = f.tell()
+            self._torn_tail = False
+            self._file_id = self._file_id or self._current_file_id()
+            for event in events:
+                self._index_event(event)
+            self._stats['appends'] += len(events)
+
+            if self._line_count > self.max_events * self.compact_factor:
+                self._compact_locked()
+
+    def _current_file_id(self):
+        stat = os.stat(self.path)
+        return (stat.st_dev, stat.st_ino)
+
+    def _maybe_fsync(self, f):
+        if self.fsync == 'never':
+            return
+        now = time.monotonic()
+        if self.fsync == 'always' or now - self._last_fsync >= self.fsync_interval:
+            os.fsync(f.fileno())
+            self._last_fsync = now
+            self._stats['fsyncs'] += 1
+
+    def _compact_locked(self):
+        # 인덱스는 아기별이므로 기록 순서대로 최근 max_events개를 고르려면 파일을 다시 읽음
+        # (max_events × (compact_factor - 1)번 기록마다 1회 → 기록당 상각 O(1))
+        with open(self.path, 'rb') as f:
+            lines = [line for line in f.read().splitlines() if line.strip()]
+        kept = []
+        for line in lines[-self.max_events:]:
+            try:
+                kept.append(json.loads(line))
+            except ValueError:
+                continue
+        self._write_events(kept)
+        self._reset_index()
+        self._catch_up()
+        self._stats['compactions'] += 1
+
+    def compact(self):
+        """최근 max_events개만 남기고 파일 교체 (보통은 append에서 자동 실행)"""
+        with self._lock, _locked(self.lock_path):
+            self._catch_up()
+            self._compact_locked()
+
+    def events_for(self, infant_id, limit=None):
+        """특정 아기의 이벤트 (오래된 순, limit이 있으면 마지막 limit개)"""
+        with self._lock, _locked(self.lock_path):
+            self._catch_up()
+            events = self._by_infant.get(str(infant_id), [])
+            return list(events[-limit:] if limit else events)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'path': str(self.path),
+                'events': self._line_count,
+                'infants': len(self._by_infant),
+                'bytes': self._offset,
+                'fsync': self.fsync,
+                **self._stats,
+            }
+
+    def sync(self):
+        """마지막 기록까지 디스크에 반영 (interval 정책일 때 종료 시 호출)"""
+        with self._lock:
+            if self.path.exists():
+                with open(self.path, 'ab') as f:
+                    os.fsync(f.fileno())
@@ -1,12 +1,44 @@
 import oracledb
-import json
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 import os
 from dotenv import load_dotenv
 load_dotenv()
 
-# ⭐ Oracle Thick 모드 초기화 (모듈 로드 시 한 번만 실행)
+from backend.utils.event_log import EventLog
+
+logger = logging.getLogger(__name__)
+
+# ✅ 세션 풀 설정 (요청마다 TCP + 인증 핸드셰이크를 하지 않도록 연결 재사용)
+DB_POOL_MIN = int(os.getenv('DB_POOL_MIN', '1'))
+DB_POOL_MAX = int(os.getenv('DB_POOL_MAX', '4'))
+DB_POOL_INCREMENT = int(os.getenv('DB_POOL_INCREMENT', '1'))
+# acquire 시 마지막 사용 후 이 시간(초)이 지난 연결은 ping으로 확인 후 끊겼으면 교체 (0이면 매번, -1이면 끔)
+DB_POOL_PING_INTERVAL = int(os.getenv('DB_POOL_PING_INTERVAL', '60'))
+# 풀이 가득 찼을 때 빈 연결을 기다리는 최대 시간 (ms)
+DB_POOL_WAIT_TIMEOUT_MS = int(os.getenv('DB_POOL_WAIT_TIMEOUT_MS', '5000'))
+# 유휴 연결 정리 시간 (초, min 초과분만 닫힘)
+DB_POOL_IDLE_TIMEOUT = int(os.getenv('DB_POOL_IDLE_TIMEOUT', '300'))
+# 연결별 statement 캐시 크기 (같은 SQL 재파싱 방지)
+DB_STMT_CACHE_SIZE = int(os.getenv('DB_STMT_CACHE_SIZE', '40'))
+
+# ✅ 일괄 저장 (save_events_bulk / write-behind 큐)
+# executemany 1회에 넣을 최대 행 수
+DB_BULK_BATCH_SIZE = int(os.getenv('DB_BULK_BATCH_SIZE', '500'))
+# write-behind 큐: 이 개수가 모이거나 첫 이벤트 후 이 시간(초)이 지나면 저장
+EVENT_FLUSH_SIZE = int(os.getenv('EVENT_FLUSH_SIZE', '100'))
+EVENT_FLUSH_INTERVAL = float(os.getenv('EVENT_FLUSH_INTERVAL', '1.0'))
+# 저장 대기 이벤트 상한 (초과 시 submit 거부)
+EVENT_QUEUE_MAX = int(os.getenv('EVENT_QUEUE_MAX', '10000'))
+
+# ⭐ Oracle Thick 모드 초기화 (첫 StorageManager 생성 시 한 번만 실행)
 _oracle_thick_initialized = False
 
 def init_oracle_thick_mode():
@@ -56,14 +88,56 @@ def init_oracle_thick_mode():
             print(f"⚠️  Oracle Thick mode initialization failed: {e}")
             print("   Attempting to continue with Thin mode (may not support XE)")
 
-# 모듈 로드 시 자동 초기화
-init_oracle_thick_mode()
+
+# ✅ 조치 통계 (get_action_stats) - cry_type + action_detail별 집계를 DB에서 수행
+# cry_event(infant_id, event_time) → action_log(event_id) 인덱스 사용 (db/migration_v2.2_action_stats.sql)
+ACTION_STATS_SQL = """
+    SELECT
+        NVL(e.cry_type, 'unknown') AS cry_type,
+        a.action_detail,
+        COUNT(*) AS trials,
+        SUM(CASE WHEN LOWER(a.result) = 'success' THEN 1 ELSE 0 END) AS success,
+        SUM(CASE WHEN LOWER(a.result) = 'fail' THEN 1 ELSE 0 END) AS fail,
+        SUM(CASE WHEN LOWER(a.result) = 'success' THEN 1 ELSE 0 END) / COUNT(*) AS success_rate
+    FROM cry_event e
+    JOIN action_log a
+      ON a.event_id = e.event_id
+    WHERE e.infant_id = :infant_id
+      AND e.event_time >= SYSDATE - :days
+      AND a.action_detail IS NOT NULL
+    GROUP BY NVL(e.cry_type, 'unknown'), a.action_detail
+    ORDER BY cry_type, success_rate DESC, trials DESC
+"""
+
+
+def build_action_stats(rows):
+    """
+    ACTION_STATS_SQL 결과 → {cry_type: [{detail, trials, success, fail, success_rate}, ...]}
+
+    Parameters:
+    -----------
+    rows : iterable of tuple
+        (cry_type, action_detail, trials, success, fail, success_rate) - cry_type 안에서 정렬된 순서
+    """
+    stats = {}
+    for cry_type, action_detail, trials, success, fail, success_rate in rows:
+        stats.setdefault(cry_type, []).append({
+            "detail": action_detail,
+            "trials": int(trials),
+            "success": int(success),
+            "fail": int(fail),
+            "success_rate": float(success_rate),
+        })
+    return stats
 
 
 class StorageManager:
     """DB + JSON 하이브리드 저장소"""
     
     def __init__(self):
+        # ✅ import 부작용 대신 처음 사용할 때 초기화 (서버 시작 시간 / 테스트 import에 영향 없음)
+        init_oracle_thick_mode()
+
         self.db_config = {
             'user': os.getenv('DB_USER'),
             'password': os.getenv('DB_PASSWORD'),
@@ -72,183 +146,453 @@ class StorageManager:
         if not self.db_config['user'] or not self.db_config['password'] or not self.db_config['dsn']:
             raise ValueError("❌ DB 환경변수가 설정되지 않았습니다. python-backend/.env 파일을 확인하세요.")
         
-        # JSON 백업 경로
-        self.json_path = Path(__file__).parents[1] / 'data' / 'cry_history.json'
-        self.json_path.parent.mkdir(exist_ok=True)
+        # JSON 백업 (append-only JSON Lines + 아기별 인덱스, 기존 cry_history.json은 첫 사용 시 변환)
+        data_dir = Path(__file__).parents[1] / 'data'
+        self.event_log = EventLog(
+            os.getenv('EVENT_LOG_PATH') or data_dir / 'cry_history.jsonl',
+            max_events=int(os.getenv('EVENT_LOG_MAX_EVENTS', '1000')),
+            legacy_path=data_dir / 'cry_history.json',
+        )
+        
+        # 세션 풀 (첫 DB 사용 시 생성)
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._pool_error = None
+        self._stats_lock = threading.Lock()
+        self._pool_stats = {'acquired': 0, 'failed': 0, 'acquire_ms_total': 0.0, 'acquire_ms_max': 0.0}
         
         print(f"📦 StorageManager initialized")
         print(f"   DB DSN: {self.db_config['dsn']}")
-        print(f"   JSON backup: {self.json_path}")
+        print(f"   JSON backup: {self.event_log.path}")
+    
+    def _get_pool(self):
+        """세션 풀 (없으면 생성, 생성 실패 시 None - 다음 호출에서 다시 시도)"""
+        if self._pool is not None:
+            return self._pool
+        
+        with self._pool_lock:
+            if self._pool is None:
+                try:
+                    self._pool = oracledb.create_pool(
+                        **self.db_config,
+                        min=DB_POOL_MIN,
+                        max=max(DB_POOL_MIN, DB_POOL_MAX),
+                        increment=DB_POOL_INCREMENT,
+                        getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+                        wait_timeout=DB_POOL_WAIT_TIMEOUT_MS,
+                        timeout=DB_POOL_IDLE_TIMEOUT,
+                        ping_interval=DB_POOL_PING_INTERVAL,
+                        stmtcachesize=DB_STMT_CACHE_SIZE,
+                    )
+                    self._pool_error = None
+                    logger.info(
+                        f"✅ DB 세션 풀 생성: {self.db_config['dsn']} "
+                        f"(min={DB_POOL_MIN}, max={self._pool.max}, increment={DB_POOL_INCREMENT})"
+                    )
+                except Exception as e:
+                    self._pool_error = str(e)
+                    logger.warning(f"⚠️ DB 세션 풀 생성 실패: {e} (DSN: {self.db_config['dsn']}, User: {self.db_config['user']})")
+            return self._pool
     
     def get_connection(self):
-        """DB 연결"""
+        """
+        풀에서 DB 연결 획득 (실패 시 None)
+        
+        호출한 쪽에서 conn.close()를 호출해야 풀로 반환됩니다. 가능하면 connection()을 사용하세요.
+        """
+        pool = self._get_pool()
+        started = time.perf_counter()
+        conn = None
+        if pool is not None:
+            try:
+                conn = pool.acquire()
+            except Exception as e:
+                logger.warning(f"⚠️ DB 연결 획득 실패: {e}")
+        
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._stats_lock:
+            if conn is None:
+                self._pool_stats['failed'] += 1
+            else:
+                self._pool_stats['acquired'] += 1
+                self._pool_stats['acquire_ms_total'] += elapsed_ms
+                self._pool_stats['acquire_ms_max'] = max(self._pool_stats['acquire_ms_max'], elapsed_ms)
+        return conn
+    
+    @contextmanager
+    def connection(self):
+        """
+        풀 연결 컨텍스트 매니저 - 블록을 벗어나면 (예외 포함) 항상 풀로 반환
+        
+        사용 예:
+            with storage.connection() as conn:
+                if conn is None:
+                    ...  # DB 사용 불가 → JSON 백업 경로
+                cursor = conn.cursor()
+        
+        커밋하지 않은 트랜잭션은 반환 전에 롤백됩니다.
+        """
+        conn = self.get_connection()
         try:
-            conn = oracledb.connect(**self.db_config)
-            print(f"✅ DB 연결 성공: {self.db_config['dsn']}")
-            return conn
+            yield conn
+        finally:
+            if conn is not None:
+                try:
+                    conn.rollback()
+                    conn.close()
+                except Exception as e:
+                    # 끊어진 연결은 풀에서 제거
+                    logger.warning(f"⚠️ DB 연결 반환 실패, 풀에서 제거: {e}")
+                    try:
+                        self._pool.drop(conn)
+                    except Exception:
+                        pass
+    
+    def pool_stats(self):
+        """
+        Returns:
+        --------
+        dict : 풀 설정 / 현재 연결 수(opened, busy) / 획득 횟수·실패·평균 대기(ms)
+        """
+        with self._stats_lock:
+            stats = dict(self._pool_stats)
+        acquired = stats['acquired']
+        report = {
+            'created': self._pool is not None,
+            'dsn': self.db_config['dsn'],
+            'min': DB_POOL_MIN,
+            'max': max(DB_POOL_MIN, DB_POOL_MAX),
+            'increment': DB_POOL_INCREMENT,
+            'ping_interval': DB_POOL_PING_INTERVAL,
+            'stmtcachesize': DB_STMT_CACHE_SIZE,
+            'acquired': acquired,
+            'failed': stats['failed'],
+            'acquire_ms_avg': round(stats['acquire_ms_total'] / acquired, 2) if acquired else None,
+            'acquire_ms_max': round(stats['acquire_ms_max'], 2),
+            'error': self._pool_error,
+        }
+        pool = self._pool
+        if pool is not None:
+            try:
+                report['opened'] = pool.opened
+                report['busy'] = pool.busy
+            except Exception as e:
+                report['error'] = str(e)
+        return report
+    
+    def close(self):
+        """세션 풀 종료 + JSON 백업 fsync (서버 종료 시)"""
+        try:
+            self.event_log.sync()
         except Exception as e:
-            print(f"⚠️ DB 연결 실패: {e}")
-            print(f"   DSN: {self.db_config['dsn']}")
-            print(f"   User: {self.db_config['user']}")
-            return None
+            logger.warning(f"⚠️ JSON 백업 sync 실패: {e}")
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            try:
+                pool.close(force=True)
+                logger.info("🔌 DB 세션 풀 종료")
+            except Exception as e:
+                logger.warning(f"⚠️ DB 세션 풀 종료 실패: {e}")
     
     def save_complete_event(self, event_data):
         """완전한 이벤트 저장 (DB + JSON)"""
-
-        audio_id = None
-        event_id = None
-
-        if event_data.get('isCrying', False):
-            conn = self.get_connection()
-
-            if conn:
-                try:
-                    cursor = conn.cursor()
-
-                    # ✅ 이제는 infant_id, guardian_id가 이미 존재한다고 "신뢰"
-                    infant_id = event_data.get('infant_id')
-                    guardian_id = event_data.get('guardian_id')
-
-                    if not infant_id:
-                        print("⚠️ infant_id가 전달되지 않았습니다. DB 저장을 건너뜁니다.")
-                    else:
-                        # 🔥 더 이상 ensure_infant_exists 호출 안 함
-                        # if not self.ensure_infant_exists(conn, infant_id, guardian_id):
-                        #     ...
-
-                        # audio_file 저장
-                        audio_id_var = cursor.var(oracledb.NUMBER)
-                        cursor.execute(
-                            """
-                            INSERT INTO audio_file (
-                                infant_id, storage_uri, duration_ms, 
-                                sample_rate, upload_time
-                            )
-                            VALUES (:1, :2, :3, :4, SYSTIMESTAMP)
-                            RETURNING audio_id INTO :5
-                            """,
-                            [
-                                infant_id,
-                                event_data.get('storage_uri', ''),
-                                event_data.get('duration', 0) * 1000,
-                                event_data.get('sample_rate', 16000),
-                                audio_id_var,
-                            ],
-                        )
-                        audio_id = int(audio_id_var.getvalue()[0])
-
-                        # cry_event 저장
-                        event_id_var = cursor.var(oracledb.NUMBER)
-                        cursor.execute(
-                            """
-                            INSERT INTO cry_event (
-                                infant_id, event_time, duration_ms, confidence,
-                                severity, cry_type, detected_by, is_resolved
-                            )
-                            VALUES (:1, SYSTIMESTAMP, :2, :3, :4, :5, :6, 0)
-                            RETURNING event_id INTO :7
-                            """,
-                            [
-                                infant_id,
-                                event_data.get('duration', 0) * 1000,
-                                event_data.get('confidence', 0.0),
-                                event_data.get('severity', 'Unknown'),
-                                event_data.get('reason', 'unknown'),
-                                'model',
-                                event_id_var,
-                            ],
-                        )
-                        event_id = int(event_id_var.getvalue()[0])
-
-                        conn.commit()
-                        print(f"✅ DB 저장 완료: audio_id={audio_id}, event_id={event_id}")
-
-                except Exception as e:
-                    print(f"⚠️ DB 저장 실패: {e}")
-                    import traceback
-
-                    traceback.print_exc()
-                    conn.rollback()
-                finally:
-                    conn.close()
+        return self.save_events_bulk([event_data])[0]
+    
+    def _insert_events_bulk(self, conn, rows):
+        """
+        audio_file / cry_event를 executemany(array DML)로 한 번씩 INSERT하고
+        RETURNING으로 행별 ID를 받음 (이벤트 수와 무관하게 왕복 2회)
         
-        # 2. JSON 백업
-        event_data['audio_id'] = audio_id
-        event_data['event_id'] = event_id
+        Returns:
+        --------
+        (audio_ids, event_ids) : rows와 같은 순서의 ID 리스트
+        """
+        audio_cursor = conn.cursor()
+        audio_id_var = audio_cursor.var(oracledb.NUMBER, arraysize=len(rows))
+        audio_cursor.setinputsizes(None, None, None, None, audio_id_var)
+        audio_cursor.executemany(
+            """
+            INSERT INTO audio_file (
+                infant_id, storage_uri, duration_ms, 
+                sample_rate, upload_time
+            )
+            VALUES (:1, :2, :3, :4, SYSTIMESTAMP)
+            RETURNING audio_id INTO :5
+            """,
+            [
+                (
+                    event['infant_id'],
+                    event.get('storage_uri', ''),
+                    event.get('duration', 0) * 1000,
+                    event.get('sample_rate', 16000),
+                )
+                for event in rows
+            ],
+        )
         
+        event_cursor = conn.cursor()
+        event_id_var = event_cursor.var(oracledb.NUMBER, arraysize=len(rows))
+        event_cursor.setinputsizes(None, None, None, None, None, None, event_id_var)
+        event_cursor.executemany(
+            """
+            INSERT INTO cry_event (
+                infant_id, event_time, duration_ms, confidence,
+                severity, cry_type, detected_by, is_resolved
+            )
+            VALUES (:1, SYSTIMESTAMP, :2, :3, :4, :5, :6, 0)
+            RETURNING event_id INTO :7
+            """,
+            [
+                (
+                    event['infant_id'],
+                    event.get('duration', 0) * 1000,
+                    event.get('confidence', 0.0),
+                    event.get('severity', 'Unknown'),
+                    event.get('reason', 'unknown'),
+                    'model',
+                )
+                for event in rows
+            ],
+        )
+        
+        # executemany + RETURNING: getvalue(i)는 i번째 행이 반환한 값들의 리스트
+        audio_ids = [int(audio_id_var.getvalue(i)[0]) for i in range(len(rows))]
+        event_ids = [int(event_id_var.getvalue(i)[0]) for i in range(len(rows))]
+        return audio_ids, event_ids
+    
+    def save_events_bulk(self, events):
+        """
+        여러 이벤트를 한 번에 저장 (DB + JSON)
+        
+        - 울음 이벤트(isCrying + infant_id)는 DB_BULK_BATCH_SIZE개씩 executemany로 INSERT, 전체 1회 커밋
+          (하나라도 실패하면 전체 롤백 → 모든 이벤트의 audio_id / event_id는 None)
+        - JSON 백업은 잠금 1회 / write 1회로 추가
+        
+        Parameters:
+        -----------
+        events : list of dict
+            save_complete_event와 같은 형식의 이벤트
+        
+        Returns:
+        --------
+        list : audio_id / event_id가 채워진 events (입력 순서 유지)
+        """
+        events = list(events)
+        rows = []
+        for event in events:
+            event['audio_id'] = None
+            event['event_id'] = None
+            if not event.get('isCrying', False):
+                continue
+            # ✅ 이제는 infant_id, guardian_id가 이미 존재한다고 "신뢰"
+            if not event.get('infant_id'):
+                print("⚠️ infant_id가 전달되지 않았습니다. DB 저장을 건너뜁니다.")
+                continue
+            rows.append(event)
+        
+        if rows:
+            with self.connection() as conn:
+                if conn:
+                    try:
+                        ids = []
+                        for start in range(0, len(rows), DB_BULK_BATCH_SIZE):
+                            chunk = rows[start:start + DB_BULK_BATCH_SIZE]
+                            ids.append((chunk, *self._insert_events_bulk(conn, chunk)))
+                        conn.commit()
+                        
+                        for chunk, audio_ids, event_ids in ids:
+                            for event, audio_id, event_id in zip(chunk, audio_ids, event_ids):
+                                event['audio_id'] = audio_id
+                                event['event_id'] = event_id
+                        print(f"✅ DB 저장 완료: {len(rows)}건 (batch {DB_BULK_BATCH_SIZE})")
+                    
+                    except Exception as e:
+                        print(f"⚠️ DB 저장 실패: {e}")
+                        import traceback
+                        
+                        traceback.print_exc()
+                        conn.rollback()
+        
+        # 2. JSON 백업 (한 번에 추가, 최근 EVENT_LOG_MAX_EVENTS개 유지는 주기적 압축이 담당)
         try:
-            if self.json_path.exists():
-                with open(self.json_path, 'r', encoding='utf-8') as f:
-                    history = json.load(f)
-            else:
-                history = []
-            
-            history.append(event_data)
-            
-            # 최대 1000개 유지
-            if len(history) > 1000:
-                history = history[-1000:]
-            
-            with open(self.json_path, 'w', encoding='utf-8') as f:
-                json.dump(history, f, ensure_ascii=False, indent=2)
-            
-            print(f"✅ JSON 백업 완료: {len(history)}개")
-            
+            self.event_log.append_many(events)
+            print(f"✅ JSON 백업 완료: {len(events)}건")
         except Exception as e:
             print(f"⚠️ JSON 저장 실패: {e}")
         
-        return event_data
+        return events
     
     def get_history(self, infant_id, limit=50):
         """히스토리 조회"""
-        conn = self.get_connection()
+        with self.connection() as conn:
+            if conn:
+                try:
+                    cursor = conn.cursor()
+                    cursor.execute("""
+                        SELECT 
+                            event_id, event_time, duration_ms, confidence,
+                            severity, cry_type
+                        FROM cry_event
+                        WHERE infant_id = :1
+                        ORDER BY event_time DESC
+                        FETCH FIRST :2 ROWS ONLY
+                    """, [infant_id, limit])
+                    
+                    rows = cursor.fetchall()
+                    return [
+                        {
+                            'event_id': row[0],
+                            'timestamp': row[1].isoformat() if row[1] else None,
+                            'duration': row[2] // 1000 if row[2] else 0,
+                            'confidence': float(row[3]) if row[3] else 0.0,
+                            'severity': row[4],
+                            'cry_type': row[5]
+                        }
+                        for row in rows
+                    ]
+                    
+                except Exception as e:
+                    print(f"⚠️ DB 조회 실패: {e}")
         
-        if conn:
-            try:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT 
-                        event_id, event_time, duration_ms, confidence,
-                        severity, cry_type
-                    FROM cry_event
-                    WHERE infant_id = :1
-                    ORDER BY event_time DESC
-                    FETCH FIRST :2 ROWS ONLY
-                """, [infant_id, limit])
-                
-                rows = cursor.fetchall()
-                history = [
-                    {
-                        'event_id': row[0],
-                        'timestamp': row[1].isoformat() if row[1] else None,
-                        'duration': row[2] // 1000 if row[2] else 0,
-                        'confidence': float(row[3]) if row[3] else 0.0,
-                        'severity': row[4],
-                        'cry_type': row[5]
-                    }
-                    for row in rows
-                ]
-                
-                conn.close()
-                return history
-                
-            except Exception as e:
-                print(f"⚠️ DB 조회 실패: {e}")
-                conn.close()
+        # Fallback: JSON 백업 (아기별 인덱스 - 파일 전체를 읽지 않음)
+        return self.event_log.events_for(infant_id, limit=limit)
+    
+    def get_cry_events(self, infant_id, limit=50):
+        """
+        최근 울음 이벤트 (최신순, 대시보드용)
         
-        # Fallback: JSON
-        if self.json_path.exists():
-            with open(self.json_path, 'r', encoding='utf-8') as f:
-                history = json.load(f)
-            return [h for h in history if h.get('infant_id') == infant_id][-limit:]
+        Returns:
+        --------
+        list : [ { 'event_id', 'timestamp', 'duration'(초), 'confidence', 'severity', 'cry_type', 'is_resolved' } ]
+        """
+        with self.connection() as conn:
+            if conn:
+                try:
+                    cursor = conn.cursor()
+                    cursor.execute("""
+                        SELECT
+                            event_id, event_time, duration_ms, confidence,
+                            severity, cry_type, is_resolved
+                        FROM cry_event
+                        WHERE infant_id = :1
+                        ORDER BY event_time DESC
+                        FETCH FIRST :2 ROWS ONLY
+                    """, [infant_id, limit])
+                    return [
+                        {
+                            'event_id': row[0],
+                            'timestamp': row[1].isoformat() if row[1] else None,
+                            'duration': row[2] // 1000 if row[2] else 0,
+                            'confidence': float(row[3]) if row[3] else 0.0,
+                            'severity': row[4],
+                            'cry_type': row[5],
+                            'is_resolved': bool(row[6]),
+                        }
+                        for row in cursor.fetchall()
+                    ]
+                except Exception as e:
+                    print(f"⚠️ DB 조회 실패: {e}")
+        
+        # Fallback: JSON (울음으로 판정된 이벤트만)
+        events = [h for h in self.event_log.events_for(infant_id) if h.get('isCrying', True)]
+        return [
+            {
+                'event_id': h.get('event_id'),
+                'timestamp': h.get('timestamp'),
+                'duration': h.get('duration', 0),
+                'confidence': float(h.get('confidence') or 0.0),
+                'severity': h.get('severity'),
+                'cry_type': h.get('reason', h.get('cry_type')),
+                'is_resolved': False,
+            }
+            for h in reversed(events[-limit:])
+        ]
+    
+    @staticmethod
+    def _summarize_events(groups, days):
+        """(cry_type, severity, 건수, 총 길이 ms, 신뢰도 합) 묶음 → 요약 dict"""
+        by_cry_type = {}
+        by_severity = {}
+        total_events = 0
+        total_duration_ms = 0
+        confidence_sum = 0.0
+        for cry_type, severity, count, duration_ms, confidence in groups:
+            cry_type = cry_type or 'unknown'
+            severity = severity or 'Unknown'
+            by_cry_type[cry_type] = by_cry_type.get(cry_type, 0) + count
+            by_severity[severity] = by_severity.get(severity, 0) + count
+            total_events += count
+            total_duration_ms += duration_ms or 0
+            confidence_sum += confidence or 0.0
+        
+        return {
+            'days': days,
+            'total_events': total_events,
+            'total_duration_sec': round(total_duration_ms / 1000, 1),
+            'avg_duration_sec': round(total_duration_ms / 1000 / total_events, 1) if total_events else 0.0,
+            'avg_confidence': round(confidence_sum / total_events, 3) if total_events else 0.0,
+            'most_common_cry_type': max(by_cry_type, key=by_cry_type.get) if by_cry_type else None,
+            'by_cry_type': by_cry_type,
+            'by_severity': by_severity,
+        }
+    
+    def get_insights_summary(self, infant_id, days=7):
+        """
+        최근 N일 울음 요약 (대시보드용, DB에서 원인 / 심각도별로 집계)
+        
+        Returns:
+        --------
+        dict : { 'days', 'total_events', 'total_duration_sec', 'avg_duration_sec', 'avg_confidence',
+                 'most_common_cry_type', 'by_cry_type': {원인: 건수}, 'by_severity': {심각도: 건수}, 'source' }
+        """
+        with self.connection() as conn:
+            if conn:
+                try:
+                    cursor = conn.cursor()
+                    cursor.execute("""
+                        SELECT
+                            cry_type, severity, COUNT(*),
+                            SUM(duration_ms), SUM(confidence)
+                        FROM cry_event
+                        WHERE infant_id = :infant_id
+                          AND event_time >= SYSDATE - :days
+                        GROUP BY cry_type, severity
+                    """, [infant_id, days])
+                    groups = [
+                        (row[0], row[1], int(row[2]), int(row[3] or 0), float(row[4] or 0.0))
+                        for row in cursor.fetchall()
+                    ]
+                    return {**self._summarize_events(groups, days), 'source': 'db'}
+                except Exception as e:
+                    print(f"⚠️ DB 요약 조회 실패: {e}")
         
-        return []
+        # Fallback: JSON 백업에서 같은 집계
+        cutoff = datetime.now().timestamp() - days * 86400
+        groups = []
+        for h in self.event_log.events_for(infant_id):
+            if not h.get('isCrying', True):
+                continue
+            try:
+                if datetime.fromisoformat(str(h.get('timestamp'))).timestamp() < cutoff:
+                    continue
+            except ValueError:
+                continue
+            groups.append((
+                h.get('reason', h.get('cry_type')),
+                h.get('severity'),
+                1,
+                int((h.get('duration') or 0) * 1000),
+                float(h.get('confidence') or 0.0),
+            ))
+        return {**self._summarize_events(groups, days), 'source': 'json'}
     
     def get_action_stats(self, infant_id, days=7):
         """
         특정 아기에 대해 최근 N일 동안 실행된 조치(action_log)를
         울음 원인(cry_type) + action_detail 단위로 묶어서
         시행 횟수 / 성공 횟수를 집계해서 반환합니다.
+        (GROUP BY + 조건부 SUM으로 DB에서 집계, 정렬도 성공률 → 시행 횟수 순으로 DB에서 처리)
         
         반환 형식 예시:
         {
@@ -267,106 +611,265 @@ class StorageManager:
           ]
         }
         """
-        conn = self.get_connection()
-        if not conn:
-            return {}
-
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                SELECT
-                    e.cry_type,
-                    a.action_detail,
-                    a.result
-                FROM action_log a
-                JOIN cry_event e
-                  ON a.event_id = e.event_id
-                WHERE e.infant_id = :infant_id
-                  AND e.event_time >= SYSDATE - :days
-                """,
-                [infant_id, days]
-            )
-            rows = cursor.fetchall()
-
-            stats = {}  # { cry_type: { detail: {trials, success, fail} } }
+        with self.connection() as conn:
+            if not conn:
+                return {}
 
-            for cry_type, action_detail, result in rows:
-                if not cry_type:
-                    cry_type = 'unknown'
-                if not action_detail:
-                    continue
-
-                if cry_type not in stats:
-                    stats[cry_type] = {}
-
-                if action_detail not in stats[cry_type]:
-                    stats[cry_type][action_detail] = {
-                        "detail": action_detail,
-                        "trials": 0,
-                        "success": 0,
-                        "fail": 0,
-                    }
-
-                entry = stats[cry_type][action_detail]
-                entry["trials"] += 1
-
-                res = (result or "").lower()
-                if res == "success":
-                    entry["success"] += 1
-                elif res == "fail":
-                    entry["fail"] += 1
-
-            # success_rate 계산 + 리스트 형태로 변환
-            result_dict = {}
-            for cry_type, actions_dict in stats.items():
-                actions_list = []
-                for detail, entry in actions_dict.items():
-                    trials = entry["trials"]
-                    success = entry["success"]
-                    success_rate = success / trials if trials > 0 else 0.0
-                    actions_list.append({
-                        **entry,
-                        "success_rate": success_rate,
-                    })
-
-                # 성공률 + 시행 횟수 기준으로 정렬
-                actions_list.sort(
-                    key=lambda x: (x["success_rate"], x["trials"]),
-                    reverse=True
-                )
-                result_dict[cry_type] = actions_list
-
-            return result_dict
-
-        except Exception as e:
-            print(f"⚠️ get_action_stats 실패: {e}")
-            return {}
-        finally:
-            conn.close()
+            try:
+                cursor = conn.cursor()
+                # 집계는 DB에서 (조치 1건당 1행 대신 cry_type + action_detail당 1행만 전송)
+                cursor.execute(ACTION_STATS_SQL, [infant_id, days])
+                return build_action_stats(cursor.fetchall())
 
+            except Exception as e:
+                print(f"⚠️ get_action_stats 실패: {e}")
+                return {}
 
     def test_connection(self):
         """DB 연결 테스트"""
-        conn = self.get_connection()
-        if conn:
+        with self.connection() as conn:
+            if conn is None:
+                return False, "Connection failed"
             try:
                 cursor = conn.cursor()
                 cursor.execute("SELECT 'Connection OK' FROM DUAL")
                 result = cursor.fetchone()
-                conn.close()
                 return True, result[0]
             except Exception as e:
-                conn.close()
                 return False, str(e)
-        return False, "Connection failed"
+
+
+class EventWriteBehind:
+    """
+    save_events_bulk 앞단의 write-behind 큐
+    
+    submit()은 바로 반환하고, 백그라운드 스레드가 EVENT_FLUSH_SIZE개가 모이거나
+    첫 이벤트 후 EVENT_FLUSH_INTERVAL초가 지나면 한 번에 저장합니다 (실시간 모니터링 / 일괄 백필용).
+    
+    사용 예:
+        writer = get_event_writer()
+        future = writer.submit(event_data)          # concurrent.futures.Future
+        saved = future.result()                     # 저장 후 audio_id / event_id가 채워진 이벤트
+        # async: saved = await asyncio.wrap_future(future)
+    """
+    
+    def __init__(self, flush_size=None, flush_interval=None, max_queue=None):
+        self.flush_size = flush_size or EVENT_FLUSH_SIZE
+        self.flush_interval = flush_interval if flush_interval is not None else EVENT_FLUSH_INTERVAL
+        self.max_queue = max_queue or EVENT_QUEUE_MAX
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+        self._in_flight = 0
+        self._stats = {'submitted': 0, 'rejected': 0, 'flushes': 0, 'saved': 0, 'failed': 0, 'last_batch': 0, 'last_flush_ms': None}
+    
+    def submit(self, event):
+        """
+        저장 대기열에 추가
+        
+        Returns:
+        --------
+        Future : 저장된 이벤트 (큐가 가득 찼거나 종료 중이면 RuntimeError로 완료)
+        """
+        future = Future()
+        with self._cond:
+            if self._closed or len(self._queue) >= self.max_queue:
+                self._stats['rejected'] += 1
+                future.set_exception(RuntimeError("Event write-behind queue is full or closed"))
+                return future
+            self._queue.append((time.monotonic(), event, future))
+            self._stats['submitted'] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='event-write-behind', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return future
+    
+    def _next_batch(self):
+        """크기 또는 시간 조건을 만족할 때까지 대기 후 배치 꺼내기 (종료 시 None)"""
+        with self._cond:
+            while True:
+                if self._queue:
+                    waited = time.monotonic() - self._queue[0][0]
+                    if self._closed or len(self._queue) >= self.flush_size or waited >= self.flush_interval:
+                        batch = [self._queue.popleft() for _ in range(min(self.flush_size, len(self._queue)))]
+                        self._in_flight += len(batch)
+                        return batch
+                    self._cond.wait(self.flush_interval - waited)
+                elif self._closed:
+                    return None
+                else:
+                    self._cond.wait()
+    
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            started = time.perf_counter()
+            try:
+                saved = get_storage_manager().save_events_bulk([event for _, event, _ in batch])
+                for (_, _, future), event in zip(batch, saved):
+                    future.set_result(event)
+                failed = sum(1 for event in saved if event.get('isCrying') and event.get('event_id') is None)
+            except Exception as e:
+                logger.warning(f"⚠️ [WriteBehind] 일괄 저장 실패: {e}")
+                for _, _, future in batch:
+                    future.set_exception(e)
+                failed = len(batch)
+            with self._cond:
+                self._in_flight -= len(batch)
+                self._stats['flushes'] += 1
+                self._stats['saved'] += len(batch) - failed
+                self._stats['failed'] += failed
+                self._stats['last_batch'] = len(batch)
+                self._stats['last_flush_ms'] = round((time.perf_counter() - started) * 1000, 1)
+                self._cond.notify_all()
+    
+    def flush(self, timeout=None):
+        """대기 중인 이벤트를 바로 저장하고 끝날 때까지 대기 (timeout 초과 시 False)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            # 크기 / 시간 조건과 무관하게 즉시 저장하도록 대기열의 시작 시간을 앞당김
+            self._queue = deque((0.0, event, future) for _, event, future in self._queue)
+            self._cond.notify_all()
+            while self._queue or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+    
+    def close(self, timeout=None):
+        """남은 이벤트 저장 후 스레드 종료 (서버 종료 시)"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+    
+    def stats(self):
+        with self._cond:
+            return {**self._stats, 'pending': len(self._queue), 'in_flight': self._in_flight,
+                    'flush_size': self.flush_size, 'flush_interval': self.flush_interval}
+
+
+class AsyncStorageManager:
+    """
+    FastAPI 핸들러용 awaitable StorageManager
+    
+    동기 oracledb 호출을 전용 DB 스레드 풀(기본 크기 = 세션 풀 max)에서 실행해
+    이벤트 루프를 막지 않고, 서로 독립적인 조회는 asyncio.gather로 동시에 실행할 수 있습니다.
+    
+    사용 예:
+        storage = get_async_storage_manager()
+        summary, events = await asyncio.gather(
+            storage.get_insights_summary(infant_id, days=7),
+            storage.get_cry_events(infant_id, limit=5),
+        )
+    """
+    
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or int(os.getenv('DB_EXECUTOR_WORKERS', str(max(DB_POOL_MIN, DB_POOL_MAX))))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='storage-db')
+    
+    @staticmethod
+    def _call(method, args, kwargs):
+        # StorageManager 생성(Thick 모드 초기화 포함)도 DB 스레드에서 실행
+        return getattr(get_storage_manager(), method)(*args, **kwargs)
+    
+    async def _run(self, method, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._call, method, args, kwargs)
+    
+    async def save_complete_event(self, event_data):
+        return await self._run('save_complete_event', event_data)
+    
+    async def save_events_bulk(self, events):
+        return await self._run('save_events_bulk', events)
+    
+    async def submit_event(self, event_data):
+        """write-behind 큐에 넣고 저장될 때까지 대기 (기다릴 필요가 없으면 get_event_writer().submit 사용)"""
+        return await asyncio.wrap_future(get_event_writer().submit(event_data))
+    
+    async def get_history(self, infant_id, limit=50):
+        return await self._run('get_history', infant_id, limit=limit)
+    
+    async def get_cry_events(self, infant_id, limit=50):
+        return await self._run('get_cry_events', infant_id, limit=limit)
+    
+    async def get_insights_summary(self, infant_id, days=7):
+        return await self._run('get_insights_summary', infant_id, days=days)
+    
+    async def get_action_stats(self, infant_id, days=7):
+        return await self._run('get_action_stats', infant_id, days=days)
+    
+    async def test_connection(self):
+        return await self._run('test_connection')
+    
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
 
 
 # 싱글톤
 _storage_instance = None
+_async_storage_instance = None
+_event_writer = None
+_storage_lock = threading.Lock()
 
 def get_storage_manager():
     global _storage_instance
+    # DB 스레드 풀의 여러 스레드가 동시에 처음 호출할 수 있으므로 잠금
+    with _storage_lock:
+        if _storage_instance is None:
+            _storage_instance = StorageManager()
+        return _storage_instance
+
+
+def get_async_storage_manager():
+    """async 핸들러용 StorageManager (DB 스레드 풀은 첫 호출 시 생성)"""
+    global _async_storage_instance
+    with _storage_lock:
+        if _async_storage_instance is None:
+            _async_storage_instance = AsyncStorageManager()
+        return _async_storage_instance
+
+
+def get_event_writer():
+    """write-behind 이벤트 저장 큐 (스레드는 첫 submit 시 시작)"""
+    global _event_writer
+    with _storage_lock:
+        if _event_writer is None:
+            _event_writer = EventWriteBehind()
+        return _event_writer
+
+
+def get_storage_pool_stats():
+    """헬스 체크용 DB 풀 통계 (StorageManager가 아직 생성되지 않았으면 None)"""
     if _storage_instance is None:
-        _storage_instance = StorageManager()
-    return _storage_instance
\ No newline at end of file
+        return None
+    stats = _storage_instance.pool_stats()
+    if _async_storage_instance is not None:
+        stats['executor_workers'] = _async_storage_instance.max_workers
+    if _event_writer is not None:
+        stats['write_behind'] = _event_writer.stats()
+    return stats
+
+
+def close_storage_manager():
+    """서버 종료 시 write-behind 큐 / DB 스레드 풀 / 세션 풀 정리 (이후 호출 시 다시 생성)"""
+    global _storage_instance, _async_storage_instance, _event_writer
+    # 남은 이벤트를 먼저 저장 (세션 풀을 닫기 전에)
+    with _storage_lock:
+        event_writer, _event_writer = _event_writer, None
+    if event_writer is not None:
+        event_writer.close()
+    with _storage_lock:
+        async_storage, _async_storage_instance = _async_storage_instance, None
+        storage, _storage_instance = _storage_instance, None
+    if async_storage is not None:
+        async_storage.close()
+    if storage is not None:
+        storage.close()
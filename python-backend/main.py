@@ -3,7 +3,11 @@ FastAPI 메인 애플리케이션
 기존 API + LangGraph 워크플로우 통합
 """
 
+import asyncio
+import sys
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
@@ -13,16 +17,39 @@ import os
 from backend.api import router
 
 # ✅ LangGraph 통합 함수 import
-from backend.api import get_all_routers, LANGGRAPH_AVAILABLE
+from backend.api import get_all_routers, get_classifier, LANGGRAPH_AVAILABLE
 
 from dotenv import load_dotenv
 load_dotenv()
 
+from backend.services.node_client import get_node_client
+from backend.services.warmup_service import run_warmup, skip_warmup, get_warmup_status
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # ✅ 시작 시 추론 스택 예열 (백그라운드 - 끝나기 전까지 /ready는 503)
+    warmup_task = None
+    if os.getenv("WARMUP_ON_STARTUP", "1") == "1":
+        warmup_task = asyncio.create_task(run_warmup(classifier_loader=get_classifier))
+    else:
+        skip_warmup()
+    yield
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+    # ✅ 종료 시 진행 중인 Node 알림을 마무리하고 커넥션 풀 정리
+    await get_node_client().aclose()
+    storage_module = sys.modules.get('backend.utils.storage_manager')
+    if storage_module is not None:
+        await asyncio.to_thread(storage_module.close_storage_manager)
+
+
 # FastAPI 앱 생성
 app = FastAPI(
     title="BabyCry AI Service",
     description="울음 분석 AI 서비스 with LangGraph 멀티 에이전트 시스템",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -92,6 +119,7 @@ async def root():
             "legacy_api": "/api/*",
             "langgraph_workflow": "/api/v2/*" if LANGGRAPH_AVAILABLE else "Not available",
             "health_check": "/health",
+            "readiness_check": "/ready",
             "api_docs": "/docs"
         }
     }
@@ -102,7 +130,8 @@ def health():
     """
     시스템 헬스 체크 (LangGraph 상태 포함)
     """
-    from backend.api import MUSIC_SERVICE_AVAILABLE, STORAGE_MANAGER_AVAILABLE
+    from backend.api import MUSIC_SERVICE_AVAILABLE, STORAGE_MANAGER_AVAILABLE, get_cry_gate_stats
+    from backend.services.node_client import get_lookup_cache_stats
     
     health_status = {
         "status": "ok",
@@ -112,7 +141,10 @@ def health():
             "langgraph_workflow": LANGGRAPH_AVAILABLE,
             "music_service": MUSIC_SERVICE_AVAILABLE,
             "storage_manager": STORAGE_MANAGER_AVAILABLE,
-        }
+        },
+        "lookup_cache": get_lookup_cache_stats(),
+        "cry_gate": get_cry_gate_stats(),
+        "warmup": get_warmup_status()
     }
     
     # LangGraph 활성화 시 엔드포인트 목록 추가
@@ -128,6 +160,17 @@ def health():
     return health_status
 
 
+@app.get("/ready")
+def ready():
+    """
+    준비 상태 (로드 밸런서용) - 예열이 끝나기 전이나 실패하면 503
+
+    /health는 프로세스 생존 여부, /ready는 트래픽을 받아도 되는지를 나타냅니다.
+    """
+    status = get_warmup_status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+
 @app.get("/status")
 async def status():
     """
@@ -169,6 +212,7 @@ if __name__ == "__main__":
     print("\n사용 가능한 엔드포인트:")
     print("  🏠 홈: http://localhost:8001/")
     print("  💚 Health: http://localhost:8001/health")
+    print("  🔥 Ready: http://localhost:8001/ready")
     print("  📚 API 문서: http://localhost:8001/docs")
     
     if LANGGRAPH_AVAILABLE: